@@ -0,0 +1,160 @@
+# ==============================================================
+# PENYIMPANAN ARTEFAK PREDIKSI (BERVERSI)
+# Hasil fit ARIMA (order, parameter, prediksi, interval analitik &
+# bootstrap, hash data)
+# ditulis sebagai file JSON berversi oleh job batch; script prediksi &
+# dashboard cukup membaca artefak terbaru dan hanya fit ulang bila
+# data masukan berubah.
+# ==============================================================
+# Import Lib
+import os
+import re
+import json
+import hashlib
+import warnings
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import dataset
+import peramalan
+import bootstrap
+
+# Folder artefak di samping dataset final; satu file per versi
+FOLDER_ARTEFAK = os.path.join(dataset.BASE_PATH, "final_dataset", "artefak_prediksi")
+POLA_FILE = re.compile(r"^prediksi_v(\d+)_[0-9a-f]+\.json$")
+VERSI_FORMAT = 2
+# Jumlah versi lama yang dipertahankan
+SIMPAN_MAKS = 20
+ALPHA = 0.05
+
+
+def hash_masukan(series: pd.Series, order, langkah: int, alpha: float = ALPHA) -> str:
+    """SHA-1 deret masukan + pengaturan model; berubah = artefak harus dibuat ulang"""
+    h = hashlib.sha1()
+    h.update(series.index.to_numpy(dtype=np.int64).tobytes())
+    h.update(series.to_numpy(dtype=np.float64).tobytes())
+    h.update(json.dumps([[int(x) for x in order], int(langkah), float(alpha)]).encode("utf-8"))
+    return h.hexdigest()
+
+
+def buat_artefak(series: pd.Series, order, langkah: int = 2, alpha: float = ALPHA,
+                 awal: dict = None) -> dict:
+    """Fit ARIMA pada deret tahunan dan mengemas hasilnya sebagai artefak.
+
+    `awal` = parameter artefak sebelumnya untuk warm start (peramalan.fit_arima).
+    """
+    with warnings.catch_warnings(record=True) as tercatat:
+        warnings.simplefilter("always")
+        model_fit, jenis_fit = peramalan.fit_arima(series.to_numpy(dtype=float), order, awal)
+        ramalan = model_fit.get_forecast(steps=langkah)
+    prediksi = np.asarray(ramalan.predicted_mean, dtype=float)
+    interval = np.asarray(ramalan.conf_int(alpha=alpha), dtype=float)
+    interval_bootstrap = bootstrap.interval_arima(model_fit, langkah)
+
+    tahun_terakhir = int(series.index.max())
+    return {
+        'versi_format': VERSI_FORMAT,
+        'dibuat': datetime.now().isoformat(timespec='seconds'),
+        'hash_data': hash_masukan(series, order, langkah, alpha),
+        'model': "ARIMA",
+        'order': [int(x) for x in order],
+        'params': {nama: float(nilai) for nama, nilai in zip(model_fit.param_names, model_fit.params)},
+        'llf_per_obs': peramalan.ringkasan_fit(model_fit)['llf_per_obs'],
+        'fit': jenis_fit,
+        'aic': float(model_fit.aic),
+        'bic': float(model_fit.bic),
+        'alpha': alpha,
+        'peringatan': sorted({f"{w.category.__name__}: {w.message}" for w in tercatat}),
+        'aktual': {'tahun': [int(t) for t in series.index], 'nilai': [float(v) for v in series]},
+        'prediksi': {
+            'tahun': list(range(tahun_terakhir + 1, tahun_terakhir + 1 + langkah)),
+            'nilai': prediksi.tolist(),
+            'bawah': interval[:, 0].tolist(),
+            'atas': interval[:, 1].tolist(),
+        },
+        'bootstrap': {
+            'jumlah_jalur': bootstrap.JUMLAH_JALUR,
+            'interval': {str(t): {'bawah': bawah.tolist(), 'atas': atas.tolist()}
+                         for t, (bawah, atas) in interval_bootstrap.items()},
+        },
+    }
+
+
+def _daftar_versi(folder: str) -> list:
+    """[(versi, nama file)] terurut naik"""
+    if not os.path.isdir(folder):
+        return []
+    versi = []
+    for nama in os.listdir(folder):
+        cocok = POLA_FILE.match(nama)
+        if cocok:
+            versi.append((int(cocok.group(1)), nama))
+    return sorted(versi)
+
+
+def simpan_artefak(artefak: dict, folder: str = FOLDER_ARTEFAK) -> str:
+    """Menulis artefak sebagai versi baru (atomik) & membuang versi lama di luar SIMPAN_MAKS"""
+    os.makedirs(folder, exist_ok=True)
+    daftar = _daftar_versi(folder)
+    versi = daftar[-1][0] + 1 if daftar else 1
+    artefak = dict(artefak, versi=versi)
+    path = os.path.join(folder, f"prediksi_v{versi:04d}_{artefak['hash_data'][:12]}.json")
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(artefak, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+    for _, nama in daftar[:max(0, len(daftar) + 1 - SIMPAN_MAKS)]:
+        os.remove(os.path.join(folder, nama))
+    return path
+
+
+def muat_terbaru(folder: str = FOLDER_ARTEFAK):
+    """Artefak versi tertinggi yang terbaca, atau None"""
+    for _, nama in reversed(_daftar_versi(folder)):
+        try:
+            with open(os.path.join(folder, nama), encoding="utf-8") as f:
+                artefak = json.load(f)
+        except (OSError, ValueError):
+            continue
+        if artefak.get('versi_format') == VERSI_FORMAT:
+            return artefak
+    return None
+
+
+def prediksi_terkini(series: pd.Series, order=None, langkah: int = 2, alpha: float = ALPHA,
+                     folder: str = FOLDER_ARTEFAK, paksa: bool = False):
+    """Artefak untuk deret ini: dibaca dari store, atau di-fit & disimpan bila hash berubah.
+
+    Dengan `order` None dipakai order artefak terbaru (bawaan peramalan.ORDER),
+    sehingga pembaca seperti dashboard mengikuti model yang ditulis job batch.
+    Bila fit ulang diperlukan (mis. tahun baru masuk) dan order sama, parameter
+    artefak terbaru menjadi titik awal warm start; `paksa` = fit dingin.
+    Mengembalikan (artefak, True bila baru di-fit).
+    """
+    artefak = None if paksa else muat_terbaru(folder)
+    if order is None:
+        order = artefak['order'] if artefak is not None else peramalan.ORDER
+    if artefak is not None and artefak['hash_data'] == hash_masukan(series, order, langkah, alpha):
+        return artefak, False
+    awal = None
+    if artefak is not None and artefak['order'] == [int(x) for x in order]:
+        awal = {'params': list(artefak['params'].values()), 'llf_per_obs': artefak.get('llf_per_obs')}
+    artefak = buat_artefak(series, order, langkah, alpha, awal)
+    path = simpan_artefak(artefak, folder)
+    with open(path, encoding="utf-8") as f:
+        return json.load(f), True
+
+
+def tabel_prediksi(artefak: dict) -> pd.DataFrame:
+    """Prediksi artefak dalam format tabel script prediksi (Tahun, Prediksi_Kelahiran, batas interval)"""
+    p = artefak['prediksi']
+    df = pd.DataFrame({
+        'Tahun': p['tahun'],
+        'Prediksi_Kelahiran': np.asarray(p['nilai']).astype(int),
+        'Batas_Bawah': np.asarray(p['bawah']),
+        'Batas_Atas': np.asarray(p['atas']),
+    })
+    for t, batas in artefak.get('bootstrap', {}).get('interval', {}).items():
+        df[f'Bawah_{t}'] = np.asarray(batas['bawah'])
+        df[f'Atas_{t}'] = np.asarray(batas['atas'])
+    return df
@@ -0,0 +1,179 @@
+# ==============================================================
+# GARIS BATAS WILAYAH (GEOJSON) UNTUK PETA HEATMAP
+# Dibaca dari cache lokal (diunduh sekali bila belum ada), divalidasi,
+# lalu disederhanakan (Douglas–Peucker) agar HTML peta tetap ringan.
+# ==============================================================
+# Import Lib
+import os
+import json
+import numpy as np
+import dataset
+
+try:
+    import requests  # opsional, hanya untuk mengunduh GeoJSON yang belum ada di cache
+except ImportError:
+    requests = None
+
+# Sumber GeoJSON batas kabupaten/kota Jawa Barat
+GEOJSON_URL = "https://github.com/hitamcoklat/Jawa-Barat-Geo-JSON/blob/master/Jabar_By_Kab.geojson?raw=true"
+
+# Lokasi cache lokal; bisa diganti lewat environment variable (mis. lingkungan tanpa internet)
+PATH_GEOJSON = os.environ.get(
+    "GEOJSON_JABAR_PATH",
+    os.path.join(dataset.BASE_PATH, "geojson", "Jabar_By_Kab.geojson"),
+)
+
+# Toleransi penyederhanaan (derajat, ~0.002° ≈ 220 m) & jumlah desimal koordinat
+TOLERANSI = 0.002
+PRESISI = 4
+TIMEOUT_UNDUH = 10
+
+# Cache per proses: (path, mtime, toleransi, presisi) -> GeoJSON sederhana
+_cache = {}
+# Unduhan yang gagal tidak diulang dalam proses yang sama: path -> error
+_gagal_unduh = {}
+
+
+def validasi_geojson(data) -> None:
+    """Memastikan isi berupa FeatureCollection dengan geometri (Multi)Polygon"""
+    if not isinstance(data, dict) or data.get('type') != 'FeatureCollection':
+        raise ValueError("GeoJSON bukan FeatureCollection")
+    fitur = data.get('features')
+    if not isinstance(fitur, list) or not fitur:
+        raise ValueError("GeoJSON tidak memiliki features")
+    for i, f in enumerate(fitur):
+        geom = (f or {}).get('geometry') or {}
+        if geom.get('type') not in ('Polygon', 'MultiPolygon') or not geom.get('coordinates'):
+            raise ValueError(f"Feature ke-{i} tidak memiliki geometri Polygon/MultiPolygon")
+
+
+def unduh_geojson(path: str = PATH_GEOJSON, url: str = GEOJSON_URL,
+                  timeout: float = TIMEOUT_UNDUH) -> None:
+    """Mengunduh GeoJSON ke cache lokal (divalidasi dulu, ditulis atomik)"""
+    if requests is None:
+        raise ImportError("requests belum terpasang (pip install requests)")
+    r = requests.get(url, timeout=timeout)
+    r.raise_for_status()
+    data = r.json()
+    validasi_geojson(data)
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(path + ".tmp", path)
+
+
+def douglas_peucker(titik: np.ndarray, toleransi: float) -> np.ndarray:
+    """Penyederhanaan garis Douglas–Peucker (iteratif, jarak dihitung per segmen dengan NumPy)"""
+    n = len(titik)
+    if n < 3 or toleransi <= 0:
+        return titik
+    simpan = np.zeros(n, dtype=bool)
+    simpan[0] = simpan[-1] = True
+    tumpukan = [(0, n - 1)]
+    while tumpukan:
+        i, j = tumpukan.pop()
+        if j - i < 2:
+            continue
+        a, b = titik[i], titik[j]
+        tengah = titik[i + 1:j] - a
+        arah = b - a
+        panjang = np.hypot(arah[0], arah[1])
+        if panjang == 0:
+            # Ring tertutup: titik awal = titik akhir, pakai jarak ke titik tersebut
+            jarak = np.hypot(tengah[:, 0], tengah[:, 1])
+        else:
+            jarak = np.abs(arah[0] * tengah[:, 1] - arah[1] * tengah[:, 0]) / panjang
+        k = int(np.argmax(jarak))
+        if jarak[k] > toleransi:
+            idx = i + 1 + k
+            simpan[idx] = True
+            tumpukan.append((i, idx))
+            tumpukan.append((idx, j))
+    return titik[simpan]
+
+
+def _sederhanakan_ring(ring, toleransi: float, presisi: int) -> list:
+    titik = np.asarray(ring, dtype=float)[:, :2]
+    hasil = np.round(douglas_peucker(titik, toleransi), presisi)
+
+    # Buang titik berurutan yang sama setelah pembulatan
+    if len(hasil) > 1:
+        beda = np.any(np.diff(hasil, axis=0) != 0, axis=1)
+        hasil = hasil[np.concatenate([[True], beda])]
+
+    # Ring polygon minimal 4 titik (tertutup); bila terlalu kecil pakai versi asli yang dibulatkan
+    if len(hasil) < 4:
+        hasil = np.round(titik, presisi)
+    return hasil.tolist()
+
+
+def sederhanakan_geojson(data: dict, toleransi: float = TOLERANSI, presisi: int = PRESISI) -> dict:
+    """Salinan GeoJSON dengan jumlah titik dikurangi & koordinat dibulatkan"""
+    fitur = []
+    for f in data['features']:
+        geom = f['geometry']
+        if geom['type'] == 'Polygon':
+            coords = [_sederhanakan_ring(r, toleransi, presisi) for r in geom['coordinates']]
+        else:
+            coords = [[_sederhanakan_ring(r, toleransi, presisi) for r in poly]
+                      for poly in geom['coordinates']]
+        fitur.append({
+            'type': 'Feature',
+            'properties': f.get('properties') or {},
+            'geometry': {'type': geom['type'], 'coordinates': coords},
+        })
+    return {'type': 'FeatureCollection', 'features': fitur}
+
+
+def jumlah_titik(data: dict) -> int:
+    total = 0
+    for f in data['features']:
+        geom = f['geometry']
+        polys = [geom['coordinates']] if geom['type'] == 'Polygon' else geom['coordinates']
+        total += sum(len(r) for poly in polys for r in poly)
+    return total
+
+
+def muat_batas(path: str = PATH_GEOJSON, toleransi: float = TOLERANSI,
+               presisi: int = PRESISI, unduh: bool = True) -> dict:
+    """GeoJSON batas wilayah yang sudah disederhanakan.
+
+    Bila file cache belum ada dan `unduh` True, file diunduh sekali
+    (dengan timeout). Hasil penyederhanaan disimpan di samping file
+    asli (`*.sederhana.geojson`) dan di-cache per proses, sehingga
+    pemanggilan berikutnya tidak menyentuh jaringan maupun geometri
+    resolusi penuh.
+    """
+    path = os.path.abspath(path)
+    if not os.path.exists(path):
+        if not unduh:
+            raise FileNotFoundError(f"GeoJSON tidak ditemukan: {path}")
+        if path in _gagal_unduh:
+            raise _gagal_unduh[path]
+        try:
+            unduh_geojson(path)
+        except Exception as e:
+            _gagal_unduh[path] = e
+            raise
+
+    mtime = os.stat(path).st_mtime_ns
+    key = (path, mtime, toleransi, presisi)
+    if key in _cache:
+        return _cache[key]
+
+    path_sederhana = f"{os.path.splitext(path)[0]}.sederhana-{toleransi:g}-{presisi}.geojson"
+    if os.path.exists(path_sederhana) and os.stat(path_sederhana).st_mtime_ns >= mtime:
+        with open(path_sederhana, encoding="utf-8") as f:
+            data = json.load(f)
+    else:
+        with open(path, encoding="utf-8") as f:
+            asli = json.load(f)
+        validasi_geojson(asli)
+        data = sederhanakan_geojson(asli, toleransi, presisi)
+        with open(path_sederhana + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(path_sederhana + ".tmp", path_sederhana)
+
+    _cache[key] = data
+    return data
@@ -0,0 +1,326 @@
+# ==============================================================
+# BENCHMARK PIPELINE KELAHIRAN (1×, 10×, 100×, 1000×)
+# Mengukur waktu & memori puncak setiap tahap (baca data mentah,
+# cleaning, group-by tiap script visualisasi, fit ARIMA, pembuatan
+# grafik, savefig & simpan HTML folium) pada data yang diperbesar,
+# menyimpan hasilnya sebagai JSON, dan membandingkannya dengan
+# baseline tersimpan (ambang regresi bisa diatur).
+# ==============================================================
+# Import Lib
+import os
+import io
+import sys
+import gc
+import json
+import time
+import argparse
+import warnings
+import platform
+import tempfile
+import tracemalloc
+import contextlib
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import matplotlib
+import matplotlib.pyplot as plt
+import dataset
+import kubus
+import peramalan
+import data_cleaning
+import visualisasi_tren
+import visualisasi_kabupaten_kota
+import visualisasi_jenis_status
+import visualisasi_heatmap_kelahiran
+import visualisasi_prediksi_kelahiran
+
+# Path data mentah & hasil benchmark
+path = data_cleaning.path
+output_path = "./benchmark/hasil_benchmark.json"
+baseline_path = "./benchmark/baseline_benchmark.json"
+
+SKALA = (1, 10, 100, 1000)
+ULANG = 3
+# Tahap dianggap regresi bila lebih lambat/boros dari baseline lebih dari ambang (0.2 = 20%)
+AMBANG = 0.2
+# Selisih absolut minimal agar dihitung regresi (menghindari derau pada tahap yang sangat cepat)
+MIN_SELISIH_DETIK = 0.05
+MIN_SELISIH_MB = 1.0
+DPI = 300
+
+
+def perbesar_mentah(df_mentah: pd.DataFrame, faktor: int) -> pd.DataFrame:
+    """Data mentah `faktor` kali lipat: salinan dengan id baru & jumlah_kelahiran digeser.
+
+    Jumlah digeser per salinan agar baris tidak terbuang oleh hapus duplikat,
+    sedangkan wilayah, status, jenis kelamin & tahun tetap (jumlah grup sama).
+    """
+    if faktor == 1:
+        return df_mentah.copy()
+    salinan = np.repeat(np.arange(faktor), len(df_mentah))
+    df = pd.concat([df_mentah] * faktor, ignore_index=True)
+    df['id'] = np.arange(1, len(df) + 1)
+    df['jumlah_kelahiran'] = df['jumlah_kelahiran'].fillna(0).astype(np.int64) + salinan
+    return df
+
+
+def ukur(fungsi, ulang: int = ULANG, memori: bool = True, siapkan=None) -> dict:
+    """Waktu terbaik dari `ulang` kali jalan + memori puncak (tracemalloc, satu jalan terpisah).
+
+    `siapkan` (opsional) dipanggil sebelum setiap jalan tanpa ikut diukur dan
+    hasilnya menjadi argumen `fungsi`. Output print & warning tahap disembunyikan.
+    Memori puncak = alokasi Python/NumPy selama tahap; buffer Arrow
+    (kolom string pandas) tidak terlacak tracemalloc.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return _ukur(fungsi, ulang, memori, siapkan)
+
+
+def _ukur(fungsi, ulang: int, memori: bool, siapkan) -> dict:
+    durasi, hasil = [], None
+    for _ in range(ulang):
+        argumen = siapkan() if siapkan else ()
+        gc.collect()
+        with contextlib.redirect_stdout(io.StringIO()):
+            mulai = time.perf_counter()
+            hasil = fungsi(*argumen)
+            durasi.append(time.perf_counter() - mulai)
+    puncak = None
+    if memori:
+        argumen = siapkan() if siapkan else ()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                fungsi(*argumen)
+            puncak = tracemalloc.get_traced_memory()[1] / 2**20
+        finally:
+            tracemalloc.stop()
+    return {'detik': min(durasi), 'detik_ulang': durasi, 'memori_puncak_mb': puncak, 'hasil': hasil}
+
+
+def _tutup_grafik() -> tuple:
+    # Dipakai sebagai `siapkan`: grafik dari jalan sebelumnya ditutup dulu
+    plt.close('all')
+    return ()
+
+
+def _bangun_grafik(agregat: dict) -> list:
+    figs = [
+        visualisasi_tren.gambar_tren(agregat['tren']),
+        visualisasi_kabupaten_kota.gambar_distribusi(agregat['kabupaten_kota']),
+        visualisasi_jenis_status.gambar_jenis_kelamin(agregat['jenis_kelamin']),
+        visualisasi_jenis_status.gambar_status(agregat['status']),
+        visualisasi_prediksi_kelahiran.gambar_prediksi(agregat['tahunan'], agregat['prediksi']),
+    ]
+    return figs
+
+
+def _savefig(figs: list) -> None:
+    for fig in figs:
+        fig.savefig(io.BytesIO(), format="png", dpi=DPI)
+
+
+def _simpan_peta(peta: list, folder: str) -> None:
+    for i, m in enumerate(peta):
+        m.save(os.path.join(folder, f"peta_{i}.html"))
+
+
+def jalankan_skala(df_mentah: pd.DataFrame, faktor: int, folder: str,
+                   ulang: int = ULANG, memori: bool = True) -> list:
+    """Semua tahap pipeline pada data mentah `faktor` kali lipat; satu baris hasil per tahap"""
+    hasil = []
+
+    def catat(tahap: str, baris: int, ukuran: dict):
+        hasil.append({'tahap': tahap, 'skala': faktor, 'baris': int(baris),
+                      **{k: v for k, v in ukuran.items() if k != 'hasil'}})
+        print(f"  {tahap:<26} {ukuran['detik']:>9.4f} s"
+              + (f" | {ukuran['memori_puncak_mb']:>9.1f} MB" if ukuran['memori_puncak_mb'] is not None else ""))
+        return ukuran['hasil']
+
+    # Ingest data mentah (file CSV ditulis di luar pengukuran)
+    path_mentah = os.path.join(folder, f"mentah_{faktor}x.csv")
+    perbesar_mentah(df_mentah, faktor).to_csv(path_mentah, index=False)
+    df = catat("baca_mentah", len(df_mentah) * faktor, ukur(lambda: pd.read_csv(path_mentah), ulang, memori))
+
+    # Tahapan cleaning (sama dengan data_cleaning.bersihkan, per langkah)
+    df_siap = catat("cleaning_siapkan_kolom", len(df), ukur(data_cleaning.siapkan_kolom, ulang, memori,
+                                                            siapkan=lambda: (df,)))
+    df_unik = catat("cleaning_hapus_duplikat", len(df_siap), ukur(pd.DataFrame.drop_duplicates, ulang, memori,
+                                                                  siapkan=lambda: (df_siap,)))
+    df_bersih = catat("cleaning_standarisasi", len(df_unik), ukur(data_cleaning.isi_dan_standarisasi, ulang, memori,
+                                                                  siapkan=lambda: (df_unik.copy(),)))
+    catat("bangun_kubus", len(df_bersih), ukur(kubus.bangun_kubus, ulang, memori, siapkan=lambda: (df_bersih,)))
+
+    # Dataset final: tulis & baca ulang lewat loader bersama (cache dikosongkan tiap jalan)
+    path_dataset = os.path.join(folder, f"dataset_{faktor}x.csv")
+    catat("simpan_dataset", len(df_bersih),
+          ukur(lambda: df_bersih[data_cleaning.KOLOM_ANALISIS].to_csv(path_dataset, index=False), ulang, memori))
+
+    def _baca_dataset():
+        dataset.hapus_cache()
+        return dataset.muat_dataset(path_dataset)
+    sumber = catat("baca_dataset", len(df_bersih), ukur(_baca_dataset, ulang, memori))
+
+    # Group-by setiap script visualisasi
+    agregat = {}
+    agregat['tren'] = catat("groupby_tren", len(sumber),
+                            ukur(visualisasi_tren.hitung_total_per_tahun, ulang, memori, siapkan=lambda: (sumber,)))
+    agregat['kabupaten_kota'] = catat("groupby_kabupaten_kota", len(sumber),
+                                      ukur(visualisasi_kabupaten_kota.hitung_total_per_wilayah, ulang, memori,
+                                           siapkan=lambda: (sumber,)))
+    agregat['jenis_kelamin'], agregat['status'] = catat(
+        "groupby_jenis_status", len(sumber),
+        ukur(lambda: (visualisasi_jenis_status.hitung_total(sumber, 'jenis_kelamin'),
+                      visualisasi_jenis_status.hitung_total(sumber, 'status_kelahiran')), ulang, memori))
+    agregat['geo'], agregat['geo_tahun'] = catat(
+        "groupby_heatmap", len(sumber),
+        ukur(lambda: (visualisasi_heatmap_kelahiran.hitung_total_per_wilayah(sumber),
+                      visualisasi_heatmap_kelahiran.hitung_per_tahun(sumber)), ulang, memori))
+    agregat['tahunan'] = catat("groupby_prediksi", len(sumber),
+                               ukur(visualisasi_prediksi_kelahiran.hitung_total_tahunan, ulang, memori,
+                                    siapkan=lambda: (sumber,)))
+
+    # Fit ARIMA pada total tahunan (panjang deret tidak bergantung skala)
+    series = agregat['tahunan']['jumlah_kelahiran']
+    model_fit, _ = catat("fit_arima", len(series), ukur(lambda: peramalan.fit_arima(series, peramalan.ORDER), ulang, memori))
+    tahun_terakhir = int(series.index.max())
+    agregat['prediksi'] = pd.DataFrame({
+        'Tahun': range(tahun_terakhir + 1, tahun_terakhir + 1 + peramalan.LANGKAH),
+        'Prediksi_Kelahiran': np.asarray(model_fit.forecast(steps=peramalan.LANGKAH)).astype(int),
+    })
+
+    # Grafik matplotlib & peta folium
+    catat("bangun_grafik", len(agregat), ukur(lambda: _bangun_grafik(agregat), ulang, memori, siapkan=_tutup_grafik))
+    _tutup_grafik()
+    with contextlib.redirect_stdout(io.StringIO()), warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        figs = _bangun_grafik(agregat)
+    catat("savefig", len(figs), ukur(_savefig, ulang, memori, siapkan=lambda: (figs,)))
+    peta = catat("bangun_peta", len(agregat['geo']),
+                 ukur(lambda: [visualisasi_heatmap_kelahiran.gambar_peta(agregat['geo']),
+                               visualisasi_heatmap_kelahiran.gambar_peta_tahunan(agregat['geo_tahun'])], ulang, memori))
+    catat("simpan_peta_html", len(peta), ukur(_simpan_peta, ulang, memori, siapkan=lambda: (peta, folder)))
+    plt.close('all')
+    return hasil
+
+
+def info_lingkungan() -> dict:
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'prosesor': platform.processor() or platform.machine(),
+        'cpu': os.cpu_count(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'matplotlib': matplotlib.__version__,
+    }
+
+
+def bandingkan(hasil: list, baseline: list, ambang: float = AMBANG) -> pd.DataFrame:
+    """Rasio waktu & memori terhadap baseline per (tahap, skala) + penanda regresi"""
+    acuan = {(b['tahap'], b['skala']): b for b in baseline}
+    baris = []
+    for h in hasil:
+        b = acuan.get((h['tahap'], h['skala']))
+        if b is None:
+            continue
+        rasio_waktu = h['detik'] / b['detik'] if b['detik'] > 0 else np.nan
+        regresi_waktu = (h['detik'] > b['detik'] * (1 + ambang)
+                         and h['detik'] - b['detik'] >= MIN_SELISIH_DETIK)
+        rasio_memori, regresi_memori = np.nan, False
+        if h.get('memori_puncak_mb') is not None and b.get('memori_puncak_mb') is not None:
+            rasio_memori = h['memori_puncak_mb'] / b['memori_puncak_mb'] if b['memori_puncak_mb'] > 0 else np.nan
+            regresi_memori = (h['memori_puncak_mb'] > b['memori_puncak_mb'] * (1 + ambang)
+                              and h['memori_puncak_mb'] - b['memori_puncak_mb'] >= MIN_SELISIH_MB)
+        baris.append({'tahap': h['tahap'], 'skala': h['skala'],
+                      'detik': h['detik'], 'detik_baseline': b['detik'], 'rasio_waktu': rasio_waktu,
+                      'rasio_memori': rasio_memori, 'regresi': regresi_waktu or regresi_memori})
+    return pd.DataFrame(baris)
+
+
+def simpan_json(isi: dict, path_json: str) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path_json)), exist_ok=True)
+    with open(path_json + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(isi, f, indent=2)
+    os.replace(path_json + ".tmp", path_json)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark waktu & memori setiap tahap pipeline kelahiran")
+    parser.add_argument("--input", default=path, help="File CSV data mentah (default: rawdata)")
+    parser.add_argument("--skala", nargs="+", type=int, default=list(SKALA),
+                        help="Faktor pembesaran data (default: 1 10 100 1000)")
+    parser.add_argument("--ulang", type=int, default=ULANG, help="Jumlah pengulangan per tahap (diambil tercepat)")
+    parser.add_argument("--tanpa-memori", action="store_true", help="Lewati pengukuran memori (tracemalloc)")
+    parser.add_argument("--output", default=output_path, help="File JSON hasil benchmark")
+    parser.add_argument("--baseline", default=baseline_path, help="File JSON baseline pembanding")
+    parser.add_argument("--simpan-baseline", action="store_true", help="Jadikan hasil run ini sebagai baseline baru")
+    parser.add_argument("--ambang", type=float, default=AMBANG,
+                        help="Ambang regresi relatif terhadap baseline (default 0.2 = 20%%)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    """Menjalankan benchmark; exit code 1 bila ada regresi terhadap baseline"""
+    args = parse_args(argv)
+    matplotlib.use("Agg")
+    # Impor statsmodels di awal agar tidak ikut terukur pada fit ARIMA pertama
+    from statsmodels.tsa.arima.model import ARIMA  # noqa: F401
+
+    print()
+    print("----------------------")
+    print("Proses Membaca File ")
+    print("----------------------")
+    try:
+        df_mentah = pd.read_csv(args.input)
+        print(f"- Berhasil Membaca File : {args.input} ({len(df_mentah):,} Baris) ✓")
+    except Exception as e:
+        print(f"- Gagal Membaca file : {args.input} : {e}")
+        return 1
+
+    semua = []
+    with tempfile.TemporaryDirectory(prefix="benchmark_kelahiran_") as folder:
+        for faktor in args.skala:
+            print()
+            print("--------------------------------------------")
+            print(f"Benchmark Skala {faktor}× ({len(df_mentah) * faktor:,} Baris Mentah)")
+            print("--------------------------------------------")
+            semua.extend(jalankan_skala(df_mentah, faktor, folder, args.ulang, not args.tanpa_memori))
+
+    isi = {
+        'dibuat': datetime.now().isoformat(timespec='seconds'),
+        'lingkungan': info_lingkungan(),
+        'pengaturan': {'skala': args.skala, 'ulang': args.ulang, 'input': args.input},
+        'hasil': semua,
+    }
+    simpan_json(isi, args.output)
+    print()
+    print(f"- Hasil Benchmark Berhasil Disimpan di: {args.output} ✓")
+    if args.simpan_baseline:
+        simpan_json(isi, args.baseline)
+        print(f"- Baseline Berhasil Disimpan di: {args.baseline} ✓")
+        return 0
+
+    print()
+    print("----------------------------")
+    print("Perbandingan dengan Baseline")
+    print("----------------------------")
+    if not os.path.exists(args.baseline):
+        print(f"- Baseline Tidak Ditemukan : {args.baseline} (jalankan dengan --simpan-baseline)")
+        return 0
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    df_banding = bandingkan(semua, baseline['hasil'], args.ambang)
+    for _, row in df_banding.iterrows():
+        tanda = "REGRESI" if row['regresi'] else "ok"
+        print(f"- {row['tahap']:<26} {row['skala']:>5}× : waktu ×{row['rasio_waktu']:.2f}"
+              f" | memori ×{row['rasio_memori']:.2f} | {tanda}")
+    jumlah_regresi = int(df_banding['regresi'].sum()) if len(df_banding) else 0
+    print(f"- {jumlah_regresi} Regresi (Ambang {args.ambang:.0%}, Baseline {baseline['dibuat']})")
+    return 1 if jumlah_regresi else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
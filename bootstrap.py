@@ -0,0 +1,119 @@
+# ==============================================================
+# INTERVAL PREDIKSI BOOTSTRAP RESIDUAL (NUMPY)
+# Ribuan jalur masa depan per deret disimulasikan sekaligus dengan
+# residual in-sample yang diambil ulang (satu operasi array per
+# langkah, bukan loop per jalur); interval = kuantil jalur.
+# ==============================================================
+# Import Lib
+import numpy as np
+import model_cepat
+
+JUMLAH_JALUR = 2000
+TINGKAT = (80, 95)
+SEED = 2024
+# Batas elemen array jalur per blok (deret × jalur × langkah) agar memori terkendali
+BATAS_ELEMEN = 8_000_000
+
+
+def _sampel_residual(residual: np.ndarray, jalur: int, langkah: int, rng) -> np.ndarray:
+    """Residual (n, m) yang dipusatkan lalu diambil ulang per deret: (n, jalur, langkah)"""
+    residual = residual - np.nanmean(residual, axis=1, keepdims=True)
+    n, m = residual.shape
+    idx = rng.integers(0, m, size=(n, jalur, langkah))
+    return residual[np.arange(n)[:, None, None], idx]
+
+
+def kuantil_jalur(jalur: np.ndarray, tingkat=TINGKAT) -> dict:
+    """{tingkat: (bawah, atas)} dari jalur (..., jumlah jalur, langkah)"""
+    hasil = {}
+    for t in tingkat:
+        ekor = (100 - t) / 2
+        bawah, atas = np.percentile(jalur, [ekor, 100 - ekor], axis=-2)
+        hasil[t] = (bawah, atas)
+    return hasil
+
+
+def simulasi_cepat(fit: dict, langkah: int, jalur: int = JUMLAH_JALUR, rng=None) -> np.ndarray:
+    """Jalur masa depan (n, jalur, langkah) dari hasil model_cepat.fit_matriks.
+
+    Semua model memakai rekursi Holt yang sama dengan error hasil
+    bootstrap: ŷ = l + b, y = ŷ + e*, l = ŷ + αe*, b = b + αβe*.
+    """
+    rng = np.random.default_rng(SEED) if rng is None else rng
+    e = _sampel_residual(fit['residual'], jalur, langkah, rng)
+    level = np.repeat(fit['level'][:, None], jalur, axis=1)
+    tren = np.repeat(fit['tren'][:, None], jalur, axis=1)
+    alpha, beta = fit['alpha'][:, None], fit['beta'][:, None]
+    hasil = np.empty_like(e)
+    for h in range(langkah):
+        ramal = level + tren
+        hasil[:, :, h] = ramal + e[:, :, h]
+        level = ramal + alpha * e[:, :, h]
+        tren = tren + alpha * beta * e[:, :, h]
+    return hasil
+
+
+def interval_cepat(Y, model: str, langkah: int = 2, tingkat=TINGKAT,
+                   jalur: int = JUMLAH_JALUR, seed: int = SEED, offset: int = 0) -> dict:
+    """Interval bootstrap model_cepat untuk setiap baris Y (deret × tahun).
+
+    Deret diproses per blok sehingga array jalur tidak melebihi
+    BATAS_ELEMEN. Mengembalikan {tingkat: (bawah (n, langkah), atas)};
+    deret yang tidak valid bernilai NaN. `offset` = posisi baris pertama
+    Y dalam keseluruhan deret (agar seed tiap blok berbeda saat Y dibagi
+    ke beberapa worker).
+    """
+    Y = np.asarray(Y, dtype=float)
+    if Y.ndim == 1:
+        Y = Y[None, :]
+    fit = model_cepat.fit_matriks(Y, model)
+    hasil = {t: (np.full((len(Y), langkah), np.nan), np.full((len(Y), langkah), np.nan)) for t in tingkat}
+
+    idx = np.flatnonzero(fit['valid'] & (Y.shape[1] >= 3))
+    ukuran_blok = max(1, BATAS_ELEMEN // (jalur * langkah))
+    for mulai in range(0, len(idx), ukuran_blok):
+        blok = idx[mulai:mulai + ukuran_blok]
+        sub = {k: fit[k][blok] for k in ('level', 'tren', 'alpha', 'beta', 'residual')}
+        rng = np.random.default_rng([seed, offset + int(blok[0])])
+        for t, (bawah, atas) in kuantil_jalur(simulasi_cepat(sub, langkah, jalur, rng), tingkat).items():
+            hasil[t][0][blok] = bawah
+            hasil[t][1][blok] = atas
+    return hasil
+
+
+def _matriks_ruang_keadaan(model_fit):
+    """Matriks transisi, seleksi, desain & intersep dari hasil fit ARIMA statsmodels"""
+    ssm = model_fit.model.ssm
+
+    def _tetap(x):
+        x = np.asarray(x)
+        return x[..., 0] if x.ndim == 3 else x
+
+    T = _tetap(ssm['transition'])
+    return (T, _tetap(ssm['selection']), _tetap(ssm['design']),
+            np.asarray(ssm['state_intercept']).reshape(len(T), -1)[:, 0],
+            float(np.asarray(ssm['obs_intercept']).ravel()[0]))
+
+
+def interval_arima(model_fit, langkah: int = 2, tingkat=TINGKAT,
+                   jalur: int = JUMLAH_JALUR, seed: int = SEED) -> dict:
+    """Interval bootstrap residual untuk satu hasil fit ARIMA statsmodels.
+
+    Jalur disimulasikan langsung pada representasi ruang keadaan
+    (α_{t+1} = Tα_t + c + Rη_t, y_t = Zα_t + d) untuk semua jalur
+    sekaligus, dengan η diambil ulang dari residual one-step (periode
+    awal yang masih difus dibuang). Dengan η normal hasilnya sama dengan
+    interval analitik statsmodels.
+    """
+    T, R, Z, c, d = _matriks_ruang_keadaan(model_fit)
+    residual = np.asarray(model_fit.resid, dtype=float)[model_fit.loglikelihood_burn:]
+    rng = np.random.default_rng(seed)
+    eta = _sampel_residual(residual[None, :], jalur, langkah, rng)[0].T  # (langkah, jalur)
+
+    keadaan = model_fit.predicted_state[:, -1][:, None] + R @ eta[:1]
+    hasil = np.empty((jalur, langkah))
+    for h in range(langkah):
+        hasil[:, h] = (Z @ keadaan)[0] + d
+        if h + 1 < langkah:
+            keadaan = T @ keadaan + c[:, None] + R @ eta[h + 1:h + 2]
+    return {t: (bawah, atas) for t, (bawah, atas) in kuantil_jalur(hasil, tingkat).items()}
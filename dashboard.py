@@ -4,10 +4,14 @@
 import streamlit as st
 import os
 import io
-import runpy
+import importlib
 import matplotlib.pyplot as plt
 import streamlit.components.v1 as components
 from contextlib import redirect_stdout
+import dataset
+import kubus
+import batas_wilayah
+import instrumentasi
 
 # -------------------------------
 # Konfigurasi halaman
@@ -24,22 +28,141 @@ st.caption("Disusun oleh **Yoga Saputra**, **Budi Agung**, **Syah Irul Mahruf**,
 # -------------------------------
 # Fungsi bantu
 # -------------------------------
-def tampilkan_grafik(file_path):
-    """Menjalankan file Python dan menampilkan grafik Matplotlib di Streamlit"""
+@st.cache_data(show_spinner="Membuat grafik...")
+def _grafik_png(nama_modul, data_hash, tahun_awal, tahun_akhir):
+    """Membangun grafik modul visualisasi sekali per (hash dataset, parameter halaman) sebagai PNG"""
+    modul = importlib.import_module(nama_modul)
+    sumber = kubus.muat_sumber(dataset.PATH_DATASET, tahun_awal, tahun_akhir, kolom=getattr(modul, "KOLOM", None))
+    with io.StringIO() as buf, redirect_stdout(buf):
+        figs = modul.buat_grafik(sumber)
+
+    hasil = []
+    for fig in figs:
+        with io.BytesIO() as png:
+            fig.savefig(png, format="png", dpi=150, bbox_inches="tight")
+            hasil.append(png.getvalue())
+        plt.close(fig)
+    return hasil
+
+@st.cache_data(show_spinner="Membuat peta...")
+def _peta_html(nama_modul, data_hash, tahun_awal, tahun_akhir, fungsi="buat_peta"):
+    """Membangun peta folium sekali per (hash dataset, parameter halaman, fungsi) sebagai HTML"""
+    modul = importlib.import_module(nama_modul)
+    sumber = kubus.muat_sumber(dataset.PATH_DATASET, tahun_awal, tahun_akhir, kolom=getattr(modul, "KOLOM", None))
+    with io.StringIO() as buf, redirect_stdout(buf):
+        m = getattr(modul, fungsi)(sumber)
+    return m.get_root().render()
+
+@st.cache_data(show_spinner="Memuat prediksi...")
+def _artefak_prediksi(data_hash, tahun_awal, tahun_akhir):
+    """Artefak prediksi terbaru; model hanya di-fit ulang bila deret total tahunan berubah"""
+    modul = importlib.import_module("visualisasi_prediksi_kelahiran")
+    sumber = kubus.muat_sumber(dataset.PATH_DATASET, tahun_awal, tahun_akhir, kolom=modul.KOLOM)
+    with io.StringIO() as buf, redirect_stdout(buf):
+        df_tahunan = modul.hitung_total_tahunan(sumber)
+        hasil_prediksi = modul.ramal_arima(df_tahunan['jumlah_kelahiran'], order=None)
+    return hasil_prediksi.attrs['artefak']
+
+def _hash_data():
+    """Kunci cache: hash dataset final (+ kubus agregat / penanda Parquet bila ada)"""
+    data_hash = dataset.hash_dataset(dataset.PATH_DATASET)
+    if os.path.exists(kubus.PATH_KUBUS):
+        data_hash += ":" + dataset.hash_dataset(kubus.PATH_KUBUS)
+    if dataset.tersedia_parquet():
+        data_hash += ":" + str(os.path.getmtime(os.path.join(dataset.PATH_PARQUET, dataset.PENANDA_PARQUET)))
+    return data_hash
+
+def tampilkan_grafik(nama_modul):
+    """Menampilkan grafik Matplotlib dari modul visualisasi (di-cache per dataset & halaman)"""
     try:
-        with io.StringIO() as buf, redirect_stdout(buf):
-            plt.close('all')
-            runpy.run_path(file_path)
-            output = buf.getvalue()
-        figs = [plt.figure(i) for i in plt.get_fignums()]
-        if figs:
-            for fig in figs:
-                st.pyplot(fig)
+        data_hash = _hash_data()
+        gambar = _grafik_png(nama_modul, data_hash, dataset.TAHUN_AWAL, dataset.TAHUN_AKHIR)
+        if gambar:
+            for png in gambar:
+                st.image(png)
         else:
-            st.warning("⚠️ Tidak ada grafik yang dihasilkan dari file ini.")
+            st.warning("⚠️ Tidak ada grafik yang dihasilkan dari modul ini.")
     except Exception as e:
         st.error(f"❌ Terjadi error saat menampilkan grafik: {e}")
 
+def _angka(nilai):
+    """Format ribuan gaya Indonesia (titik sebagai pemisah)"""
+    return f"{int(nilai):,}".replace(",", ".")
+
+def ringkasan_prediksi():
+    """Teks ringkasan dari artefak prediksi terbaru, atau None bila gagal dimuat"""
+    try:
+        hasil = _artefak_prediksi(_hash_data(), dataset.TAHUN_AWAL, dataset.TAHUN_AKHIR)
+    except Exception as e:
+        st.error(f"❌ Terjadi error saat memuat artefak prediksi: {e}")
+        return None
+    p = hasil['prediksi']
+    # Interval bootstrap 95% bila tersedia, selain itu interval analitik ARIMA
+    tingkat = int(round((1 - hasil['alpha']) * 100))
+    batas = hasil.get('bootstrap', {}).get('interval', {}).get(str(tingkat), p)
+    terakhir = hasil['aktual']['nilai'][-1]
+    perubahan = (p['nilai'][-1] - terakhir) / terakhir * 100 if terakhir else 0.0
+    if abs(perubahan) < 1:
+        arah = "jumlah kelahiran relatif stabil"
+    elif perubahan < 0:
+        arah = "penurunan tipis" if perubahan > -5 else "penurunan"
+    else:
+        arah = "kenaikan tipis" if perubahan < 5 else "kenaikan"
+    return {
+        'order': "(" + ",".join(str(x) for x in hasil['order']) + ")",
+        'arah': arah,
+        'perubahan': perubahan,
+        'persen': f"{perubahan:+.2f}%".replace(".", ","),
+        'tahun': p['tahun'],
+        'nilai': [_angka(v) for v in p['nilai']],
+        'bawah': [_angka(v) for v in batas['bawah']],
+        'atas': [_angka(v) for v in batas['atas']],
+        'tingkat': tingkat,
+        'versi': hasil['versi'],
+        'dibuat': hasil['dibuat'],
+    }
+
+def tampilkan_peta(nama_modul, height=700, fungsi="buat_peta"):
+    """Menampilkan peta folium dari modul visualisasi (di-cache per dataset & halaman)"""
+    try:
+        data_hash = _hash_data()
+        # Peta juga bergantung pada file GeoJSON batas wilayah (cache lokal)
+        if os.path.exists(batas_wilayah.PATH_GEOJSON):
+            data_hash += ":" + str(os.path.getmtime(batas_wilayah.PATH_GEOJSON))
+        html_data = _peta_html(nama_modul, data_hash, dataset.TAHUN_AWAL, dataset.TAHUN_AKHIR, fungsi)
+        components.html(html_data, height=height)
+    except Exception as e:
+        st.error(f"❌ Terjadi error saat menampilkan peta: {e}")
+
+def tampilkan_waktu_tahap(nama_modul):
+    """Tabel waktu tahap dari run terakhir script (log instrumentasi), bila pernah dicatat"""
+    try:
+        catatan = instrumentasi.run_terakhir(nama_modul)
+    except Exception as e:
+        st.error(f"❌ Terjadi error saat memuat log instrumentasi: {e}")
+        return
+    if not catatan:
+        return
+    with st.expander(f"⏱️ Waktu Tahap Run Terakhir ({min(c['mulai'] for c in catatan)})"):
+        st.dataframe(
+            [{
+                'Tahap': "\u2003" * c['level'] + c['tahap'],
+                'Detik': c['detik'],
+                'CPU (Detik)': c['cpu_detik'],
+                'Baris Masuk': c['baris_masuk'],
+                'Baris Keluar': c['baris_keluar'],
+                'RSS Puncak (MB)': c['rss_puncak_mb'],
+                # Kolom mode memori (tracemalloc + buffer Arrow), kosong untuk run biasa
+                'Alokasi Puncak (MB)': c.get('alokasi_puncak_mb'),
+                'Tertahan (MB)': c.get('tertahan_mb'),
+                'Arrow Puncak (MB)': c.get('arrow_puncak_mb'),
+                'Total Puncak (MB)': c.get('total_puncak_mb'),
+                'Batas (MB)': c.get('batas_mb'),
+                'Status': c['status'],
+            } for c in catatan],
+            hide_index=True, width="stretch",
+        )
+
 # -------------------------------
 # Sidebar Navigasi
 # -------------------------------
@@ -61,6 +184,12 @@ if "page_index" not in st.session_state:
 menu = st.sidebar.radio("Pilih Halaman:", pages, index=st.session_state.page_index)
 base_path = os.path.dirname(os.path.abspath(__file__))
 
+# Sumber data (kubus agregat / dataset) dibaca sekali per proses; halaman memakai cache yang sama
+try:
+    kubus.muat_sumber(dataset.PATH_DATASET)
+except FileNotFoundError:
+    st.warning("⚠️ Dataset belum ditemukan. Jalankan data_cleaning.py terlebih dahulu.")
+
 # -------------------------------
 # Fungsi untuk update halaman
 # -------------------------------
@@ -114,8 +243,8 @@ if menu == "Dashboard":
 # -------------------------------
 elif menu == "Tren Tahunan":
     st.subheader("Tren Jumlah Kelahiran per Tahun (2012–2023)")
-    file_path = os.path.join(base_path, "visualisasi_tren.py")
-    tampilkan_grafik(file_path)
+    tampilkan_grafik("visualisasi_tren")
+    tampilkan_waktu_tahap("visualisasi_tren")
 
     st.markdown("""
     ### Insight:
@@ -132,8 +261,8 @@ elif menu == "Tren Tahunan":
 # -------------------------------
 elif menu == "Distribusi Kabupaten/Kota":
     st.subheader("Distribusi Jumlah Kelahiran per Kabupaten/Kota (2012–2023)")
-    file_path = os.path.join(base_path, "visualisasi_kabupaten_kota.py")
-    tampilkan_grafik(file_path)
+    tampilkan_grafik("visualisasi_kabupaten_kota")
+    tampilkan_waktu_tahap("visualisasi_kabupaten_kota")
 
     st.markdown("""
     ### Insight:
@@ -150,16 +279,12 @@ elif menu == "Distribusi Kabupaten/Kota":
 # -------------------------------
 elif menu == "Heatmap Persebaran":
     st.subheader("Peta Persebaran Kelahiran di Jawa Barat (2012–2023)")
-    file_path = os.path.join(base_path, "visualisasi_heatmap_kelahiran.py")
-    tampilkan_grafik(file_path)
-
-    map_path = os.path.join(base_path, "visualisasi", "heatmap_kelahiran_jawabarat_2012-2023.html")
-    if os.path.exists(map_path):
-        with open(map_path, "r", encoding="utf-8") as f:
-            html_data = f.read()
-        components.html(html_data, height=700)
-    else:
-        st.warning("⚠️ File peta heatmap belum ditemukan. Jalankan ulang script heatmap terlebih dahulu.")
+    tab_tahunan, tab_total = st.tabs(["Per Tahun", "Total 2012–2023"])
+    with tab_tahunan:
+        tampilkan_peta("visualisasi_heatmap_kelahiran", fungsi="buat_peta_tahunan")
+    with tab_total:
+        tampilkan_peta("visualisasi_heatmap_kelahiran")
+    tampilkan_waktu_tahap("visualisasi_heatmap_kelahiran")
 
     st.markdown("""
     ### Insight:
@@ -175,8 +300,8 @@ elif menu == "Heatmap Persebaran":
 # -------------------------------
 elif menu == "Jenis Kelamin & Status":
     st.subheader("Proporsi Berdasarkan Jenis Kelamin & Status Kelahiran (2012–2023)")
-    file_path = os.path.join(base_path, "visualisasi_jenis_status.py")
-    tampilkan_grafik(file_path)
+    tampilkan_grafik("visualisasi_jenis_status")
+    tampilkan_waktu_tahap("visualisasi_jenis_status")
 
     st.markdown("""
     ### Insight:
@@ -195,22 +320,40 @@ elif menu == "Jenis Kelamin & Status":
 # -------------------------------
 elif menu == "Prediksi (2024–2025)":
     st.subheader("Prediksi Jumlah Kelahiran di Jawa Barat (2024–2025)")
-    file_path = os.path.join(base_path, "visualisasi_prediksi_kelahiran.py")
-    tampilkan_grafik(file_path)
-
-    st.markdown("""
+    tampilkan_grafik("visualisasi_prediksi_kelahiran")
+    tampilkan_waktu_tahap("visualisasi_prediksi_kelahiran")
+
+    ringkasan = ringkasan_prediksi()
+    if ringkasan is not None:
+        baris_prediksi = "\n".join(
+            f"    - Prediksi {t}: sekitar {v} kelahiran (interval {ringkasan['tingkat']}%: {b} – {a}).  "
+            for t, v, b, a in zip(ringkasan['tahun'], ringkasan['nilai'], ringkasan['bawah'], ringkasan['atas'])
+        )
+        st.markdown(f"""
     ### Insight:
-    - Model Time Series ARIMA memperkirakan penurunan tipis pada dua tahun mendatang.  
-    - Prediksi 2024: sekitar 860.500 kelahiran.  
-    - Prediksi 2025: sekitar 842.300 kelahiran.  
+    - Model Time Series ARIMA{ringkasan['order']} memperkirakan {ringkasan['arah']} pada dua tahun mendatang.  
+{baris_prediksi}
     - Mengindikasikan stabilisasi populasi dan meningkatnya kesadaran keluarga berencana.  
     
     """)
+        st.caption(f"Artefak prediksi v{ringkasan['versi']} (dibuat {ringkasan['dibuat']})")
 
 # -------------------------------
 elif menu == "Kesimpulan Dan Saran":
     st.subheader("Kesimpulan Dan Saran")
-    st.markdown("""
+    ringkasan = ringkasan_prediksi()
+    if ringkasan is not None:
+        judul_prediksi = f"Menunjukkan {ringkasan['arah'].capitalize()}" if ringkasan['arah'].startswith(("penurunan", "kenaikan")) \
+            else "Relatif Stabil"
+        kalimat_prediksi = (
+            f"Model prediksi menggunakan TIME SERIES ARIMA{ringkasan['order']} memperkirakan jumlah kelahiran sebesar "
+            f"{ringkasan['nilai'][0]} jiwa pada tahun {ringkasan['tahun'][0]} dan {ringkasan['nilai'][-1]} jiwa pada tahun "
+            f"{ringkasan['tahun'][-1]} ({ringkasan['persen']} dibanding tahun terakhir data)."
+        )
+    else:
+        judul_prediksi = "Belum Tersedia"
+        kalimat_prediksi = "Artefak prediksi belum tersedia; jalankan visualisasi_prediksi_kelahiran.py terlebih dahulu."
+    st.markdown(f"""
     ### KESIMPULAN:
     Berdasarkan hasil analisis dan visualisasi data jumlah kelahiran di Provinsi Jawa Barat selama periode 2012–2023, dapat diambil beberapa kesimpulan sebagai berikut:
 
@@ -224,8 +367,8 @@ elif menu == "Kesimpulan Dan Saran":
       Dari hasil visualisasi pie chart, diperoleh total 50,45% kelahiran laki-laki dan 49,55% kelahiran perempuan. Perbandingan ini menunjukkan rasio jenis kelamin yang relatif seimbang, sesuai dengan pola demografi nasional.
     - Kualitas Kesehatan Ibu dan Anak Meningkat.
       Berdasarkan data, 99,73% kelahiran tercatat hidup, sedangkan 0,27% merupakan kelahiran mati. Hal ini menunjukkan bahwa tingkat keberhasilan persalinan di Jawa Barat tergolong sangat baik dan menunjukkan peningkatan kualitas pelayanan kesehatan ibu dan anak.
-    - Prediksi Kelahiran 2024–2025 Menunjukkan Penurunan Ringan.
-      Model prediksi menggunakan TIME SERIES ARIMA memperkirakan jumlah kelahiran sebesar 850.180 jiwa pada tahun 2024 dan menurun sedikit menjadi 824.796 jiwa pada tahun 2025. Hal ini menunjukkan kecenderungan stabil dengan potensi penurunan kecil dalam dua tahun ke depan.
+    - Prediksi Kelahiran 2024–2025 {judul_prediksi}.
+      {kalimat_prediksi}
     - Pemanfaatan Python Efektif untuk Analisis dan Visualisasi.
       Bahasa pemrograman Python beserta pustaka seperti Matplotlib, Seaborn, dan Plotly terbukti efektif dalam mengolah, menganalisis, dan menampilkan data secara informatif dan interaktif. Visualisasi yang dihasilkan membantu memahami pola kelahiran secara lebih mendalam dan komunikatif.
 
@@ -1,50 +1,122 @@
 # Import Lib
 import pandas as pd
 import os
+import argparse
+import glob
+import io
+import json
+import shutil
+import tempfile
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+import dataset
+import kubus
+import inkremental
+import instrumentasi
 
 # path rawdata
 path = "./rawdata/rawdata_kelahiran_jawabarat_2012-2023.csv"
 
-# Pastikan file ada
-print()
-print("----------------------")
-print("Proses Pencarian File ")
-print("----------------------")
-if not os.path.exists(path):
-    print(f"- File Tidak Ditemukan : {path}")
-else:
-    print(f"- File Ditemukan : {path}")
-
-# Membaca file
-print()
-print("----------------------")
-print("Proses Membaca File ")
-print("----------------------")
-try:
-        
-    # Baca File Excel
-    df = pd.read_csv(path)
-    print(f"- Berhasil Membaca File : {path} ✓")
+# Folder & nama file output
+output_folder = "./final_dataset"
+output_path = os.path.join(output_folder, "dataset_kelahiran_jawabarat_2012-2023.csv")
+output_kubus = os.path.join(output_folder, "kubus_kelahiran_jawabarat_2012-2023.csv")
+output_parquet = os.path.join(output_folder, "parquet_kelahiran")
+output_watermark = os.path.join(output_folder, "watermark_kelahiran_jawabarat_2012-2023.json")
+output_hash_baris = os.path.join(output_folder, "watermark_kelahiran_jawabarat_2012-2023.npy")
 
-    print()
-    print("----------------------")
-    print("Proses Cleaning Data ")
-    print("----------------------")
+# Kolom yang dipakai analisis (kode_provinsi hanya untuk partisi Parquet)
+KOLOM_ANALISIS = ['kode_kabupaten_kota', 'nama_kabupaten_kota',
+                  'status_kelahiran', 'jenis_kelamin',
+                  'jumlah_kelahiran', 'tahun']
+
+# Kolom teks yang distandarisasi (kardinalitas rendah: ~27, 2 & 2 nilai unik)
+KOLOM_TEKS = ['nama_kabupaten_kota', 'jenis_kelamin', 'status_kelahiran']
 
+# Kamus kanonik varian nilai -> nilai baku, per kolom. Kunci ditulis dalam
+# bentuk setelah .title().strip(); tambahan kamus bisa dimuat dari JSON
+# dengan struktur yang sama lewat --kanonik.
+_KABUPATEN = ['Bogor', 'Sukabumi', 'Cianjur', 'Bandung', 'Garut', 'Tasikmalaya',
+              'Ciamis', 'Kuningan', 'Cirebon', 'Majalengka', 'Sumedang', 'Indramayu',
+              'Subang', 'Purwakarta', 'Karawang', 'Bekasi', 'Bandung Barat', 'Pangandaran']
+KANONIK = {
+    'nama_kabupaten_kota': {
+        **{f"Kab. {k}": f"Kabupaten {k}" for k in _KABUPATEN},
+        **{f"Kab {k}": f"Kabupaten {k}" for k in _KABUPATEN},
+    },
+    'jenis_kelamin': {'Laki Laki': 'Laki-Laki', 'Pria': 'Laki-Laki', 'Wanita': 'Perempuan'},
+    'status_kelahiran': {},
+}
+
+
+def siapkan_kolom(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalisasi kolom, nama kolom & tipe data (tahap sebelum hapus duplikat)"""
     # Normalisasi Kolom
-    df = df[['kode_kabupaten_kota', 'nama_kabupaten_kota', 
-            'status_kelahiran', 'jenis_kelamin', 
-            'jumlah_kelahiran', 'tahun']]
-    print("- Normalisasi Kolom ✓")
+    kolom = KOLOM_ANALISIS + (['kode_provinsi'] if 'kode_provinsi' in df.columns else [])
+    df = df[kolom]
 
     # Merapihkan Nama Kolom
     df.columns = df.columns.str.strip().str.lower().str.replace(' ', '_')
-    print("- Merapihkan Nama Kolom ✓")
 
     # Ubah Tipe Data Kolom
     df['tahun'] = df['tahun'].astype(int)
     df['jumlah_kelahiran'] = df['jumlah_kelahiran'].astype(int)
     df['kode_kabupaten_kota'] = df['kode_kabupaten_kota'].astype(str)
+    return df
+
+
+def muat_kanonik(path_json: str) -> dict:
+    """Kamus kanonik bawaan digabung dengan kamus dari file JSON {kolom: {varian: baku}}"""
+    with open(path_json, encoding="utf-8") as f:
+        tambahan = json.load(f)
+    return {k: {**KANONIK.get(k, {}), **tambahan.get(k, {})} for k in set(KANONIK) | set(tambahan)}
+
+
+def standarisasi_unik(kolom: pd.Series, kanonik: dict = None, isi_kosong=None) -> pd.Series:
+    """Standarisasi teks (title + strip + kamus kanonik) pada nilai unik saja.
+
+    Kolom dipecah menjadi kode kategori + tabel nilai unik; operasi string
+    hanya dijalankan pada tabel tersebut lalu dipetakan kembali lewat kode,
+    sehingga biayanya mengikuti kardinalitas, bukan jumlah baris. Hasilnya
+    bertipe category (seperti saat dataset final dibaca oleh dataset.py).
+    """
+    kode, unik = pd.factorize(kolom)
+    peta = pd.Series(unik, dtype=object).str.title().str.strip()
+    if kanonik:
+        peta = peta.replace(kanonik)
+
+    # Nilai kosong (kode -1) diarahkan ke entri tambahan di akhir tabel
+    if isi_kosong is not None:
+        peta = pd.concat([peta, pd.Series([isi_kosong], dtype=object)], ignore_index=True)
+        kode[kode < 0] = len(peta) - 1
+
+    # Beberapa varian bisa menjadi nilai baku yang sama: satukan kategorinya
+    kode_baku, kategori = pd.factorize(peta)
+    kode = np.where(kode >= 0, kode_baku[kode], -1)
+    return pd.Series(pd.Categorical.from_codes(kode, kategori), index=kolom.index, name=kolom.name)
+
+
+def isi_dan_standarisasi(df: pd.DataFrame, kanonik: dict = None) -> pd.DataFrame:
+    """Isi nilai kosong & standarisasi teks (tahap setelah hapus duplikat)"""
+    kanonik = KANONIK if kanonik is None else kanonik
+
+    # Ubah Nilai Kosong Perkolom
+    df['jumlah_kelahiran'] = df['jumlah_kelahiran'].fillna(0)
+    df['tahun'] = df['tahun'].fillna(0)
+
+    # Standarisasi Nilai (nama kosong -> "Tidak Diketahui" sekaligus di tabel nilai unik)
+    df['nama_kabupaten_kota'] = standarisasi_unik(df['nama_kabupaten_kota'],
+                                                  kanonik.get('nama_kabupaten_kota'), "Tidak Diketahui")
+    df['jenis_kelamin'] = standarisasi_unik(df['jenis_kelamin'], kanonik.get('jenis_kelamin'))
+    df['status_kelahiran'] = standarisasi_unik(df['status_kelahiran'], kanonik.get('status_kelahiran'))
+    return df
+
+
+def bersihkan(df: pd.DataFrame, kanonik: dict = None) -> pd.DataFrame:
+    """Tahapan cleaning dataset mentah di memori (dengan log progres)"""
+    df = siapkan_kolom(df)
+    print("- Normalisasi Kolom ✓")
+    print("- Merapihkan Nama Kolom ✓")
     print("- Ubah Tipe Data Kolom ✓")
 
     # Hapus Duplicat Data
@@ -57,33 +129,552 @@ try:
     print("- Cek Nilai Yang Kosong Perkolom ✓")
     print(df.isnull().sum())
 
-    # Ubah Nilai Kosong Perkolom
-    df['nama_kabupaten_kota'] = df['nama_kabupaten_kota'].fillna("Tidak Diketahui")
-    df['jumlah_kelahiran'] = df['jumlah_kelahiran'].fillna(0)
-    df['tahun'] = df['tahun'].fillna(0)
+    df = isi_dan_standarisasi(df, kanonik)
     print("- Ubah Nilai Yang Kosong Perkolom ✓")
+    print("- Standarisasi Nilai ✓")
+    return df
+
+
+def _siapkan_parquet(df: pd.DataFrame) -> pd.DataFrame:
+    df = df.copy()
+    if 'kode_provinsi' not in df.columns:
+        # kode provinsi = dua digit awal kode kabupaten/kota
+        df['kode_provinsi'] = df['kode_kabupaten_kota'].astype(int) // 100
+    # Hanya kolom angka yang diringkas; teks sudah di-dictionary-encode oleh Parquet
+    numerik = {k: v for k, v in dataset.DTYPE_DATASET.items() if k in df.columns and v != 'category'}
+    return df.astype(numerik)
+
+
+def _mulai_parquet(folder: str) -> None:
+    if dataset.pyarrow is None:
+        raise ImportError("pyarrow belum terpasang (pip install pyarrow)")
+    if os.path.exists(folder):
+        shutil.rmtree(folder)
+
+
+def _tulis_parquet(df: pd.DataFrame, folder: str) -> None:
+    # Setiap pemanggilan menambah file baru di partisi yang sesuai
+    _siapkan_parquet(df).to_parquet(folder, engine="pyarrow", index=False,
+                                    partition_cols=dataset.PARTISI_PARQUET)
+
+
+def _selesai_parquet(folder: str) -> None:
+    open(os.path.join(folder, dataset.PENANDA_PARQUET), "w").close()
+
+
+def simpan_parquet(df: pd.DataFrame, folder: str = output_parquet) -> None:
+    """Menyimpan dataset bersih sebagai Parquet dipartisi kode_provinsi & tahun.
+
+    Folder lama dihapus lebih dulu; file penanda ditulis paling akhir agar
+    pembaca tidak memakai dataset yang belum selesai ditulis.
+    """
+    _mulai_parquet(folder)
+    _tulis_parquet(df, folder)
+    _selesai_parquet(folder)
+
+
+# -------------------------------
+# Mode streaming (memori terbatas)
+# -------------------------------
+# Perkiraan berapa kali satu chunk tersalin selama cleaning (select, astype, str.*)
+FAKTOR_SALINAN = 4
+
+
+def _rencana_chunk(path_input: str, batas_memori_mb: int):
+    """Menentukan ukuran chunk (baris) & jumlah bucket dedup dari batas memori"""
+    batas = batas_memori_mb * 1024 * 1024
+    sampel = pd.read_csv(path_input, nrows=1000)
+    if len(sampel) == 0:
+        return 1000, 1
+    byte_per_baris = sampel.memory_usage(deep=True).sum() / len(sampel)
+
+    # Perkiraan jumlah baris dari ukuran file & panjang rata-rata baris sampel
+    with open(path_input, "rb") as f:
+        header = f.readline()
+        panjang = sum(len(f.readline()) for _ in range(len(sampel)))
+    perkiraan_baris = max(1, (os.path.getsize(path_input) - len(header)) * len(sampel) // max(1, panjang))
+
+    ukuran_chunk = max(1000, int(batas // (byte_per_baris * FAKTOR_SALINAN)))
+    jumlah_bucket = max(1, -(-int(perkiraan_baris * byte_per_baris * FAKTOR_SALINAN) // batas))
+    return ukuran_chunk, jumlah_bucket
+
+
+def bersihkan_stream(path_input: str, path_output: str = output_path,
+                     batas_memori_mb: int = 256, ukuran_chunk: int = None,
+                     folder_parquet: str = None, kanonik: dict = None) -> pd.DataFrame:
+    """Cleaning per chunk dengan penggunaan memori dibatasi `batas_memori_mb`.
+
+    Hapus duplikat tetap eksak lintas chunk (external dedup):
+    1. Setiap chunk disiapkan lalu ditulis ke file urutan sementara dan ke
+       bucket berdasarkan hash isi baris (baris kembar pasti satu bucket).
+    2. Setiap bucket (cukup kecil untuk memori) di-dedup secara eksak;
+       nomor urut baris duplikat dicatat.
+    3. File urutan dibaca ulang per chunk, baris duplikat dibuang, nilai
+       diisi & distandarisasi, lalu ditambahkan ke output.
+    Memori tambahan yang tumbuh hanya daftar nomor urut baris duplikat.
+
+    Mengembalikan tingkat terhalus kubus (sudah teragregasi) untuk
+    kubus.bangun_kubus, hash baris unik (untuk watermark) & id terakhir.
+    """
+    ukuran_auto, jumlah_bucket = _rencana_chunk(path_input, batas_memori_mb)
+    ukuran_chunk = ukuran_chunk or ukuran_auto
+    print(f"- Ukuran Chunk {ukuran_chunk:,} Baris, {jumlah_bucket} Bucket Dedup ✓")
+
+    folder_tmp = tempfile.mkdtemp(prefix="cleaning_", dir=os.path.dirname(os.path.abspath(path_output)))
+    try:
+        path_urut = os.path.join(folder_tmp, "urut.csv")
+        path_bucket = [os.path.join(folder_tmp, f"bucket_{b}.csv") for b in range(jumlah_bucket)]
+
+        # Tahap 1: siapkan per chunk, tulis ke file urutan & bucket hash
+        seq = 0
+        jumlah_chunk = 0
+        kolom_data = None
+        semua_hash = []
+        id_terakhir = None
+        for chunk in pd.read_csv(path_input, chunksize=ukuran_chunk):
+            if 'id' in chunk.columns and len(chunk):
+                id_chunk = chunk['id'].max()
+                id_terakhir = id_chunk if id_terakhir is None else max(id_terakhir, id_chunk)
+            chunk = siapkan_kolom(chunk)
+            kolom_data = list(chunk.columns)
+            chunk.insert(0, '_seq', np.arange(seq, seq + len(chunk), dtype=np.int64))
+            seq += len(chunk)
+
+            pertama = jumlah_chunk == 0
+            chunk.to_csv(path_urut, mode="w" if pertama else "a", header=pertama, index=False)
+            h = inkremental.hash_baris(chunk[kolom_data])
+            semua_hash.append(np.unique(h))
+            bucket = h % jumlah_bucket
+            for b in range(jumlah_bucket):
+                bagian = chunk[bucket == b]
+                bagian.to_csv(path_bucket[b], mode="w" if pertama else "a", header=pertama, index=False)
+            jumlah_chunk += 1
+        print(f"- Normalisasi Kolom, Nama Kolom & Tipe Data ({jumlah_chunk} Chunk, {seq:,} Baris) ✓")
+
+        # Tahap 2: dedup eksak per bucket (perbandingan teks apa adanya)
+        duplikat = []
+        dtype_teks = {k: str for k in kolom_data}
+        for p in path_bucket:
+            if not os.path.exists(p):
+                continue
+            isi = pd.read_csv(p, dtype={**dtype_teks, '_seq': np.int64}, keep_default_na=False)
+            kembar = isi.duplicated(subset=kolom_data, keep='first').to_numpy()
+            duplikat.append(isi['_seq'].to_numpy()[kembar])
+            os.remove(p)
+        duplikat = np.sort(np.concatenate(duplikat)) if duplikat else np.empty(0, dtype=np.int64)
+        print(f"- Hapus Duplicat Data ({len(duplikat)} Baris) ✓")
+
+        # Tahap 3: buang duplikat, isi & standarisasi, tulis output per chunk
+        path_tmp_output = path_output + ".tmp"
+        if folder_parquet:
+            _mulai_parquet(folder_parquet)
+        nilai_kosong = None
+        parsial_kubus = []
+        pertama = True
+        for chunk in pd.read_csv(path_urut, chunksize=ukuran_chunk,
+                                 dtype={'kode_kabupaten_kota': str, 'nama_kabupaten_kota': str,
+                                        'status_kelahiran': str, 'jenis_kelamin': str,
+                                        '_seq': np.int64}):
+            if len(duplikat):
+                chunk = chunk[~np.isin(chunk['_seq'].to_numpy(), duplikat, assume_unique=True)]
+            chunk = chunk.drop(columns='_seq')
+
+            kosong = chunk.isnull().sum()
+            nilai_kosong = kosong if nilai_kosong is None else nilai_kosong + kosong
+
+            chunk = isi_dan_standarisasi(chunk, kanonik)
+            chunk[KOLOM_ANALISIS].to_csv(path_tmp_output, mode="w" if pertama else "a",
+                                         header=pertama, index=False)
+            if folder_parquet:
+                _tulis_parquet(chunk, folder_parquet)
+            parsial_kubus.append(
+                chunk.groupby(kubus.DIMENSI + [kubus.ATRIBUT_WILAYAH], observed=True, dropna=False)[kubus.UKURAN]
+                .sum().reset_index()
+            )
+            pertama = False
+
+        print("- Cek Nilai Yang Kosong Perkolom ✓")
+        print(nilai_kosong)
+        print("- Ubah Nilai Yang Kosong Perkolom ✓")
+        print("- Standarisasi Nilai ✓")
+
+        os.replace(path_tmp_output, path_output)
+        if folder_parquet:
+            _selesai_parquet(folder_parquet)
+    finally:
+        shutil.rmtree(folder_tmp, ignore_errors=True)
+
+    hash_unik = np.unique(np.concatenate(semua_hash)) if semua_hash else np.empty(0, dtype=np.uint64)
+    return pd.concat(parsial_kubus, ignore_index=True), hash_unik, id_terakhir
+
+
+# -------------------------------
+# Banyak file mentah (satu file per provinsi per rilis)
+# -------------------------------
+def cari_file_input(pola: str) -> list:
+    """Daftar file CSV dari path file, folder, atau pola glob (urutan nama file)"""
+    if os.path.isdir(pola):
+        return sorted(glob.glob(os.path.join(pola, "*.csv")))
+    if glob.has_magic(pola):
+        return sorted(p for p in glob.glob(pola) if os.path.isfile(p))
+    return [pola]
+
+
+def _siapkan_file(path_file: str):
+    """Dijalankan di proses worker: baca, siapkan kolom & hapus duplikat di dalam satu file"""
+    df = siapkan_kolom(pd.read_csv(path_file))
+    h = inkremental.hash_baris(df)
+    unik = ~inkremental.duplikat_eksak(df, h)
+    return len(df), df[unik], h[unik]
+
 
-    # Standarisasi Nilai
-    df['nama_kabupaten_kota'] = df['nama_kabupaten_kota'].str.title().str.strip()
-    df['jenis_kelamin'] = df['jenis_kelamin'].str.title().str.strip()
-    df['status_kelahiran'] = df['status_kelahiran'].str.title().str.strip()
+def bersihkan_banyak(daftar_file: list, kanonik: dict = None, workers: int = None):
+    """Cleaning banyak file mentah secara paralel lalu digabung jadi satu dataset.
+
+    Setiap file dibaca & disiapkan di proses worker terpisah. Hasil digabung
+    sesuai urutan nama file (deterministik), lalu duplikat lintas file
+    dibuang dengan mempertahankan kemunculan pertama, sama seperti
+    drop_duplicates pada gabungan semua file (hash hanya menyaring kandidat,
+    baris dengan hash kembar dibandingkan isinya). Mengembalikan dataset
+    bersih & hash baris unik.
+    """
+    workers = min(workers or os.cpu_count() or 1, len(daftar_file))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        hasil = list(executor.map(_siapkan_file, daftar_file))
+    print(f"- Normalisasi Kolom, Nama Kolom & Tipe Data ({len(daftar_file)} File, {workers} Worker) ✓")
+    for p, (jumlah, _, _) in zip(daftar_file, hasil):
+        print(f"  {os.path.basename(p):<50} {jumlah:>12,} Baris")
+
+    jumlah_mentah = sum(jumlah for jumlah, _, _ in hasil)
+    df = pd.concat([d for _, d, _ in hasil], ignore_index=True)
+    h = np.concatenate([h for _, _, h in hasil])
+    del hasil
+
+    # Hapus duplikat lintas file (kemunculan pertama dipertahankan)
+    unik = ~inkremental.duplikat_eksak(df, h)
+    df = df[unik].reset_index(drop=True)
+    print(f"- Hapus Duplicat Data ({jumlah_mentah - len(df)} Baris) ✓")
+
+    print("- Cek Nilai Yang Kosong Perkolom ✓")
+    print(df.isnull().sum())
+    df = isi_dan_standarisasi(df, kanonik)
+    print("- Ubah Nilai Yang Kosong Perkolom ✓")
     print("- Standarisasi Nilai ✓")
+    return df, h[unik]
 
-    # Buat Folder final_dataset
-    output_folder = "./final_dataset"
-    os.makedirs(output_folder, exist_ok=True)
 
-    # Tentukan nama file folder
-    output_path = os.path.join(output_folder, "dataset_kelahiran_jawabarat_2012-2023.csv")
-    
-    # Simpan ke CSV di folder
-    df.to_csv(output_path, index=False)
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Cleaning dataset kelahiran Jawa Barat")
+    parser.add_argument("--input", default=path,
+                        help="Path file rawdata CSV, folder berisi CSV, atau pola glob (mis. 'rawdata/*.csv')")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Jumlah proses worker untuk banyak file (default jumlah CPU)")
+    parser.add_argument("--parquet", action="store_true",
+                        help="Tambahan output Parquet dipartisi kode_provinsi & tahun")
+    parser.add_argument("--kanonik", default=None, metavar="JSON",
+                        help="Kamus kanonik tambahan {kolom: {varian: nilai baku}}")
+    parser.add_argument("--inkremental", action="store_true",
+                        help="Hanya bersihkan baris mentah baru sejak run terakhir (watermark)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Cleaning per chunk dengan memori terbatas (untuk file besar)")
+    parser.add_argument("--batas-memori", type=int, default=256, metavar="MB",
+                        help="Batas memori mode --stream dalam MB (default 256)")
+    parser.add_argument("--ukuran-chunk", type=int, default=None, metavar="BARIS",
+                        help="Paksa ukuran chunk mode --stream (default dihitung dari --batas-memori)")
+    return parser.parse_args(argv)
+
+
+@instrumentasi.run("data_cleaning")
+def main(argv=None):
+    args = parse_args(argv)
+    path_input = args.input
+    daftar_file = cari_file_input(path_input)
+
+    # Pastikan file ada
+    print()
+    print("----------------------")
+    print("Proses Pencarian File ")
+    print("----------------------")
+    if not daftar_file or not all(os.path.exists(p) for p in daftar_file):
+        print(f"- File Tidak Ditemukan : {path_input}")
+    else:
+        for p in daftar_file:
+            print(f"- File Ditemukan : {p}")
+
+    # Membaca file
+    print()
+    print("----------------------")
+    print("Proses Membaca File ")
+    print("----------------------")
+    try:
+        if not daftar_file:
+            raise FileNotFoundError("tidak ada file CSV yang cocok")
+        kanonik = muat_kanonik(args.kanonik) if args.kanonik else KANONIK
+
+        if len(daftar_file) > 1:
+            # Watermark, --inkremental & --stream berlaku untuk satu file mentah
+            if args.inkremental or args.stream:
+                print("- Mode --inkremental/--stream hanya untuk satu file, proses penuh paralel")
+            print(f"- Membaca {len(daftar_file)} File Secara Paralel ✓")
+            offset = None
+
+            print()
+            print("----------------------")
+            print("Proses Cleaning Data ")
+            print("----------------------")
+            with instrumentasi.tahap("Cleaning Data") as t:
+                df, _ = bersihkan_banyak(daftar_file, kanonik, args.workers)
+                t.baris(keluar=df)
+        else:
+            path_input = daftar_file[0]
+            if args.inkremental and main_inkremental(args, path_input, kanonik):
+                return
+
+            # Posisi akhir file mentah yang ikut diproses (untuk watermark)
+            offset = inkremental.offset_baris_lengkap(path_input, os.path.getsize(path_input))
+
+            if args.stream:
+                main_stream(args, path_input, offset, kanonik)
+                return
+
+            # Baca File Excel
+            with instrumentasi.tahap("Membaca File") as t:
+                df = pd.read_csv(path_input)
+                t.baris(keluar=df)
+            print(f"- Berhasil Membaca File : {path_input} ✓")
+
+            print()
+            print("----------------------")
+            print("Proses Cleaning Data ")
+            print("----------------------")
+            id_terakhir = df['id'].max() if 'id' in df.columns else None
+            with instrumentasi.tahap("Hash Baris") as t:
+                hash_siap = inkremental.hash_baris(siapkan_kolom(df))
+                t.baris(masuk=df, keluar=hash_siap)
+            with instrumentasi.tahap("Cleaning Data") as t:
+                t.baris(masuk=df)
+                df = bersihkan(df, kanonik)
+                t.baris(keluar=df)
+
+        # Buat Folder final_dataset
+        os.makedirs(output_folder, exist_ok=True)
+
+        # Simpan ke CSV di folder (tanpa kode_provinsi, format tetap seperti sebelumnya)
+        with instrumentasi.tahap("Simpan Dataset") as t:
+            df[KOLOM_ANALISIS].to_csv(output_path, index=False)
+            t.baris(masuk=df)
+        print()
+        print("--------")
+        print("Selesai")
+        print("--------")
+        print(f"File CSV berhasil dibuat di: {output_path}")
+
+        # Kubus agregat (semua tingkat roll-up) di samping dataset final
+        with instrumentasi.tahap("Simpan Kubus") as t:
+            df_kubus = kubus.bangun_kubus(df)
+            kubus.simpan_kubus(df_kubus, output_kubus)
+            t.baris(masuk=df, keluar=df_kubus)
+        print(f"Kubus agregat berhasil dibuat di: {output_kubus} ({len(df_kubus)} baris)")
+
+        # Output kolumnar opsional
+        if args.parquet:
+            with instrumentasi.tahap("Simpan Parquet") as t:
+                simpan_parquet(df, output_parquet)
+                t.baris(masuk=df)
+            print(f"Dataset Parquet berhasil dibuat di: {output_parquet}")
+
+        # Watermark ditulis paling akhir, setelah semua output lengkap
+        if offset is not None:
+            with instrumentasi.tahap("Simpan Watermark"):
+                inkremental.simpan_watermark(path_input, offset, id_terakhir, df['tahun'].max(), hash_siap,
+                                             output_path, output_kubus, args.parquet,
+                                             output_watermark, output_hash_baris, kanonik,
+                                             output_parquet)
+            print(f"Watermark berhasil dibuat di: {output_watermark}")
+
+    except Exception as e:
+        print(f"- Gagal Membaca file : {path_input} : {e}")
+
+
+def main_stream(args, path_input: str, offset: int, kanonik: dict) -> None:
+    """Jalur --stream: file mentah tidak pernah dimuat utuh ke memori"""
+    print(f"- Membaca File Per Chunk (Batas Memori {args.batas_memori} MB) : {path_input} ✓")
+
+    print()
+    print("----------------------")
+    print("Proses Cleaning Data ")
+    print("----------------------")
+    os.makedirs(output_folder, exist_ok=True)
+    folder_parquet = output_parquet if args.parquet else None
+    with instrumentasi.tahap("Cleaning Data (Stream)") as t:
+        df_halus, hash_siap, id_terakhir = bersihkan_stream(path_input, output_path, args.batas_memori,
+                                                            args.ukuran_chunk, folder_parquet, kanonik)
+        t.baris(masuk=len(hash_siap), keluar=df_halus)
     print()
     print("--------")
     print("Selesai")
     print("--------")
     print(f"File CSV berhasil dibuat di: {output_path}")
 
-except Exception as e:
-    print(f"- Gagal Membaca file : {path} : {e}")
+    # Kubus dibangun dari agregat parsial per chunk (jumlah dari jumlah tetap benar)
+    with instrumentasi.tahap("Simpan Kubus") as t:
+        df_kubus = kubus.bangun_kubus(df_halus)
+        kubus.simpan_kubus(df_kubus, output_kubus)
+        t.baris(masuk=df_halus, keluar=df_kubus)
+    print(f"Kubus agregat berhasil dibuat di: {output_kubus} ({len(df_kubus)} baris)")
+
+    if folder_parquet:
+        print(f"Dataset Parquet berhasil dibuat di: {output_parquet}")
+
+    with instrumentasi.tahap("Simpan Watermark"):
+        inkremental.simpan_watermark(path_input, offset, id_terakhir, df_halus['tahun'].max(), hash_siap,
+                                     output_path, output_kubus, args.parquet,
+                                     output_watermark, output_hash_baris, kanonik,
+                                     output_parquet)
+    print(f"Watermark berhasil dibuat di: {output_watermark}")
+
+
+def _kubus_tambah(path_kubus: str, baru: pd.DataFrame) -> pd.DataFrame:
+    """Kubus baru = roll-up (tingkat terhalus kubus lama + agregat baris baru).
+
+    Hasilnya dicek: setiap tingkat harus berjumlah sama dengan total kubus
+    lama + baris baru. ValueError bila tidak konsisten.
+    """
+    kolom = kubus.DIMENSI + [kubus.ATRIBUT_WILAYAH, kubus.UKURAN]
+    lama = pd.read_csv(path_kubus)
+    total = int(lama.loc[lama['tingkat'] == 0, kubus.UKURAN].sum()) + int(baru[kubus.UKURAN].sum())
+    lama = lama.loc[lama['tingkat'] == kubus.TINGKAT_TERHALUS, kolom]
+    # Samakan tipe dengan dataset bersih (kode wilayah sebagai teks) agar format output sama
+    lama = lama.astype({'tahun': 'int64', 'kode_kabupaten_kota': 'int64'}).astype({'kode_kabupaten_kota': str})
+    baru = baru[kolom]
+    df_kubus = kubus.bangun_kubus(pd.concat([lama, baru], ignore_index=True))
+    alasan = kubus.cek_kubus(df_kubus, total)
+    if alasan is not None:
+        raise ValueError(f"kubus inkremental tidak konsisten, {alasan}")
+    return df_kubus
+
+
+def main_inkremental(args, path_input: str, kanonik: dict) -> bool:
+    """Jalur --inkremental: bersihkan baris mentah setelah watermark lalu gabungkan.
+
+    Mengembalikan False bila watermark tidak bisa dipakai (pemanggil lalu
+    menjalankan proses ulang penuh). Duplikat di antara baris baru dicek
+    isinya; terhadap baris yang sudah diproses dedup hanya berbasis hash
+    64-bit (teks baris lama tidak disimpan), sehingga hasil sama dengan
+    proses penuh kecuali pada tabrakan hash (peluang ~n²/2⁶⁵ untuk n baris).
+    Dataset & kubus ditulis ke file sementara lalu os.replace, lalu
+    watermark (beserta daftar file Parquet); penanda Parquet paling akhir.
+    """
+    wm = inkremental.muat_watermark(output_watermark)
+    alasan = inkremental.cek_watermark(wm, path_input, output_path, output_kubus, output_hash_baris,
+                                       output_parquet if args.parquet or (wm and wm['parquet']) else None,
+                                       kanonik)
+    if alasan is None:
+        # Kubus lama yang tingkatnya tidak berjumlah sama (mis. tingkat terhalus kehilangan
+        # baris berkunci kosong) tidak boleh jadi dasar roll-up inkremental
+        alasan = kubus.cek_kubus(pd.read_csv(output_kubus))
+        alasan = alasan and f"kubus lama tidak konsisten, {alasan}"
+    if alasan is not None:
+        print(f"- Watermark Tidak Dipakai ({alasan}), Proses Ulang Penuh")
+        return False
+
+    offset_lama = wm['offset_mentah']
+    offset = inkremental.offset_baris_lengkap(path_input, os.path.getsize(path_input))
+    print(f"- Watermark Ditemukan (id terakhir {wm['id_terakhir']}, tahun terakhir {wm['tahun_terakhir']}) ✓")
+
+    with instrumentasi.tahap("Membaca Baris Baru") as t:
+        with open(path_input, "rb") as f:
+            f.seek(offset_lama)
+            ekor = f.read(offset - offset_lama)
+        kolom_mentah = pd.read_csv(path_input, nrows=0).columns
+        if ekor.strip():
+            df = pd.read_csv(io.BytesIO(ekor), header=None, names=kolom_mentah)
+        else:
+            df = pd.DataFrame(columns=kolom_mentah)
+        if 'id' in df.columns and wm['id_terakhir'] is not None:
+            df = df[df['id'] > wm['id_terakhir']]
+        t.baris(keluar=df)
+    print(f"- Berhasil Membaca {len(df)} Baris Baru : {path_input} ✓")
+
+    print()
+    print("----------------------")
+    print("Proses Cleaning Data ")
+    print("----------------------")
+    hash_lama = inkremental.muat_hash_baris(output_hash_baris)
+    id_terakhir = wm['id_terakhir']
+    if len(df):
+        if 'id' in df.columns:
+            id_terakhir = max(int(df['id'].max()), id_terakhir or 0)
+        with instrumentasi.tahap("Cleaning Data") as t:
+            t.baris(masuk=df)
+            df = siapkan_kolom(df)
+            print("- Normalisasi Kolom, Nama Kolom & Tipe Data ✓")
+
+            # Hapus duplikat di dalam baris baru (dicek isinya) & terhadap baris
+            # yang sudah diproses (berbasis hash saja)
+            h = inkremental.hash_baris(df)
+            unik = ~inkremental.duplikat_eksak(df, h) & ~np.isin(h, hash_lama)
+            print(f"- Hapus Duplicat Data ({int((~unik).sum())} Baris) ✓")
+            df = df[unik]
+            h = h[unik]
+
+            print("- Cek Nilai Yang Kosong Perkolom ✓")
+            print(df.isnull().sum())
+            df = isi_dan_standarisasi(df, kanonik)
+            print("- Ubah Nilai Yang Kosong Perkolom ✓")
+            print("- Standarisasi Nilai ✓")
+            t.baris(keluar=df)
+    else:
+        h = np.empty(0, dtype=np.uint64)
+
+    tahun_terakhir = wm['tahun_terakhir']
+    if len(df):
+        tahun_terakhir = max(int(df['tahun'].max()), tahun_terakhir)
+
+        with instrumentasi.tahap("Simpan Dataset & Kubus") as t:
+            # Kubus dihitung & dicek lebih dulu; bila tidak konsisten belum ada file yang ditulis
+            try:
+                df_kubus = _kubus_tambah(output_kubus, df)
+            except ValueError as e:
+                print(f"- Watermark Tidak Dipakai ({e}), Proses Ulang Penuh")
+                return False
+
+            # Dataset: salin file lama + tambahkan baris baru, lalu ganti sekaligus
+            shutil.copyfile(output_path, output_path + ".tmp")
+            df[KOLOM_ANALISIS].to_csv(output_path + ".tmp", mode="a", header=False, index=False)
+            kubus.simpan_kubus(df_kubus, output_kubus + ".tmp")
+            t.baris(masuk=df, keluar=df_kubus)
+
+        # Parquet: penanda dihapus dulu; partisi baru ditulis sebagai file baru (nama unik)
+        # yang baru tercatat di watermark & diterbitkan lewat penanda setelah CSV/kubus diganti.
+        # Terhenti di antaranya -> file tidak tercatat / penanda hilang -> proses ulang penuh.
+        if wm['parquet']:
+            os.remove(os.path.join(output_parquet, dataset.PENANDA_PARQUET))
+            _tulis_parquet(df, output_parquet)
+
+        os.replace(output_path + ".tmp", output_path)
+        os.replace(output_kubus + ".tmp", output_kubus)
+
+    inkremental.simpan_watermark(path_input, offset, id_terakhir, tahun_terakhir,
+                                 np.concatenate([hash_lama, h]), output_path, output_kubus,
+                                 wm['parquet'], output_watermark, output_hash_baris, kanonik,
+                                 output_parquet)
+    if len(df) and wm['parquet']:
+        _selesai_parquet(output_parquet)
+    print()
+    print("--------")
+    print("Selesai")
+    print("--------")
+    if len(df):
+        print(f"{len(df)} Baris Baru Ditambahkan ke: {output_path}")
+        print(f"Kubus agregat diperbarui di: {output_kubus} ({len(df_kubus)} baris)")
+        if wm['parquet']:
+            print(f"Dataset Parquet diperbarui di: {output_parquet}")
+    else:
+        print("Tidak ada baris baru sejak run terakhir")
+    print(f"Watermark diperbarui di: {output_watermark}")
+    return True
+
 
+if __name__ == "__main__":
+    main()
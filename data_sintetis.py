@@ -0,0 +1,254 @@
+# ==============================================================
+# GENERATOR DATA MENTAH SINTETIS (UJI BEBAN SKALA NASIONAL)
+# Menulis file CSV dengan skema rawdata yang sama persis untuk jumlah
+# provinsi, kabupaten/kota & tahun berapa pun, lengkap dengan baris
+# kotor (duplikat, variasi huruf, spasi, nilai kosong). Data ditulis
+# per chunk sehingga memori tetap konstan berapa pun ukuran file.
+# ==============================================================
+# Import Lib
+import os
+import argparse
+import time
+import numpy as np
+import pandas as pd
+import data_cleaning
+import koordinat
+
+# Path output bawaan (terpisah dari rawdata asli agar tidak ikut terbaca glob rawdata/*.csv)
+output_path = "./rawdata_sintetis/rawdata_kelahiran_sintetis.csv"
+
+KOLOM_MENTAH = ['id', 'kode_provinsi', 'nama_provinsi', 'kode_kabupaten_kota', 'nama_kabupaten_kota',
+                'status_kelahiran', 'jenis_kelamin', 'jumlah_kelahiran', 'satuan', 'tahun']
+STATUS = ('HIDUP', 'MATI')
+JENIS = ('LAKI-LAKI', 'PEREMPUAN')
+SATUAN = "JIWA"
+
+# Kode & nama provinsi (kode BPS); kode lain yang belum terpakai diberi nama sintetis
+PROVINSI = {
+    32: "JAWA BARAT", 11: "ACEH", 12: "SUMATERA UTARA", 13: "SUMATERA BARAT", 14: "RIAU",
+    15: "JAMBI", 16: "SUMATERA SELATAN", 17: "BENGKULU", 18: "LAMPUNG",
+    19: "KEPULAUAN BANGKA BELITUNG", 21: "KEPULAUAN RIAU", 31: "DKI JAKARTA", 33: "JAWA TENGAH",
+    34: "DI YOGYAKARTA", 35: "JAWA TIMUR", 36: "BANTEN", 51: "BALI", 52: "NUSA TENGGARA BARAT",
+    53: "NUSA TENGGARA TIMUR", 61: "KALIMANTAN BARAT", 62: "KALIMANTAN TENGAH",
+    63: "KALIMANTAN SELATAN", 64: "KALIMANTAN TIMUR", 65: "KALIMANTAN UTARA", 71: "SULAWESI UTARA",
+    72: "SULAWESI TENGAH", 73: "SULAWESI SELATAN", 74: "SULAWESI TENGGARA", 75: "GORONTALO",
+    76: "SULAWESI BARAT", 81: "MALUKU", 82: "MALUKU UTARA", 91: "PAPUA BARAT", 94: "PAPUA",
+}
+# Batas skema kode: kode_kabupaten_kota = kode_provinsi × 100 + nomor (dibaca sebagai int16)
+MAKS_WILAYAH = 99
+# Nomor wilayah mulai dari sini berstatus kota (pola kode BPS: 71–99)
+NOMOR_KOTA = 71
+
+# Proporsi baris kotor bawaan per jenis (terhadap baris bersih)
+KOTOR = {'duplikat': 0.01, 'huruf': 0.02, 'spasi': 0.02, 'kosong': 0.005}
+# Kolom yang boleh dikosongkan. Kolom angka (tahun, jumlah_kelahiran) tidak dikosongkan
+# karena data_cleaning.siapkan_kolom mengubah tipenya sebelum nilai kosong diisi.
+KOLOM_KOSONG = ['nama_kabupaten_kota', 'status_kelahiran', 'jenis_kelamin', 'nama_provinsi', 'satuan']
+# Variasi penulisan yang dikenali kamus kanonik data_cleaning (setelah .title().strip())
+# Singkatan "Kab." hanya dipakai untuk nama yang ada di kamus kanonik (selain itu tidak bisa dibakukan)
+SINGKATAN = set(data_cleaning.KANONIK['nama_kabupaten_kota'])
+VARIAN_JENIS = {'LAKI-LAKI': ['laki laki', 'PRIA', 'Pria'], 'PEREMPUAN': ['WANITA', 'wanita']}
+
+BARIS_PER_CHUNK = 250_000
+SEED = 2024
+
+
+def daftar_wilayah(jumlah_provinsi: int, wilayah_per_provinsi: int) -> pd.DataFrame:
+    """Tabel kode & nama provinsi / kabupaten-kota untuk data sintetis.
+
+    Jawa Barat (32) memakai 27 kabupaten/kota asli dari registri koordinat
+    bila jumlahnya cukup; wilayah lain diberi nama sintetis berdasarkan kode.
+    """
+    if not 1 <= wilayah_per_provinsi <= MAKS_WILAYAH:
+        raise ValueError(f"Jumlah wilayah per provinsi harus 1–{MAKS_WILAYAH}")
+    kode_provinsi = list(PROVINSI) + [k for k in range(11, 100) if k not in PROVINSI]
+    if not 1 <= jumlah_provinsi <= len(kode_provinsi):
+        raise ValueError(f"Jumlah provinsi harus 1–{len(kode_provinsi)}")
+
+    try:
+        asli = koordinat.muat_koordinat()
+        asli = dict(zip(asli['kode_kabupaten_kota'].astype(int), asli['nama_kabupaten_kota'].str.upper()))
+    except Exception:
+        asli = {}
+
+    baris = []
+    for kode_prov in kode_provinsi[:jumlah_provinsi]:
+        nama_prov = PROVINSI.get(kode_prov, f"PROVINSI SINTETIS {kode_prov}")
+        kode_asli = sorted(k for k in asli if k // 100 == kode_prov)[:wilayah_per_provinsi]
+        nomor_sintetis = (n for n in range(1, MAKS_WILAYAH + 1) if kode_prov * 100 + n not in asli)
+        for kode in kode_asli:
+            baris.append((kode_prov, nama_prov, kode, asli[kode]))
+        for _ in range(wilayah_per_provinsi - len(kode_asli)):
+            n = next(nomor_sintetis)
+            jenis = "KOTA" if n >= NOMOR_KOTA else "KABUPATEN"
+            baris.append((kode_prov, nama_prov, kode_prov * 100 + n, f"{jenis} SINTETIS {kode_prov * 100 + n}"))
+    return pd.DataFrame(baris, columns=['kode_provinsi', 'nama_provinsi', 'kode_kabupaten_kota', 'nama_kabupaten_kota'])
+
+
+def _kerangka_deret(wilayah: pd.DataFrame, rng) -> tuple:
+    """Satu deret per (wilayah, status, jenis kelamin) + level awal kelahiran per deret"""
+    n = len(wilayah)
+    idx = np.repeat(np.arange(n), len(STATUS) * len(JENIS))
+    status = np.tile(np.repeat(np.arange(len(STATUS)), len(JENIS)), n)
+    jenis = np.tile(np.arange(len(JENIS)), n * len(STATUS))
+
+    # Kelahiran hidup per wilayah & jenis kelamin ~ log-normal (ratusan sampai puluhan ribu);
+    # kelahiran mati = sebagian kecil dari kelahiran hidup
+    hidup = np.exp(rng.normal(np.log(15_000), 0.9, size=(n, len(JENIS))))
+    rasio_mati = rng.uniform(0.003, 0.012, size=(n, len(JENIS)))
+    level = np.where(status == 0, hidup[idx, jenis], hidup[idx, jenis] * rasio_mati[idx, jenis])
+
+    kerangka = pd.DataFrame({
+        'kode_provinsi': wilayah['kode_provinsi'].to_numpy()[idx],
+        'nama_provinsi': wilayah['nama_provinsi'].to_numpy()[idx],
+        'kode_kabupaten_kota': wilayah['kode_kabupaten_kota'].to_numpy()[idx],
+        'nama_kabupaten_kota': wilayah['nama_kabupaten_kota'].to_numpy()[idx],
+        'status_kelahiran': np.asarray(STATUS, dtype=object)[status],
+        'jenis_kelamin': np.asarray(JENIS, dtype=object)[jenis],
+    })
+    return kerangka, level
+
+
+def _kotori(df: pd.DataFrame, kotor: dict, rng) -> tuple:
+    """Menyisipkan baris kotor ke satu chunk; mengembalikan (chunk, jumlah per jenis)"""
+    n = len(df)
+    jumlah = {}
+    teks = ['nama_kabupaten_kota', 'status_kelahiran', 'jenis_kelamin']
+
+    # Variasi huruf & singkatan yang dikenali kamus kanonik
+    pilih = np.flatnonzero(rng.random(n) < kotor.get('huruf', 0))
+    kolom = rng.choice(teks, size=len(pilih))
+    for k in teks:
+        baris = pilih[kolom == k]
+        if not len(baris):
+            continue
+        nilai = df[k].to_numpy(dtype=object)
+        gaya = rng.integers(0, 3, size=len(baris))
+        for i, g in zip(baris, gaya):
+            v = nilai[i]
+            if k == 'jenis_kelamin' and g == 2:
+                nilai[i] = rng.choice(VARIAN_JENIS[v])
+            elif k == 'nama_kabupaten_kota' and g == 2 and f"Kab. {v[10:].title()}" in SINGKATAN:
+                nilai[i] = ("KAB. " if rng.random() < 0.5 else "Kab ") + v[10:].title()
+            else:
+                nilai[i] = v.lower() if g == 0 else v.title()
+        df[k] = nilai
+    jumlah['huruf'] = len(pilih)
+
+    # Spasi di awal/akhir teks
+    pilih = np.flatnonzero(rng.random(n) < kotor.get('spasi', 0))
+    kolom = rng.choice(teks, size=len(pilih))
+    for k in teks:
+        baris = pilih[kolom == k]
+        if len(baris):
+            nilai = df[k].to_numpy(dtype=object)
+            nilai[baris] = ["  " + nilai[i] + " " for i in baris]
+            df[k] = nilai
+    jumlah['spasi'] = len(pilih)
+
+    # Nilai kosong
+    pilih = np.flatnonzero(rng.random(n) < kotor.get('kosong', 0))
+    kolom = rng.choice(KOLOM_KOSONG, size=len(pilih))
+    for k in KOLOM_KOSONG:
+        baris = pilih[kolom == k]
+        if len(baris):
+            nilai = df[k].to_numpy(dtype=object)
+            nilai[baris] = None
+            df[k] = nilai
+    jumlah['kosong'] = len(pilih)
+
+    # Duplikat (baris yang sama dikirim ulang), disisipkan di posisi acak setelah baris aslinya
+    pilih = np.flatnonzero(rng.random(n) < kotor.get('duplikat', 0))
+    if len(pilih):
+        posisi = np.concatenate([np.arange(n), rng.integers(pilih, n) + 0.5])
+        df = pd.concat([df, df.iloc[pilih]], ignore_index=True)
+        df = df.iloc[np.argsort(posisi, kind='stable')].reset_index(drop=True)
+    jumlah['duplikat'] = len(pilih)
+    return df, jumlah
+
+
+def tulis_sintetis(path_output: str = output_path, jumlah_provinsi: int = 1, wilayah_per_provinsi: int = 27,
+                   tahun_awal: int = 2012, jumlah_tahun: int = 12, kotor: dict = None,
+                   seed: int = SEED, baris_per_chunk: int = BARIS_PER_CHUNK) -> dict:
+    """Menulis file mentah sintetis per chunk (memori konstan) dan mengembalikan ringkasan.
+
+    Setiap deret (wilayah × status × jenis kelamin) berkembang per tahun
+    dengan tren acak (random walk log) dan noise Poisson. Baris ditulis
+    berurutan per tahun; id berurutan mulai 1 (termasuk baris duplikat).
+    File ditulis ke `.tmp` lalu di-rename agar tidak pernah terbaca setengah jadi.
+    """
+    kotor = KOTOR if kotor is None else kotor
+    # Aliran acak terpisah untuk nilai & baris kotor: nilai tetap sama apa pun proporsi kotornya
+    rng, rng_kotor = (np.random.default_rng([seed, i]) for i in range(2))
+    wilayah = daftar_wilayah(jumlah_provinsi, wilayah_per_provinsi)
+    kerangka, level = _kerangka_deret(wilayah, rng)
+    tahun_per_chunk = max(1, baris_per_chunk // len(kerangka))
+
+    os.makedirs(os.path.dirname(os.path.abspath(path_output)), exist_ok=True)
+    ringkasan = {'wilayah': len(wilayah), 'deret': len(kerangka), 'baris': 0,
+                 **{k: 0 for k in ('duplikat', 'huruf', 'spasi', 'kosong')}}
+    id_berikut = 1
+    with open(path_output + ".tmp", "w", encoding="utf-8", newline="") as f:
+        for mulai in range(0, jumlah_tahun, tahun_per_chunk):
+            blok = []
+            for tahun in range(tahun_awal + mulai, tahun_awal + min(mulai + tahun_per_chunk, jumlah_tahun)):
+                level = level * np.exp(rng.normal(-0.01, 0.04, size=len(level)))
+                df = kerangka.copy()
+                df['jumlah_kelahiran'] = rng.poisson(level)
+                df['satuan'] = SATUAN
+                df['tahun'] = tahun
+                blok.append(df)
+            df, jumlah = _kotori(pd.concat(blok, ignore_index=True), kotor, rng_kotor)
+            df.insert(0, 'id', np.arange(id_berikut, id_berikut + len(df)))
+            id_berikut += len(df)
+            df[KOLOM_MENTAH].to_csv(f, header=mulai == 0, index=False)
+            ringkasan['baris'] += len(df)
+            for k, v in jumlah.items():
+                ringkasan[k] += v
+    os.replace(path_output + ".tmp", path_output)
+    ringkasan['ukuran_mb'] = os.path.getsize(path_output) / 2**20
+    return ringkasan
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generator data mentah kelahiran sintetis (skema rawdata)")
+    parser.add_argument("--output", default=output_path, help="File CSV output")
+    parser.add_argument("--provinsi", type=int, default=1, help="Jumlah provinsi (default 1: Jawa Barat)")
+    parser.add_argument("--wilayah", type=int, default=27,
+                        help=f"Jumlah kabupaten/kota per provinsi (1–{MAKS_WILAYAH}, default 27)")
+    parser.add_argument("--tahun-awal", type=int, default=2012, help="Tahun pertama (default 2012)")
+    parser.add_argument("--tahun", type=int, default=12, help="Jumlah tahun (default 12)")
+    for jenis, nilai in KOTOR.items():
+        parser.add_argument(f"--{jenis}", type=float, default=nilai,
+                            help=f"Proporsi baris kotor jenis {jenis} (default {nilai})")
+    parser.add_argument("--seed", type=int, default=SEED, help="Seed acak (hasil sama untuk seed sama)")
+    parser.add_argument("--baris-per-chunk", type=int, default=BARIS_PER_CHUNK,
+                        help="Baris per chunk tulis (menentukan pemakaian memori)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    kotor = {jenis: getattr(args, jenis) for jenis in KOTOR}
+
+    print()
+    print("--------------------------------")
+    print("Proses Pembuatan Data Sintetis ")
+    print("--------------------------------")
+    try:
+        mulai = time.perf_counter()
+        hasil = tulis_sintetis(args.output, args.provinsi, args.wilayah, args.tahun_awal, args.tahun,
+                               kotor, args.seed, args.baris_per_chunk)
+        durasi = time.perf_counter() - mulai
+        print(f"- {args.provinsi} Provinsi, {hasil['wilayah']:,} Kabupaten/Kota, {hasil['deret']:,} Deret, "
+              f"{args.tahun} Tahun ({args.tahun_awal}–{args.tahun_awal + args.tahun - 1}) ✓")
+        print(f"- Baris Kotor : Duplikat {hasil['duplikat']:,} | Huruf {hasil['huruf']:,} | "
+              f"Spasi {hasil['spasi']:,} | Kosong {hasil['kosong']:,}")
+        print(f"- {hasil['baris']:,} Baris ({hasil['ukuran_mb']:,.1f} MB) dalam {durasi:.1f} Detik ✓")
+        print(f"- File Berhasil Dibuat di: {args.output} ✓")
+    except Exception as e:
+        print(f"- Gagal Membuat Data Sintetis : {args.output} : {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+# ==============================================================
+# PEMUAT DATASET KELAHIRAN JAWA BARAT (2012–2023)
+# Dibaca sekali per proses dengan tipe data ringkas & di-cache
+# ==============================================================
+# Import Lib
+import os
+import hashlib
+import pandas as pd
+
+try:
+    import pyarrow  # opsional, hanya untuk dataset Parquet
+except ImportError:
+    pyarrow = None
+
+# Path dataset hasil data_cleaning.py (relatif terhadap folder project)
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+PATH_DATASET = os.path.join(BASE_PATH, "final_dataset", "dataset_kelahiran_jawabarat_2012-2023.csv")
+
+# Dataset kolumnar (opsional), dipartisi kode_provinsi=../tahun=..
+PATH_PARQUET = os.path.join(BASE_PATH, "final_dataset", "parquet_kelahiran")
+PARTISI_PARQUET = ['kode_provinsi', 'tahun']
+# File penanda yang ditulis paling akhir; tanpa penanda, dataset dianggap belum lengkap
+PENANDA_PARQUET = "_SUCCESS"
+
+# Rentang tahun analisis
+TAHUN_AWAL = 2012
+TAHUN_AKHIR = 2023
+
+# Tipe data ringkas per kolom
+# - kode wilayah (mis. 3201) muat di int16, termasuk kode nasional (1101–9471)
+# - kolom teks berkardinalitas rendah disimpan sebagai category
+DTYPE_DATASET = {
+    'kode_provinsi': 'int8',
+    'kode_kabupaten_kota': 'int16',
+    'nama_kabupaten_kota': 'category',
+    'status_kelahiran': 'category',
+    'jenis_kelamin': 'category',
+    'jumlah_kelahiran': 'int32',
+    'tahun': 'int16',
+}
+
+# Cache per proses: (path absolut, tahun_awal, tahun_akhir, kolom) -> (mtime, DataFrame)
+_cache = {}
+# Cache hash isi file: path absolut -> (mtime, sha1)
+_cache_hash = {}
+
+
+def _is_parquet(path: str) -> bool:
+    return os.path.isdir(path)
+
+
+def _mtime(path: str) -> int:
+    # Dataset Parquet berupa folder: gunakan waktu file penanda
+    if _is_parquet(path):
+        return os.stat(os.path.join(path, PENANDA_PARQUET)).st_mtime_ns
+    return os.stat(path).st_mtime_ns
+
+
+def tersedia_parquet(path: str = PATH_PARQUET) -> bool:
+    """True bila dataset Parquet lengkap tersedia dan pyarrow terpasang"""
+    return pyarrow is not None and os.path.exists(os.path.join(path, PENANDA_PARQUET))
+
+
+def _baca_csv(path: str, kolom=None) -> pd.DataFrame:
+    if kolom is None:
+        return pd.read_csv(path, dtype=DTYPE_DATASET)
+    return pd.read_csv(path, usecols=list(kolom), dtype={k: DTYPE_DATASET[k] for k in kolom})
+
+
+def _baca_parquet(path: str, kolom=None, tahun_awal=None, tahun_akhir=None) -> pd.DataFrame:
+    # Partisi tahun di luar rentang tidak dibaca sama sekali (partition pruning)
+    filters = []
+    if tahun_awal is not None:
+        filters.append(('tahun', '>=', tahun_awal))
+    if tahun_akhir is not None:
+        filters.append(('tahun', '<=', tahun_akhir))
+    df = pd.read_parquet(path, engine="pyarrow", columns=None if kolom is None else list(kolom),
+                         filters=filters or None)
+
+    # Kolom partisi dibaca kembali sebagai category: kembalikan ke tipe ringkas
+    dtype = {k: v for k, v in DTYPE_DATASET.items() if k in df.columns}
+    return df.astype(dtype)
+
+
+def muat_dataset(path: str = PATH_DATASET,
+                 tahun_awal: int = TAHUN_AWAL,
+                 tahun_akhir: int = TAHUN_AKHIR,
+                 kolom=None) -> pd.DataFrame:
+    """Membaca dataset final yang sudah difilter per tahun.
+
+    `path` boleh berupa file CSV atau folder dataset Parquet. Bila `kolom`
+    diberikan, hanya kolom tersebut (ditambah `tahun`) yang dibaca.
+    Hasil di-cache berdasarkan path + waktu modifikasi file, sehingga
+    file hanya di-parse ulang bila isinya berubah. DataFrame yang
+    dikembalikan dipakai bersama: jangan diubah in-place.
+    """
+    path_abs = os.path.abspath(path)
+    mtime = _mtime(path_abs)
+    if kolom is not None:
+        kolom = tuple(dict.fromkeys(list(kolom) + ['tahun']))
+
+    key = (path_abs, tahun_awal, tahun_akhir, kolom)
+    hit = _cache.get(key)
+    if hit is not None and hit[0] == mtime:
+        return hit[1]
+
+    if _is_parquet(path_abs):
+        df = _baca_parquet(path_abs, kolom, tahun_awal, tahun_akhir).reset_index(drop=True)
+        _cache[key] = (mtime, df)
+        return df
+
+    # Gunakan ulang frame penuh bila sudah ada di cache
+    key_penuh = (path_abs, None, None, None)
+    hit_penuh = _cache.get(key_penuh)
+    if hit_penuh is not None and hit_penuh[0] == mtime:
+        df = hit_penuh[1]
+        if kolom is not None:
+            df = df[list(kolom)]
+    else:
+        df = _baca_csv(path_abs, kolom)
+        if kolom is None:
+            _cache[key_penuh] = (mtime, df)
+
+    if tahun_awal is not None or tahun_akhir is not None:
+        awal = df['tahun'].min() if tahun_awal is None else tahun_awal
+        akhir = df['tahun'].max() if tahun_akhir is None else tahun_akhir
+        df = df[df['tahun'].between(awal, akhir)].reset_index(drop=True)
+    _cache[key] = (mtime, df)
+    return df
+
+
+def hash_dataset(path: str = PATH_DATASET) -> str:
+    """SHA-1 isi file dataset (kunci cache grafik), dihitung ulang hanya bila mtime berubah"""
+    path_abs = os.path.abspath(path)
+    mtime = os.stat(path_abs).st_mtime_ns
+    hit = _cache_hash.get(path_abs)
+    if hit is not None and hit[0] == mtime:
+        return hit[1]
+
+    h = hashlib.sha1()
+    with open(path_abs, "rb") as f:
+        for blok in iter(lambda: f.read(1 << 20), b""):
+            h.update(blok)
+    digest = h.hexdigest()
+    _cache_hash[path_abs] = (mtime, digest)
+    return digest
+
+
+def hapus_cache() -> None:
+    """Mengosongkan cache dataset (mis. setelah data_cleaning.py dijalankan ulang)"""
+    _cache.clear()
+    _cache_hash.clear()
@@ -0,0 +1,165 @@
+# ==============================================================
+# WATERMARK CLEANING INKREMENTAL
+# Menyimpan posisi terakhir file mentah yang sudah diproses beserta
+# hash isi, sehingga data_cleaning.py --inkremental cukup membersihkan
+# baris mentah yang baru ditambahkan.
+# ==============================================================
+# Import Lib
+import os
+import json
+import hashlib
+from datetime import datetime
+import numpy as np
+import pandas as pd
+import dataset
+
+# File watermark (JSON) & hash baris yang sudah diproses (NumPy) di samping dataset final
+PATH_WATERMARK = os.path.join(dataset.BASE_PATH, "final_dataset", "watermark_kelahiran_jawabarat_2012-2023.json")
+PATH_HASH_BARIS = os.path.join(dataset.BASE_PATH, "final_dataset", "watermark_kelahiran_jawabarat_2012-2023.npy")
+
+VERSI = 2
+
+
+def hash_baris(df: pd.DataFrame) -> np.ndarray:
+    """Hash 64-bit isi setiap baris (isi dalam bentuk teks); hash sama belum tentu baris sama"""
+    return pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy()
+
+
+def duplikat_eksak(df: pd.DataFrame, h: np.ndarray) -> np.ndarray:
+    """Penanda baris yang isinya (sebagai teks) sama persis dengan baris sebelumnya.
+
+    Hash hanya menyaring kandidat; baris dengan hash kembar dibandingkan
+    isinya, sehingga tabrakan hash tidak membuang baris yang berbeda.
+    """
+    kandidat = pd.Series(h).duplicated(keep=False).to_numpy()
+    hasil = np.zeros(len(h), dtype=bool)
+    if kandidat.any():
+        hasil[kandidat] = df[kandidat].astype(str).duplicated().to_numpy()
+    return hasil
+
+
+def daftar_file_parquet(folder: str) -> list:
+    """Path relatif semua file data Parquet di folder (urut), tanpa file penanda"""
+    hasil = []
+    for akar, _, nama_file in os.walk(folder):
+        for nama in nama_file:
+            if nama.endswith(".parquet"):
+                hasil.append(os.path.relpath(os.path.join(akar, nama), folder).replace(os.sep, "/"))
+    return sorted(hasil)
+
+
+def hash_kanonik(kanonik) -> str:
+    """SHA-1 kamus kanonik; kamus yang berubah membuat hasil standarisasi berbeda"""
+    return hashlib.sha1(json.dumps(kanonik or {}, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def hash_file(path: str, sampai: int = None) -> str:
+    """SHA-1 isi file, opsional hanya `sampai` byte pertama"""
+    h = hashlib.sha1()
+    sisa = os.path.getsize(path) if sampai is None else sampai
+    with open(path, "rb") as f:
+        while sisa > 0:
+            blok = f.read(min(1 << 20, sisa))
+            if not blok:
+                break
+            h.update(blok)
+            sisa -= len(blok)
+    return h.hexdigest()
+
+
+def offset_baris_lengkap(path: str, ukuran: int) -> int:
+    """Posisi byte setelah baris lengkap terakhir (baris yang sedang ditulis diabaikan)"""
+    if ukuran == 0:
+        return 0
+    with open(path, "rb") as f:
+        posisi = ukuran
+        while posisi > 0:
+            mulai = max(0, posisi - (1 << 16))
+            f.seek(mulai)
+            blok = f.read(posisi - mulai)
+            akhir = blok.rfind(b"\n")
+            if akhir != -1:
+                return mulai + akhir + 1
+            posisi = mulai
+    return 0
+
+
+def simpan_watermark(path_input: str, offset: int, id_terakhir, tahun_terakhir,
+                     hash_baris_siap: np.ndarray, path_dataset: str, path_kubus: str,
+                     parquet: bool, path: str = PATH_WATERMARK,
+                     path_hash: str = PATH_HASH_BARIS, kanonik: dict = None,
+                     path_parquet: str = None) -> dict:
+    """Menulis watermark setelah dataset & kubus selesai ditulis.
+
+    Hash baris ditulis lebih dulu, file JSON paling akhir (keduanya lewat
+    file sementara + os.replace). Watermark memuat hash dataset & kubus
+    yang ditulis, sehingga output yang berubah di luar proses ini (atau
+    proses yang terhenti di tengah jalan) terdeteksi pada run berikutnya.
+    Daftar file Parquet ikut dicatat: file partisi yang tertulis tetapi
+    belum tercatat (proses terhenti sebelum watermark) memicu proses ulang.
+    """
+    hash_baris_siap = np.unique(hash_baris_siap)
+    with open(path_hash + ".tmp", "wb") as f:
+        np.save(f, hash_baris_siap)
+    os.replace(path_hash + ".tmp", path_hash)
+
+    wm = {
+        'versi': VERSI,
+        'input': os.path.abspath(path_input),
+        'offset_mentah': int(offset),
+        'hash_mentah': hash_file(path_input, offset),
+        'id_terakhir': None if id_terakhir is None else int(id_terakhir),
+        'tahun_terakhir': None if tahun_terakhir is None else int(tahun_terakhir),
+        'jumlah_hash_baris': int(len(hash_baris_siap)),
+        'hash_dataset': hash_file(path_dataset),
+        'hash_kubus': hash_file(path_kubus),
+        'parquet': bool(parquet),
+        'file_parquet': daftar_file_parquet(path_parquet) if parquet and path_parquet else [],
+        'hash_kanonik': hash_kanonik(kanonik),
+        'diperbarui': datetime.now().isoformat(timespec='seconds'),
+    }
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(wm, f, indent=2)
+    os.replace(path + ".tmp", path)
+    return wm
+
+
+def muat_watermark(path: str = PATH_WATERMARK):
+    """Isi watermark, atau None bila belum ada / tidak terbaca"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            wm = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return wm if wm.get('versi') == VERSI else None
+
+
+def muat_hash_baris(path: str = PATH_HASH_BARIS) -> np.ndarray:
+    return np.load(path)
+
+
+def cek_watermark(wm, path_input: str, path_dataset: str, path_kubus: str,
+                  path_hash: str = PATH_HASH_BARIS, path_parquet: str = None,
+                  kanonik: dict = None):
+    """Mengembalikan alasan watermark tidak bisa dipakai, atau None bila valid"""
+    if wm is None:
+        return "watermark belum ada"
+    if wm['input'] != os.path.abspath(path_input):
+        return "file mentah berbeda dari run sebelumnya"
+    ukuran = os.path.getsize(path_input)
+    if ukuran < wm['offset_mentah']:
+        return "file mentah lebih kecil dari sebelumnya"
+    if hash_file(path_input, wm['offset_mentah']) != wm['hash_mentah']:
+        return "isi file mentah yang sudah diproses berubah"
+    for p, kunci in ((path_dataset, 'hash_dataset'), (path_kubus, 'hash_kubus')):
+        if not os.path.exists(p) or hash_file(p) != wm[kunci]:
+            return f"output berubah sejak run sebelumnya: {p}"
+    if wm.get('hash_kanonik') != hash_kanonik(kanonik):
+        return "kamus kanonik berubah"
+    if not os.path.exists(path_hash):
+        return "hash baris tidak ditemukan"
+    if path_parquet is not None and not (wm['parquet'] and dataset.tersedia_parquet(path_parquet)):
+        return "dataset Parquet belum lengkap"
+    if path_parquet is not None and daftar_file_parquet(path_parquet) != wm.get('file_parquet'):
+        return "dataset Parquet berisi file yang tidak tercatat di watermark"
+    return None
@@ -0,0 +1,435 @@
+# ==============================================================
+# INSTRUMENTASI WAKTU TAHAP PIPELINE
+# Setiap tahap script (Membaca File, Cleaning Data, grouping,
+# visualisasi, simpan) dibungkus tahap() untuk mencatat waktu wall,
+# waktu CPU, jumlah baris masuk/keluar & memori puncak proses.
+# Catatan ditulis sebagai JSON lines + tabel ringkasan di akhir run.
+# Aktif hanya bila environment variable INSTRUMENTASI_KELAHIRAN diisi
+# ("1" = file log bawaan, atau path file log); bila tidak, tahap()
+# hanya memeriksa satu variabel global (overhead dapat diabaikan).
+# Mode memori (opsional, INSTRUMENTASI_MEMORI) memakai tracemalloc
+# untuk alokasi puncak & tertahan per tahap beserta lokasi alokasi
+# terbesar, ditambah puncak buffer Arrow (kolom teks pandas) yang
+# di-sampling dari pyarrow; batas memori per tahap
+# (INSTRUMENTASI_BATAS_MEMORI) berlaku untuk totalnya dan menggagalkan
+# run bila terlampaui.
+# ==============================================================
+# Import Lib
+import os
+import json
+import time
+import functools
+import linecache
+import threading
+import tracemalloc
+from datetime import datetime
+import dataset
+try:
+    import resource  # opsional, tidak tersedia di Windows (memori puncak dicatat None)
+except ImportError:
+    resource = None
+
+ENV_AKTIF = "INSTRUMENTASI_KELAHIRAN"
+PATH_LOG = os.path.join(dataset.BASE_PATH, "final_dataset", "instrumentasi_tahap.jsonl")
+# Mode memori: "1" = aktif dengan LOKASI_TERATAS lokasi alokasi per tahap, angka N = N lokasi
+ENV_MEMORI = "INSTRUMENTASI_MEMORI"
+# File JSON batas memori puncak per tahap dalam MB: {"<tahap>": MB, "<skrip>/<tahap>": MB}
+# (kunci dengan nama script diutamakan); mengisi variabel ini juga menyalakan mode memori
+ENV_BATAS = "INSTRUMENTASI_BATAS_MEMORI"
+LOKASI_TERATAS = 5
+# Kedalaman traceback tracemalloc. Alokasi pandas/numpy terjadi belasan sampai puluhan frame di
+# bawah baris script yang memicunya; 32 frame cukup untuk selalu mencapai frame project
+# (~4× lebih lambat dari 1 frame, yang hanya menunjuk baris di dalam pandas/numpy)
+ENV_FRAME = "INSTRUMENTASI_MEMORI_FRAME"
+JUMLAH_FRAME = 32
+# Interval sampling pyarrow.total_allocated_bytes() (detik) selama mode memori
+INTERVAL_ARROW = 0.005
+MB = 2**20
+
+# Run yang sedang dicatat (None = instrumentasi mati / di luar run)
+_run = None
+
+
+def path_log() -> str:
+    """Path file log JSON lines dari environment variable (nilai "1" = PATH_LOG)"""
+    nilai = os.environ.get(ENV_AKTIF, "")
+    return PATH_LOG if nilai in ("", "1") else nilai
+
+
+def aktif() -> bool:
+    """Instrumentasi diaktifkan lewat environment variable (selain "", "0"); mode memori ikut menyalakan"""
+    return any(os.environ.get(k, "") not in ("", "0") for k in (ENV_AKTIF, ENV_MEMORI, ENV_BATAS))
+
+
+def mode_memori():
+    """Jumlah lokasi alokasi teratas per tahap bila mode memori aktif, selain itu None"""
+    nilai = os.environ.get(ENV_MEMORI, "")
+    if nilai in ("", "0"):
+        return LOKASI_TERATAS if os.environ.get(ENV_BATAS, "") else None
+    return LOKASI_TERATAS if nilai == "1" else int(nilai)
+
+
+def muat_batas(path: str = None) -> dict:
+    """Batas memori puncak per tahap {kunci: MB} dari file JSON (kosong bila tidak diatur)"""
+    path = os.environ.get(ENV_BATAS, "") if path is None else path
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return {str(k): float(v) for k, v in json.load(f).items()}
+
+
+def _rss_puncak_mb():
+    """Memori puncak (RSS tertinggi) proses sejauh ini dalam MB; None bila tidak tersedia"""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _jumlah_baris(obj):
+    """Jumlah baris DataFrame/Series/array/kubus; None untuk objek lain"""
+    obj = getattr(obj, "df", obj)  # kubus.Kubus: jumlah baris tabel kubus
+    shape = getattr(obj, "shape", None)
+    return int(shape[0]) if shape else None
+
+
+def _nama_file(nama: str) -> str:
+    """Path pendek: relatif ke folder project, atau mulai dari nama paket di site-packages"""
+    if nama.startswith(dataset.BASE_PATH):
+        return os.path.relpath(nama, dataset.BASE_PATH)
+    return nama.split("site-packages" + os.sep, 1)[-1]
+
+
+class _SampelArrow:
+    """Thread pencatat puncak pyarrow.total_allocated_bytes().
+
+    Buffer Arrow (kolom teks pandas) dialokasikan di luar tracemalloc;
+    nilainya di-sampling setiap INTERVAL_ARROW detik (kode Arrow
+    melepas GIL, jadi sampling tetap berjalan selama operasi berat).
+    Tanpa pyarrow nilai selalu 0.
+    """
+
+    def __init__(self, interval: float = INTERVAL_ARROW):
+        self._kunci = threading.Lock()
+        self._berhenti = threading.Event()
+        self.puncak = self.sekarang()
+        self._thread = None
+        if dataset.pyarrow is not None:
+            self._thread = threading.Thread(target=self._jalan, args=(interval,), daemon=True)
+            self._thread.start()
+
+    @staticmethod
+    def sekarang() -> int:
+        return dataset.pyarrow.total_allocated_bytes() if dataset.pyarrow is not None else 0
+
+    def _jalan(self, interval: float):
+        while not self._berhenti.wait(interval):
+            nilai = self.sekarang()
+            with self._kunci:
+                self.puncak = max(self.puncak, nilai)
+
+    def mulai_ulang(self) -> int:
+        """Puncak sejak pemanggilan sebelumnya; puncak lalu dimulai dari nilai saat ini"""
+        nilai = self.sekarang()
+        with self._kunci:
+            puncak, self.puncak = max(self.puncak, nilai), nilai
+        return puncak
+
+    def berhenti(self):
+        self._berhenti.set()
+        if self._thread is not None:
+            self._thread.join()
+
+
+# Alokasi milik tracemalloc sendiri (snapshot) & mesin import tidak ikut dilaporkan
+_FILTER_LOKASI = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+]
+
+
+def _lokasi_teratas(awal, akhir, jumlah: int) -> list:
+    """Lokasi alokasi tertahan terbesar antara dua snapshot tracemalloc.
+
+    Setiap alokasi dibebankan ke frame terdalam yang berada di folder
+    project (baris script yang memicu alokasi di dalam pandas/numpy);
+    alokasi tanpa frame project (di luar kedalaman JUMLAH_FRAME)
+    dibebankan ke frame terdalamnya.
+    """
+    per_lokasi = {}
+    awal, akhir = awal.filter_traces(_FILTER_LOKASI), akhir.filter_traces(_FILTER_LOKASI)
+    for stat in akhir.compare_to(awal, 'traceback'):
+        if stat.size_diff <= 0:
+            continue
+        frame = next((f for f in reversed(stat.traceback) if f.filename.startswith(dataset.BASE_PATH)),
+                     stat.traceback[-1])
+        kunci = (frame.filename, frame.lineno)
+        ukuran, jumlah_blok = per_lokasi.get(kunci, (0, 0))
+        per_lokasi[kunci] = (ukuran + stat.size_diff, jumlah_blok + max(stat.count_diff, 0))
+    teratas = sorted(per_lokasi.items(), key=lambda x: -x[1][0])[:jumlah]
+    return [{
+        'lokasi': f"{_nama_file(nama)}:{baris}",
+        'kode': linecache.getline(nama, baris).strip(),
+        'tertahan_mb': round(ukuran / MB, 3),
+        'blok': blok,
+    } for (nama, baris), (ukuran, blok) in teratas]
+
+
+class tahap:
+    """Pencatat satu tahap; dipakai sebagai context manager atau decorator.
+
+        with instrumentasi.tahap("Membaca File") as t:
+            df = pd.read_csv(path)
+            t.baris(keluar=df)
+
+        @instrumentasi.tahap("Cleaning Data")
+        def bersihkan(df): ...
+
+    Sebagai decorator, baris masuk diambil dari argumen pertama dan baris
+    keluar dari nilai kembalian (bila berupa tabel). Memori puncak =
+    RSS tertinggi proses sampai tahap selesai (nilai kumulatif; kenaikan
+    `rss_naik_mb` menandai tahap yang mencetak puncak baru).
+
+    Dalam mode memori juga dicatat `alokasi_puncak_mb` (puncak alokasi
+    tracemalloc -- objek Python & array numpy -- di atas posisi awal
+    tahap, termasuk sub-tahap), `tertahan_mb` (selisih alokasi akhir −
+    awal), `arrow_puncak_mb` / `arrow_tertahan_mb` (hal yang sama untuk
+    buffer Arrow, puncak hasil sampling), `total_puncak_mb` (jumlah
+    kedua puncak; batas atas, karena keduanya belum tentu terjadi
+    bersamaan) dan `lokasi` (lokasi alokasi tertahan terbesar).
+    `batas_mb` (atau file batas) membatasi total puncak; bila terlampaui
+    tahap ditandai gagal dan MemoryError dilempar. tracemalloc
+    memperlambat eksekusi beberapa kali lipat, jadi waktu tahap pada
+    mode ini tidak dibandingkan dengan run biasa.
+    """
+
+    def __init__(self, nama: str, masuk=None, batas_mb: float = None):
+        self.nama = nama
+        self.batas_mb = batas_mb
+        self.masuk = _jumlah_baris(masuk) if masuk is not None and not isinstance(masuk, int) else masuk
+        self.keluar = None
+
+    def baris(self, masuk=None, keluar=None):
+        """Catat jumlah baris masuk/keluar (int atau tabel)"""
+        if masuk is not None:
+            self.masuk = masuk if isinstance(masuk, int) else _jumlah_baris(masuk)
+        if keluar is not None:
+            self.keluar = keluar if isinstance(keluar, int) else _jumlah_baris(keluar)
+
+    def __enter__(self):
+        self._run = _run
+        if self._run is None:
+            return self
+        self._run['level'] += 1
+        self._mulai = datetime.now().isoformat(timespec="seconds")
+        if self._run['memori']:
+            self._mulai_memori()
+        self._rss = _rss_puncak_mb()
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, jenis, nilai, tb):
+        if self._run is None:
+            return False
+        detik = time.perf_counter() - self._wall
+        cpu = time.process_time() - self._cpu
+        rss = _rss_puncak_mb()
+        self._run['level'] -= 1
+        memori = self._selesai_memori() if self._run['memori'] else {}
+        batas = self._batas()
+        melebihi = jenis is None and batas is not None and memori.get('total_puncak_mb', 0) > batas
+        if melebihi:
+            self._run['melebihi'].append(self.nama)
+        _catat(self._run, {
+            'tahap': self.nama,
+            'level': self._run['level'],
+            'mulai': self._mulai,
+            'detik': round(detik, 6),
+            'cpu_detik': round(cpu, 6),
+            'baris_masuk': self.masuk,
+            'baris_keluar': self.keluar,
+            'rss_puncak_mb': None if rss is None else round(rss, 1),
+            'rss_naik_mb': None if rss is None else round(rss - self._rss, 1),
+            **memori,
+            **({'batas_mb': batas} if batas is not None else {}),
+            'status': "ok" if jenis is None and not melebihi else
+                      f"melebihi batas {batas:,.1f} MB" if melebihi else f"gagal: {nilai}",
+        })
+        if melebihi:
+            raise MemoryError(f"Tahap {self.nama} memakai {memori['total_puncak_mb']:,.1f} MB, "
+                              f"melebihi batas {batas:,.1f} MB")
+        return False
+
+    def _batas(self):
+        """Batas memori tahap: argumen batas_mb, lalu kunci "<skrip>/<tahap>", lalu "<tahap>" di file batas"""
+        if self.batas_mb is not None:
+            return self.batas_mb
+        batas = self._run['batas']
+        return batas.get(f"{self._run['skrip']}/{self.nama}", batas.get(self.nama))
+
+    def _mulai_memori(self):
+        """Simpan puncak milik tahap induk, mulai ulang puncak & ambil snapshot awal"""
+        tumpukan = self._run['tumpukan']
+        arrow = self._run['arrow']
+        if tumpukan:
+            tumpukan[-1]._puncak = max(tumpukan[-1]._puncak, tracemalloc.get_traced_memory()[1])
+            tumpukan[-1]._puncak_arrow = max(tumpukan[-1]._puncak_arrow, arrow.mulai_ulang())
+        tumpukan.append(self)
+        self._snapshot = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        self._awal_alokasi = self._puncak = tracemalloc.get_traced_memory()[0]
+        arrow.mulai_ulang()
+        self._awal_arrow = self._puncak_arrow = arrow.sekarang()
+
+    def _selesai_memori(self) -> dict:
+        """Alokasi puncak & tertahan tahap; puncak diteruskan ke tahap induk"""
+        sekarang, puncak = tracemalloc.get_traced_memory()
+        puncak = max(self._puncak, puncak)
+        arrow = self._run['arrow']
+        sekarang_arrow = arrow.sekarang()
+        puncak_arrow = max(self._puncak_arrow, arrow.mulai_ulang())
+        self._run['tumpukan'].pop()
+        lokasi = _lokasi_teratas(self._snapshot, tracemalloc.take_snapshot(), self._run['memori'])
+        self._snapshot = None
+        tracemalloc.reset_peak()
+        if self._run['tumpukan']:
+            induk = self._run['tumpukan'][-1]
+            induk._puncak = max(induk._puncak, puncak)
+            induk._puncak_arrow = max(induk._puncak_arrow, puncak_arrow)
+        alokasi_puncak = (puncak - self._awal_alokasi) / MB
+        arrow_puncak = (puncak_arrow - self._awal_arrow) / MB
+        return {
+            'alokasi_puncak_mb': round(alokasi_puncak, 3),
+            'tertahan_mb': round((sekarang - self._awal_alokasi) / MB, 3),
+            'arrow_puncak_mb': round(arrow_puncak, 3),
+            'arrow_tertahan_mb': round((sekarang_arrow - self._awal_arrow) / MB, 3),
+            'total_puncak_mb': round(alokasi_puncak + arrow_puncak, 3),
+            'lokasi': lokasi,
+        }
+
+    def __call__(self, fungsi):
+        @functools.wraps(fungsi)
+        def pembungkus(*args, **kwargs):
+            if _run is None:
+                return fungsi(*args, **kwargs)
+            with tahap(self.nama, args[0] if args else None, self.batas_mb) as t:
+                hasil = fungsi(*args, **kwargs)
+                t.baris(keluar=hasil[0] if isinstance(hasil, tuple) and hasil else hasil)
+                return hasil
+        return pembungkus
+
+
+def _catat(run: dict, catatan: dict) -> None:
+    """Tambahkan satu catatan tahap ke run & file log (ditulis langsung agar run gagal tetap tercatat)"""
+    catatan = {'run': run['id'], 'skrip': run['skrip'], **catatan}
+    run['catatan'].append(catatan)
+    with open(run['path'], "a", encoding="utf-8") as f:
+        f.write(json.dumps(catatan, ensure_ascii=False) + "\n")
+
+
+def run(skrip: str):
+    """Decorator untuk main() script: memulai run instrumentasi bila aktif & mencetak ringkasan"""
+    def dekorator(fungsi):
+        @functools.wraps(fungsi)
+        def pembungkus(*args, **kwargs):
+            global _run
+            if not aktif() or _run is not None:
+                return fungsi(*args, **kwargs)
+            path = path_log()
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            memori = mode_memori()
+            mulai_trace = memori is not None and not tracemalloc.is_tracing()
+            if mulai_trace:
+                tracemalloc.start(int(os.environ.get(ENV_FRAME) or JUMLAH_FRAME))
+            _run = {'id': f"{datetime.now():%Y%m%dT%H%M%S}-{os.getpid()}", 'skrip': skrip,
+                    'path': path, 'level': 0, 'catatan': [], 'memori': memori,
+                    'batas': muat_batas() if memori else {}, 'tumpukan': [], 'melebihi': [],
+                    'arrow': _SampelArrow() if memori is not None else None}
+            try:
+                hasil = fungsi(*args, **kwargs)
+            finally:
+                selesai, _run = _run, None
+                if selesai['arrow'] is not None:
+                    selesai['arrow'].berhenti()
+                if mulai_trace:
+                    tracemalloc.stop()
+                cetak_ringkasan(selesai['catatan'])
+                print(f"- Log Instrumentasi Disimpan di: {selesai['path']} ✓")
+            # Script menangkap exception sendiri; batas yang terlampaui tetap menggagalkan proses
+            if selesai['melebihi']:
+                print(f"- Run Gagal, Batas Memori Terlampaui : {', '.join(selesai['melebihi'])}")
+                raise SystemExit(1)
+            return hasil
+        return pembungkus
+    return dekorator
+
+
+def _angka(nilai, format_: str) -> str:
+    return "-" if nilai is None else format(nilai, format_)
+
+
+def cetak_ringkasan(catatan: list) -> None:
+    """Tabel ringkasan waktu tahap (urutan selesai; sub-tahap diberi indentasi)"""
+    print()
+    print("---------------------------------------------------------------------------------------")
+    print("Ringkasan Waktu Tahap ")
+    print("---------------------------------------------------------------------------------------")
+    print(f"{'Tahap':<32} {'Detik':>9} {'CPU':>9} {'Baris Masuk':>12} {'Baris Keluar':>12} {'RSS Puncak':>11}")
+    print("---------------------------------------------------------------------------------------")
+    for c in catatan:
+        nama = ("  " * c['level'] + c['tahap'])[:32]
+        if c['status'] != "ok":
+            nama = (nama[:30] + " ✗")
+        print(f"{nama:<32} {c['detik']:>9.3f} {c['cpu_detik']:>9.3f} {_angka(c['baris_masuk'], ','):>12} "
+              f"{_angka(c['baris_keluar'], ','):>12} {_angka(c['rss_puncak_mb'], ',.1f'):>8} MB")
+    total = sum(c['detik'] for c in catatan if c['level'] == 0)
+    print("---------------------------------------------------------------------------------------")
+    print(f"{'Total Tahap Utama':<32} {total:>9.3f}")
+    if any('alokasi_puncak_mb' in c for c in catatan):
+        cetak_ringkasan_memori(catatan)
+
+
+def cetak_ringkasan_memori(catatan: list) -> None:
+    """Tabel puncak/tertahan per tahap (tracemalloc & Arrow) beserta lokasi alokasi terbesar"""
+    print()
+    print("---------------------------------------------------------------------------------------")
+    print("Ringkasan Memori Tahap (tracemalloc + Arrow)")
+    print("---------------------------------------------------------------------------------------")
+    print(f"{'Tahap':<32} {'Python':>12} {'Arrow':>12} {'Total':>12} {'Batas':>12}")
+    print("---------------------------------------------------------------------------------------")
+    for c in catatan:
+        if 'alokasi_puncak_mb' not in c:
+            continue
+        nama = ("  " * c['level'] + c['tahap'])[:32]
+        if c['status'] != "ok":
+            nama = (nama[:30] + " ✗")
+        print(f"{nama:<32} {c['alokasi_puncak_mb']:>9,.1f} MB {_angka(c.get('arrow_puncak_mb'), ',.1f'):>9} MB "
+              f"{_angka(c.get('total_puncak_mb'), ',.1f'):>9} MB {_angka(c.get('batas_mb'), ',.1f'):>9} MB")
+        for lokasi in c['lokasi']:
+            if lokasi['tertahan_mb'] >= 0.1:
+                print(f"{'':<4}{lokasi['tertahan_mb']:>8,.1f} MB  {lokasi['lokasi']} : {lokasi['kode'][:60]}")
+
+
+def muat_log(path: str = None) -> list:
+    """Semua catatan dari file log JSON lines (baris rusak dilewati)"""
+    path = path_log() if path is None else path
+    if not os.path.exists(path):
+        return []
+    catatan = []
+    with open(path, encoding="utf-8") as f:
+        for baris in f:
+            try:
+                catatan.append(json.loads(baris))
+            except ValueError:
+                continue
+    return catatan
+
+
+def run_terakhir(skrip: str, path: str = None) -> list:
+    """Catatan tahap dari run terakhir sebuah script (list kosong bila belum pernah dicatat)"""
+    catatan = [c for c in muat_log(path) if c.get('skrip') == skrip]
+    if not catatan:
+        return []
+    terakhir = catatan[-1]['run']
+    return [c for c in catatan if c['run'] == terakhir]
@@ -0,0 +1,72 @@
+# ==============================================================
+# REGISTRI KOORDINAT KABUPATEN/KOTA (DIKUNCI KODE WILAYAH)
+# Titik pusat setiap kabupaten/kota dibaca dari file CSV sehingga peta
+# bisa dibuat untuk provinsi mana pun tanpa kamus manual di script.
+# ==============================================================
+# Import Lib
+import os
+import pandas as pd
+import dataset
+
+# File registri: kode_kabupaten_kota, nama_kabupaten_kota, latitude, longitude.
+# Bawaan berisi 27 kabupaten/kota Jawa Barat; file nasional (format sama)
+# bisa dipakai lewat environment variable.
+PATH_KOORDINAT = os.environ.get(
+    "KOORDINAT_WILAYAH_PATH",
+    os.path.join(dataset.BASE_PATH, "referensi", "koordinat_kabupaten_kota.csv"),
+)
+
+DTYPE_KOORDINAT = {
+    'kode_kabupaten_kota': 'int16',
+    'nama_kabupaten_kota': str,
+    'latitude': 'float64',
+    'longitude': 'float64',
+}
+
+# Cache per proses: path absolut -> (mtime, DataFrame)
+_cache = {}
+
+
+def validasi_koordinat(df: pd.DataFrame) -> None:
+    """Kode unik & koordinat dalam rentang lintang/bujur yang sah"""
+    kurang = set(DTYPE_KOORDINAT) - set(df.columns)
+    if kurang:
+        raise ValueError(f"Kolom registri koordinat tidak lengkap: {sorted(kurang)}")
+    kembar = df.loc[df['kode_kabupaten_kota'].duplicated(), 'kode_kabupaten_kota']
+    if len(kembar):
+        raise ValueError(f"Kode wilayah ganda di registri koordinat: {kembar.tolist()[:10]}")
+    if not (df['latitude'].between(-90, 90).all() and df['longitude'].between(-180, 180).all()):
+        raise ValueError("Koordinat di luar rentang lintang/bujur")
+
+
+def muat_koordinat(path: str = PATH_KOORDINAT) -> pd.DataFrame:
+    """Registri koordinat, di-cache per path + waktu modifikasi file"""
+    path_abs = os.path.abspath(path)
+    mtime = os.stat(path_abs).st_mtime_ns
+    hit = _cache.get(path_abs)
+    if hit is not None and hit[0] == mtime:
+        return hit[1]
+
+    df = pd.read_csv(path_abs, dtype=DTYPE_KOORDINAT)
+    validasi_koordinat(df)
+    _cache[path_abs] = (mtime, df)
+    return df
+
+
+def gabung_koordinat(df: pd.DataFrame, path: str = PATH_KOORDINAT, registri: pd.DataFrame = None):
+    """Menambahkan latitude & longitude lewat satu merge pada kode_kabupaten_kota.
+
+    Mengembalikan (baris yang punya koordinat, baris tanpa koordinat);
+    wilayah yang tidak ada di registri tidak lagi diberi koordinat
+    cadangan diam-diam, melainkan dilaporkan ke pemanggil. `registri`
+    (format sama) menggantikan file di `path`, mis. centroid dari GeoJSON.
+    """
+    if registri is None:
+        registri = muat_koordinat(path)
+    registri = registri[['kode_kabupaten_kota', 'latitude', 'longitude']]
+    hasil = df.assign(kode_kabupaten_kota=df['kode_kabupaten_kota'].astype('int64')).merge(
+        registri.astype({'kode_kabupaten_kota': 'int64'}),
+        on='kode_kabupaten_kota', how='left', validate='many_to_one',
+    )
+    ada = hasil['latitude'].notna().to_numpy()
+    return hasil[ada].reset_index(drop=True), hasil[~ada].reset_index(drop=True)
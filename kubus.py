@@ -0,0 +1,216 @@
+# ==============================================================
+# KUBUS AGREGAT KELAHIRAN (SEMUA TINGKAT ROLL-UP)
+# Jumlah kelahiran dihitung sekali untuk setiap kombinasi dimensi
+# (tahun, kode_kabupaten_kota, status_kelahiran, jenis_kelamin)
+# sehingga grafik cukup mengambil hasil, bukan mengelompokkan ulang.
+# ==============================================================
+# Import Lib
+import os
+from itertools import combinations
+import pandas as pd
+import dataset
+
+# Path kubus hasil data_cleaning.py (disimpan di samping dataset final)
+PATH_KUBUS = os.path.join(dataset.BASE_PATH, "final_dataset", "kubus_kelahiran_jawabarat_2012-2023.csv")
+
+# Dimensi kubus & atribut yang ikut kode wilayah
+DIMENSI = ['tahun', 'kode_kabupaten_kota', 'status_kelahiran', 'jenis_kelamin']
+ATRIBUT_WILAYAH = 'nama_kabupaten_kota'
+UKURAN = 'jumlah_kelahiran'
+# Bitmask tingkat terhalus (keempat dimensi dikelompokkan)
+TINGKAT_TERHALUS = (1 << len(DIMENSI)) - 1
+
+DTYPE_KUBUS = {
+    'tingkat': 'int8',
+    'tahun': 'Int16',
+    'kode_kabupaten_kota': 'Int16',
+    'nama_kabupaten_kota': 'category',
+    'status_kelahiran': 'category',
+    'jenis_kelamin': 'category',
+    'jumlah_kelahiran': 'int64',
+}
+
+# Cache per proses: path absolut -> (mtime, Kubus)
+_cache = {}
+
+
+def _kode_tingkat(dims) -> int:
+    # Bitmask dimensi yang dikelompokkan (bit i = DIMENSI[i])
+    return sum(1 << DIMENSI.index(d) for d in dims)
+
+
+def bangun_kubus(df: pd.DataFrame) -> pd.DataFrame:
+    """Menghitung seluruh tingkat roll-up dari dataset bersih.
+
+    Tingkat terhalus (keempat dimensi) dihitung dari baris data, tingkat
+    lain di-roll-up dari hasil tersebut. Dimensi yang di-roll-up bernilai
+    kosong; kolom `tingkat` menyimpan bitmask dimensi yang dikelompokkan.
+    Kunci kosong (mis. status_kelahiran NaN) ikut dikelompokkan di setiap
+    tingkat, sehingga jumlah setiap tingkat sama dengan total dataset.
+    """
+    kolom = DIMENSI + [ATRIBUT_WILAYAH]
+    terhalus = (
+        df.groupby(kolom, observed=True, sort=False, dropna=False)[UKURAN]
+        .sum()
+        .reset_index()
+    )
+
+    tingkat = []
+    for n in range(len(DIMENSI), -1, -1):
+        for dims in combinations(DIMENSI, n):
+            dims = list(dims)
+            by = dims + ([ATRIBUT_WILAYAH] if 'kode_kabupaten_kota' in dims else [])
+            if by:
+                agg = terhalus.groupby(by, observed=True, dropna=False)[UKURAN].sum().reset_index()
+            else:
+                agg = pd.DataFrame({UKURAN: [terhalus[UKURAN].sum()]})
+            agg.insert(0, 'tingkat', _kode_tingkat(dims))
+            tingkat.append(agg)
+
+    kubus = pd.concat(tingkat, ignore_index=True)
+    return kubus[['tingkat'] + kolom + [UKURAN]]
+
+
+def cek_kubus(df_kubus: pd.DataFrame, total=None):
+    """Alasan kubus tidak konsisten, atau None bila setiap tingkat ada & berjumlah sama (= `total`)"""
+    per_tingkat = df_kubus.groupby('tingkat')[UKURAN].sum()
+    kurang = set(range(TINGKAT_TERHALUS + 1)) - set(per_tingkat.index.astype(int))
+    if kurang:
+        return f"tingkat kubus tidak lengkap: {sorted(kurang)}"
+    if per_tingkat.nunique() != 1:
+        return (f"jumlah tingkat {TINGKAT_TERHALUS} ({per_tingkat[TINGKAT_TERHALUS]:,}) "
+                f"berbeda dengan tingkat 0 ({per_tingkat[0]:,})")
+    if total is not None and per_tingkat[0] != total:
+        return f"jumlah kubus ({per_tingkat[0]:,}) berbeda dengan total yang diharapkan ({total:,})"
+    return None
+
+
+class Kubus:
+    """Kubus agregat yang bisa ditanya "jumlah per X dengan filter Y".
+
+    Setiap tingkat roll-up disimpan sebagai frame kecil terpisah sehingga
+    satu pertanyaan hanya menyentuh baris tingkat yang relevan.
+    """
+
+    def __init__(self, df_kubus: pd.DataFrame, tahun_awal=None, tahun_akhir=None):
+        self.df = df_kubus
+        self.tahun_awal = tahun_awal
+        self.tahun_akhir = tahun_akhir
+        self._tingkat = {}
+        for kode, grup in df_kubus.groupby('tingkat', sort=False):
+            dims = [d for i, d in enumerate(DIMENSI) if kode & (1 << i)]
+            kolom = dims + ([ATRIBUT_WILAYAH] if 'kode_kabupaten_kota' in dims else []) + [UKURAN]
+            self._tingkat[int(kode)] = grup[kolom].reset_index(drop=True)
+
+        tahun = self._tingkat[_kode_tingkat(['tahun'])]['tahun']
+        self.tahun_min = int(tahun.min())
+        self.tahun_max = int(tahun.max())
+
+    def filter_tahun(self, tahun_awal, tahun_akhir) -> "Kubus":
+        """Kubus yang sama, dibatasi pada rentang tahun (seperti dataset.muat_dataset)"""
+        kb = Kubus.__new__(Kubus)
+        kb.__dict__.update(self.__dict__)
+        kb.tahun_awal = tahun_awal
+        kb.tahun_akhir = tahun_akhir
+        return kb
+
+    def _perlu_filter_tahun(self) -> bool:
+        awal = self.tahun_min if self.tahun_awal is None else self.tahun_awal
+        akhir = self.tahun_max if self.tahun_akhir is None else self.tahun_akhir
+        return awal > self.tahun_min or akhir < self.tahun_max
+
+    def jumlah(self, by, **filter) -> pd.DataFrame:
+        """Jumlah kelahiran per kolom `by`, dengan filter kolom=nilai (atau list nilai)"""
+        by = list(by)
+        dims_by = [('kode_kabupaten_kota' if k == ATRIBUT_WILAYAH else k) for k in by]
+        dims_filter = [('kode_kabupaten_kota' if k == ATRIBUT_WILAYAH else k) for k in filter]
+        dims = set(dims_by) | set(dims_filter)
+        filter_tahun = self._perlu_filter_tahun()
+        if filter_tahun:
+            dims.add('tahun')
+        for d in dims:
+            if d not in DIMENSI:
+                raise KeyError(f"Kolom bukan dimensi kubus: {d}")
+
+        hasil = self._tingkat[_kode_tingkat(dims)]
+
+        # Filter nilai dimensi (hanya baris tingkat terpilih yang disentuh)
+        mask = pd.Series(True, index=hasil.index)
+        for kolom, nilai in filter.items():
+            if isinstance(nilai, (list, tuple, set)):
+                mask &= hasil[kolom].isin(list(nilai))
+            else:
+                mask &= hasil[kolom] == nilai
+        if filter_tahun:
+            mask &= hasil['tahun'].between(self.tahun_awal if self.tahun_awal is not None else self.tahun_min,
+                                           self.tahun_akhir if self.tahun_akhir is not None else self.tahun_max)
+        if not mask.all():
+            hasil = hasil[mask]
+
+        # Roll-up sisa dimensi filter yang tidak diminta di `by`
+        if not by:
+            return pd.DataFrame({UKURAN: [hasil[UKURAN].sum()]})
+        if set(by) != set(hasil.columns) - {UKURAN}:
+            hasil = hasil.groupby(by, observed=True)[UKURAN].sum().reset_index()
+        else:
+            # Kelompok berkunci kosong dibuang, sama seperti groupby pada dataset baris
+            hasil = hasil[by + [UKURAN]].dropna(subset=by).sort_values(by).reset_index(drop=True)
+        return hasil
+
+
+def jumlah(sumber, by, **filter) -> pd.DataFrame:
+    """Jumlah kelahiran per `by` dari Kubus atau DataFrame baris (dataset).
+
+    Dipakai oleh semua script visualisasi agar sumber data bisa berupa
+    kubus agregat (cepat) maupun dataset biasa (fallback).
+    """
+    if isinstance(sumber, Kubus):
+        return sumber.jumlah(by, **filter)
+
+    df = sumber
+    for kolom, nilai in filter.items():
+        if isinstance(nilai, (list, tuple, set)):
+            df = df[df[kolom].isin(list(nilai))]
+        else:
+            df = df[df[kolom] == nilai]
+    if not by:
+        return pd.DataFrame({UKURAN: [df[UKURAN].sum()]})
+    return df.groupby(list(by), observed=True)[UKURAN].sum().reset_index()
+
+
+def simpan_kubus(df_kubus: pd.DataFrame, path: str = PATH_KUBUS) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    df_kubus.to_csv(path, index=False)
+
+
+def muat_kubus(path: str = PATH_KUBUS) -> Kubus:
+    """Membaca kubus dari disk, di-cache per path + waktu modifikasi file"""
+    path_abs = os.path.abspath(path)
+    mtime = os.stat(path_abs).st_mtime_ns
+    hit = _cache.get(path_abs)
+    if hit is not None and hit[0] == mtime:
+        return hit[1]
+
+    kb = Kubus(pd.read_csv(path_abs, dtype=DTYPE_KUBUS))
+    _cache[path_abs] = (mtime, kb)
+    return kb
+
+
+def muat_sumber(path_dataset: str = dataset.PATH_DATASET,
+                tahun_awal: int = dataset.TAHUN_AWAL,
+                tahun_akhir: int = dataset.TAHUN_AKHIR,
+                kolom=None,
+                path_kubus: str = PATH_KUBUS,
+                path_parquet: str = dataset.PATH_PARQUET):
+    """Sumber data tercepat yang tersedia & tidak lebih lama dari dataset CSV.
+
+    Urutan: kubus agregat, lalu dataset Parquet (hanya partisi tahun dan
+    `kolom` yang diminta), lalu dataset CSV.
+    """
+    mtime_dataset = os.path.getmtime(path_dataset)
+    if os.path.exists(path_kubus) and os.path.getmtime(path_kubus) >= mtime_dataset:
+        return muat_kubus(path_kubus).filter_tahun(tahun_awal, tahun_akhir)
+    if dataset.tersedia_parquet(path_parquet) and \
+            os.path.getmtime(os.path.join(path_parquet, dataset.PENANDA_PARQUET)) >= mtime_dataset:
+        return dataset.muat_dataset(path_parquet, tahun_awal, tahun_akhir, kolom=kolom)
+    return dataset.muat_dataset(path_dataset, tahun_awal, tahun_akhir, kolom=kolom)
@@ -0,0 +1,134 @@
+# ==============================================================
+# MODEL PERAMALAN RINGAN (NUMPY, TERVEKTORISASI)
+# Simple exponential smoothing, Holt linear, drift & naif di-fit untuk
+# semua deret sekaligus sebagai matriks (deret × tahun), tanpa
+# statsmodels. Parameter dipilih per deret dari grid dengan SSE
+# one-step-ahead terkecil.
+# ==============================================================
+# Import Lib
+import numpy as np
+
+MODEL = ('ses', 'holt', 'drift', 'naif')
+NAMA_MODEL = {
+    'ses': "Simple Exponential Smoothing",
+    'holt': "Holt Linear",
+    'drift': "Drift",
+    'naif': "Naif",
+}
+
+# Grid parameter pemulusan (alpha untuk level, beta untuk tren)
+GRID_ALPHA = np.round(np.linspace(0.05, 1.0, 20), 2)
+GRID_BETA = np.round(np.linspace(0.05, 1.0, 20), 2)
+# Jumlah deret per blok (membatasi memori matriks deret × kombinasi parameter)
+BLOK_DERET = 2048
+
+
+def _ses(Y: np.ndarray, alpha: np.ndarray):
+    """Level akhir & SSE untuk setiap (deret, alpha); Y berukuran (n, T)"""
+    level = np.repeat(Y[:, :1], len(alpha), axis=1)
+    sse = np.zeros_like(level)
+    for t in range(1, Y.shape[1]):
+        e = Y[:, t:t + 1] - level
+        sse += e * e
+        level += alpha * e
+    return level, sse
+
+
+def _holt(Y: np.ndarray, alpha: np.ndarray, beta: np.ndarray, tren0: np.ndarray = None,
+          simpan_error: bool = False):
+    """Level, tren akhir & SSE untuk setiap (deret, kombinasi alpha-beta).
+
+    Dengan `simpan_error`, error one-step per tahun ikut dikembalikan
+    (berukuran (n, k, T-1); dipakai dengan k = 1 untuk residual bootstrap).
+    """
+    k = np.broadcast(alpha, beta).shape[-1]
+    level = np.repeat(Y[:, :1], k, axis=1)
+    tren = np.repeat(Y[:, 1:2] - Y[:, :1] if tren0 is None else tren0, k, axis=1)
+    sse = np.zeros_like(level)
+    error = []
+    for t in range(1, Y.shape[1]):
+        ramal = level + tren
+        e = Y[:, t:t + 1] - ramal
+        sse += e * e
+        if simpan_error:
+            error.append(e)
+        # Bentuk error-correction: l_t = l_{t-1} + b_{t-1} + αe, b_t = b_{t-1} + αβe
+        level = ramal + alpha * e
+        tren = tren + alpha * beta * e
+    if simpan_error:
+        return level, tren, sse, np.stack(error, axis=-1)
+    return level, tren, sse
+
+
+def _fit_blok(Y: np.ndarray, model: str) -> dict:
+    """Parameter terpilih, state akhir & residual one-step (semua model dalam bentuk Holt)"""
+    n = len(Y)
+    nol = np.zeros(n)
+    if model == 'naif':
+        # Random walk = Holt dengan alpha 1, tanpa tren
+        alpha, beta, tren0, parameter = np.ones(n), nol, nol, [""] * n
+    elif model == 'drift':
+        kemiringan = (Y[:, -1] - Y[:, 0]) / (Y.shape[1] - 1)
+        alpha, beta, tren0 = np.ones(n), nol, kemiringan
+        parameter = [f"(drift={k:.1f})" for k in kemiringan]
+    elif model == 'ses':
+        _, sse = _ses(Y, GRID_ALPHA)
+        terbaik = np.argmin(sse, axis=1)
+        alpha, beta, tren0 = GRID_ALPHA[terbaik], nol, nol
+        parameter = [f"(alpha={GRID_ALPHA[i]:.2f})" for i in terbaik]
+    elif model == 'holt':
+        grid_alpha, grid_beta = (g.ravel() for g in np.meshgrid(GRID_ALPHA, GRID_BETA, indexing='ij'))
+        _, _, sse = _holt(Y, grid_alpha, grid_beta)
+        terbaik = np.argmin(sse, axis=1)
+        alpha, beta, tren0 = grid_alpha[terbaik], grid_beta[terbaik], Y[:, 1] - Y[:, 0]
+        parameter = [f"(alpha={grid_alpha[i]:.2f}, beta={grid_beta[i]:.2f})" for i in terbaik]
+    else:
+        raise ValueError(f"Model tidak dikenal: {model}")
+
+    level, tren, _, error = _holt(Y, alpha[:, None], beta[:, None], tren0[:, None], simpan_error=True)
+    return {'level': level[:, 0], 'tren': tren[:, 0], 'alpha': alpha, 'beta': beta,
+            'residual': error[:, 0, :], 'parameter': parameter}
+
+
+def fit_matriks(Y, model: str) -> dict:
+    """Fit model untuk setiap baris Y (deret × tahun) sekaligus.
+
+    Mengembalikan dict array per deret: `level` & `tren` akhir, `alpha`,
+    `beta`, `residual` one-step (n, T-1), `parameter` (teks) dan `valid`.
+    Semua model dinyatakan dalam bentuk Holt (naif: alpha 1 tanpa tren,
+    drift: alpha 1 dengan tren tetap, SES: beta 0 tanpa tren) sehingga
+    prediksi & simulasi memakai satu rekursi yang sama. Deret dengan
+    nilai kosong/tak hingga atau terlalu pendek (< 2 tahun) tidak di-fit.
+    """
+    if model not in MODEL:
+        raise ValueError(f"Model tidak dikenal: {model}")
+    Y = np.asarray(Y, dtype=float)
+    if Y.ndim == 1:
+        Y = Y[None, :]
+    n, T = Y.shape
+    hasil = {kunci: np.full(n, np.nan) for kunci in ('level', 'tren', 'alpha', 'beta')}
+    hasil['residual'] = np.full((n, max(T - 1, 0)), np.nan)
+    hasil['parameter'] = [""] * n
+    hasil['valid'] = np.isfinite(Y).all(axis=1) & (T >= 2)
+
+    idx = np.flatnonzero(hasil['valid'])
+    for mulai in range(0, len(idx), BLOK_DERET):
+        blok = idx[mulai:mulai + BLOK_DERET]
+        fit = _fit_blok(Y[blok], model)
+        for kunci in ('level', 'tren', 'alpha', 'beta', 'residual'):
+            hasil[kunci][blok] = fit[kunci]
+        for i, t in zip(blok, fit['parameter']):
+            hasil['parameter'][i] = t
+    return hasil
+
+
+def ramal_matriks(Y, model: str, langkah: int = 2):
+    """Prediksi `langkah` periode untuk setiap baris Y (deret × tahun).
+
+    Mengembalikan (prediksi (n, langkah), teks parameter per deret, mask
+    deret valid); deret yang tidak valid prediksinya NaN.
+    """
+    fit = fit_matriks(Y, model)
+    h = np.arange(1, langkah + 1)
+    prediksi = fit['level'][:, None] + fit['tren'][:, None] * h
+    return prediksi, fit['parameter'], fit['valid']
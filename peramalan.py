@@ -0,0 +1,612 @@
+# ==============================================================
+# PERAMALAN BATCH PER SEGMEN (ARIMA PARALEL)
+# Setiap deret (mis. kabupaten/kota × status × jenis kelamin) di-fit
+# di process pool; kegagalan & warning konvergensi dicatat per deret
+# tanpa menghentikan deret lain. Order (p, d, q) bisa dipilih otomatis
+# lewat grid AIC/BIC dan disimpan di cache per hash data deret. Model
+# ringan NumPy (model_cepat) memakai format tabel yang sama. Parameter
+# fit per deret bisa disimpan untuk warm start saat tahun baru masuk.
+# ==============================================================
+# Import Lib
+import os
+import json
+import hashlib
+import warnings
+from datetime import datetime
+from itertools import groupby, product
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+import dataset
+import kubus
+import model_cepat
+import bootstrap
+
+# Segmen bawaan: 27 kabupaten/kota × 2 status × 2 jenis kelamin (Jawa Barat)
+SEGMEN = ['kode_kabupaten_kota', 'status_kelahiran', 'jenis_kelamin']
+ORDER = (1, 1, 1)
+LANGKAH = 2
+# Jumlah deret per tugas worker (mengurangi overhead kirim-terima antar proses)
+UKURAN_BATCH = 16
+# Jumlah deret per tugas worker untuk interval bootstrap model_cepat
+UKURAN_BATCH_INTERVAL = 1024
+
+KOLOM_HASIL = ['model', 'order', 'tahun', 'prediksi', 'status', 'peringatan']
+
+# Grid pencarian order otomatis (batas atas inklusif) & kriteria informasi
+P_MAKS, D_MAKS, Q_MAKS = 2, 1, 2
+KRITERIA = ('aic', 'bic')
+# Cache order terpilih: hash deret -> order, disimpan di samping dataset final
+PATH_CACHE_ORDER = os.path.join(dataset.BASE_PATH, "final_dataset", "order_arima_kelahiran_jawabarat.json")
+# Cache order per fold backtest (hash data latih sampai origin), terpisah dari cache deret penuh
+PATH_CACHE_ORDER_BACKTEST = os.path.join(dataset.BASE_PATH, "final_dataset",
+                                         "order_backtest_arima_kelahiran_jawabarat.json")
+
+# Parameter fit terakhir per (segmen, order) untuk warm start
+PATH_PARAMETER = os.path.join(dataset.BASE_PATH, "final_dataset", "parameter_arima_kelahiran_jawabarat.json")
+# Fit hangat ditolak (fit ulang dingin) bila log-likelihood per observasi turun lebih dari ini
+BATAS_PENURUNAN_LLF = 1.0
+
+
+def deret_per_segmen(sumber, segmen=SEGMEN) -> dict:
+    """Deret tahunan per segmen: {kunci segmen (tuple): Series jumlah per tahun}.
+
+    Tahun yang tidak muncul pada suatu segmen diisi 0 agar semua deret
+    memiliki indeks tahun yang sama.
+    """
+    segmen = list(segmen)
+    by = ['tahun'] + segmen
+    if 'kode_kabupaten_kota' in segmen:
+        by.append(kubus.ATRIBUT_WILAYAH)
+    df = kubus.jumlah(sumber, by)
+    kunci = [k for k in by if k != 'tahun']
+    tabel = df.pivot_table(index='tahun', columns=kunci, values=kubus.UKURAN,
+                           aggfunc='sum', fill_value=0, observed=True).sort_index()
+    tabel.index = tabel.index.astype(int)
+    return {(k if isinstance(k, tuple) else (k,)): tabel[k] for k in tabel.columns}
+
+
+# --------------------------------------------------------------
+# Pemilihan order otomatis (grid AIC/BIC)
+# --------------------------------------------------------------
+def kandidat_order(p_maks: int = P_MAKS, d_maks: int = D_MAKS, q_maks: int = Q_MAKS) -> list:
+    """Semua (p, d, q) dalam grid, diurutkan dari model paling sederhana (p + q kecil)"""
+    grid = product(range(p_maks + 1), range(d_maks + 1), range(q_maks + 1))
+    return sorted(grid, key=lambda o: (o[0] + o[2], o[1], o))
+
+
+def _evaluasi_order(argumen):
+    """Skor AIC/BIC satu kandidat; None bila fit gagal atau tidak konvergen"""
+    from statsmodels.tsa.arima.model import ARIMA
+
+    nilai, order, kriteria = argumen
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        try:
+            model_fit = ARIMA(nilai, order=order).fit()
+            skor = float(getattr(model_fit, kriteria))
+            konvergen = (model_fit.mle_retvals or {}).get('converged', True)
+        except Exception:
+            return order, None
+    return order, (skor if konvergen and np.isfinite(skor) else None)
+
+
+def cari_order(nilai, kandidat=None, kriteria: str = "aic", peta=map):
+    """Order dengan AIC/BIC terkecil dari grid kandidat.
+
+    Kandidat dievaluasi per tingkat kompleksitas (p + q); kandidat dalam
+    satu tingkat independen sehingga bisa dijalankan paralel lewat `peta`
+    (mis. executor.map). Bila (p, d, q) gagal di-fit, semua kandidat yang
+    lebih besar (p' >= p, q' >= q, d sama) dilewati tanpa di-fit. Kandidat
+    dengan parameter lebih banyak dari observasi juga dilewati.
+    Mengembalikan (order, skor, jumlah kandidat yang di-fit).
+    """
+    if kriteria not in KRITERIA:
+        raise ValueError(f"Kriteria tidak dikenal: {kriteria}")
+    nilai = np.asarray(nilai, dtype=float)
+    kandidat = kandidat_order() if kandidat is None else sorted(kandidat, key=lambda o: (o[0] + o[2], o[1], o))
+
+    gagal, skor = [], {}
+    for _, grup in groupby(kandidat, key=lambda o: o[0] + o[2]):
+        aktif = [o for o in grup
+                 if o[0] + o[2] + 2 < len(nilai) - o[1]
+                 and not any(o[1] == g[1] and o[0] >= g[0] and o[2] >= g[2] for g in gagal)]
+        for order, s in peta(_evaluasi_order, [(nilai, o, kriteria) for o in aktif]):
+            if s is None:
+                gagal.append(order)
+            else:
+                skor[order] = s
+    if not skor:
+        raise ValueError("tidak ada kandidat order yang berhasil di-fit")
+    terbaik = min(skor, key=skor.get)
+    return terbaik, skor[terbaik], len(skor) + len(gagal)
+
+
+def hash_deret(tahun, nilai, kriteria: str, kandidat=None) -> str:
+    """SHA-1 isi deret + pengaturan pencarian (grid & kriteria)"""
+    kandidat = kandidat_order() if kandidat is None else kandidat
+    h = hashlib.sha1()
+    h.update(np.asarray(tahun, dtype=np.int64).tobytes())
+    h.update(np.asarray(nilai, dtype=np.float64).tobytes())
+    h.update(json.dumps([kriteria, [list(o) for o in kandidat]]).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _muat_json(path: str) -> dict:
+    """Isi file JSON (cache order / parameter), atau kosong bila belum ada / tidak terbaca"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _simpan_json(isi: dict, path: str) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(isi, f, indent=1, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def muat_cache_order(path: str = PATH_CACHE_ORDER) -> dict:
+    """Isi cache order, atau kosong bila belum ada / tidak terbaca"""
+    return _muat_json(path)
+
+
+def simpan_cache_order(cache: dict, path: str = PATH_CACHE_ORDER) -> None:
+    _simpan_json(cache, path)
+
+
+def pilih_order(series: pd.Series, kriteria: str = "aic", kandidat=None,
+                workers: int = None, path_cache: str = PATH_CACHE_ORDER):
+    """Order terbaik untuk satu deret, dari cache bila data tidak berubah.
+
+    Bila belum ada di cache, kandidat tiap tingkat dievaluasi paralel di
+    process pool. Mengembalikan (order, "cache" / "pencarian").
+    """
+    tahun, nilai = series.index.to_numpy(dtype=int), series.to_numpy(dtype=float)
+    kunci = hash_deret(tahun, nilai, kriteria, kandidat)
+    cache = muat_cache_order(path_cache)
+    if kunci in cache:
+        return tuple(cache[kunci]['order']), "cache"
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            order, skor, _ = cari_order(nilai, kandidat, kriteria, peta=executor.map)
+    else:
+        order, skor, _ = cari_order(nilai, kandidat, kriteria)
+    cache[kunci] = {'order': list(order), 'kriteria': kriteria, 'skor': skor,
+                    'diperbarui': datetime.now().isoformat(timespec='seconds')}
+    simpan_cache_order(cache, path_cache)
+    return order, "pencarian"
+
+
+# --------------------------------------------------------------
+# Fit ARIMA dengan warm start
+# --------------------------------------------------------------
+def _konvergen(model_fit) -> bool:
+    return bool((model_fit.mle_retvals or {}).get('converged', True))
+
+
+def ringkasan_fit(model_fit) -> dict:
+    """Parameter & log-likelihood per observasi; bekal warm start fit berikutnya"""
+    nobs = max(int(model_fit.nobs) - int(model_fit.loglikelihood_burn), 1)
+    return {'params': [float(p) for p in model_fit.params], 'llf_per_obs': float(model_fit.llf) / nobs}
+
+
+def fit_arima(nilai, order, awal: dict = None):
+    """Fit ARIMA; dengan `awal` (ringkasan_fit sebelumnya) dicoba warm start dulu.
+
+    Parameter lama dipakai sebagai start_params sehingga optimizer mulai
+    dekat optimum (biasanya separuh iterasi). Warm start ditolak dan model
+    di-fit ulang dari awal bila error, tidak konvergen, hasilnya tidak
+    terhingga, log-likelihood per observasi turun lebih dari
+    BATAS_PENURUNAN_LLF dibanding fit sebelumnya, atau log-likelihood-nya
+    lebih rendah dari titik awal fit dingin (optimum lokal yang buruk).
+    Mengembalikan (model_fit, "hangat" / "dingin").
+    """
+    from statsmodels.tsa.arima.model import ARIMA
+
+    model = ARIMA(np.asarray(nilai, dtype=float), order=tuple(order))
+    if awal is not None and len(awal['params']) == len(model.param_names):
+        with warnings.catch_warnings(record=True) as tercatat:
+            warnings.simplefilter("always")
+            try:
+                model_fit = model.fit(start_params=np.asarray(awal['params'], dtype=float))
+                llf_lama = awal.get('llf_per_obs')
+                diterima = (_konvergen(model_fit) and np.isfinite(model_fit.params).all()
+                            and model_fit.llf >= model.loglike(model.start_params)
+                            and (llf_lama is None
+                                 or ringkasan_fit(model_fit)['llf_per_obs'] >= llf_lama - BATAS_PENURUNAN_LLF))
+            except Exception:
+                diterima = False
+        if diterima:
+            for w in tercatat:
+                warnings.warn(w.message, w.category)
+            return model_fit, "hangat"
+    return model.fit(), "dingin"
+
+
+def kunci_parameter(kunci, order) -> str:
+    """Kunci penyimpanan parameter: segmen + order"""
+    return json.dumps([str(k) for k in kunci] + [[int(x) for x in order]])
+
+
+# --------------------------------------------------------------
+# Peramalan batch
+# --------------------------------------------------------------
+def _ramal_satu(tahun: np.ndarray, nilai: np.ndarray, order, langkah: int,
+                kriteria: str = "aic", interval: bool = False, awal: dict = None) -> dict:
+    """Fit satu deret; exception & warning dikembalikan sebagai data, bukan dilempar.
+
+    Bila `order` None, order dicari dulu dengan cari_order (serial, karena
+    paralelisme sudah di tingkat deret). Dengan `interval`, interval
+    bootstrap residual ikut dihitung dari model yang sama. `awal` =
+    parameter fit sebelumnya untuk warm start (lihat fit_arima).
+    """
+    tahun_prediksi = np.arange(tahun[-1] + 1, tahun[-1] + 1 + langkah)
+    skor, jenis_fit, ringkasan = None, None, None
+    with warnings.catch_warnings(record=True) as tercatat:
+        warnings.simplefilter("always")
+        try:
+            if not np.isfinite(nilai).all():
+                raise ValueError("deret berisi nilai kosong/tak hingga")
+            if order is None:
+                order, skor, _ = cari_order(nilai, kriteria=kriteria)
+            model_fit, jenis_fit = fit_arima(nilai, order, awal)
+            ringkasan = ringkasan_fit(model_fit)
+            prediksi = np.asarray(model_fit.forecast(steps=langkah), dtype=float)
+            if not np.isfinite(prediksi).all():
+                raise ValueError("hasil prediksi tidak terhingga")
+            rentang = bootstrap.interval_arima(model_fit, langkah) if interval else None
+            status, pesan = "ok", ""
+        except Exception as e:
+            prediksi = np.full(langkah, np.nan)
+            rentang = None
+            status, pesan = "gagal", f"{type(e).__name__}: {e}"
+    peringatan = sorted({f"{w.category.__name__}: {w.message}" for w in tercatat})
+    if pesan:
+        peringatan.insert(0, pesan)
+    return {'order': order, 'skor': skor, 'tahun': tahun_prediksi, 'prediksi': prediksi,
+            'interval': rentang, 'status': status, 'peringatan': "; ".join(peringatan),
+            'fit': jenis_fit, 'ringkasan': ringkasan}
+
+
+def _jalankan_batch(fungsi, tugas) -> list:
+    # Dijalankan di proses worker: satu batch deret sekaligus
+    return [fungsi(*t) for t in tugas]
+
+
+def _petakan_batch(fungsi, tugas: list, workers: int, ukuran_batch: int, saat_gagal) -> list:
+    """fungsi(*t) untuk setiap tugas di process pool, per batch; urutan hasil = urutan tugas.
+
+    Bila satu batch gagal sebagai keseluruhan (mis. proses worker mati),
+    hasil tiap tugasnya diganti saat_gagal(t, error).
+    """
+    batch = [tugas[i:i + ukuran_batch] for i in range(0, len(tugas), ukuran_batch)]
+    hasil = []
+    workers = max(1, min(workers or os.cpu_count() or 1, len(batch)))
+    if workers == 1:
+        for b in batch:
+            hasil.extend(_jalankan_batch(fungsi, b))
+        return hasil
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_jalankan_batch, fungsi, b) for b in batch]
+        for b, fut in zip(batch, futures):
+            try:
+                hasil.extend(fut.result())
+            except Exception as e:
+                hasil.extend(saat_gagal(t, e) for t in b)
+    return hasil
+
+
+def _ramal_gagal(t, e) -> dict:
+    tahun, _, order, langkah = t[:4]
+    return {'order': order, 'skor': None,
+            'tahun': np.arange(tahun[-1] + 1, tahun[-1] + 1 + langkah),
+            'prediksi': np.full(langkah, np.nan), 'interval': None, 'status': "gagal",
+            'fit': None, 'ringkasan': None,
+            'peringatan': f"{type(e).__name__}: {e}"}
+
+
+def _order_per_deret(data: list, order, kriteria: str, path_cache: str):
+    """Order tiap deret: tetap, atau dari cache untuk "auto" (None = perlu dicari)"""
+    if order != "auto":
+        return [tuple(order)] * len(data), None, None
+    cache = muat_cache_order(path_cache)
+    hash_semua = [hash_deret(tahun, nilai, kriteria) for tahun, nilai in data]
+    return [tuple(cache[h]['order']) if h in cache else None for h in hash_semua], cache, hash_semua
+
+
+def _nama_segmen(kunci: list, nama_segmen=None) -> list:
+    if nama_segmen is not None:
+        return list(nama_segmen)
+    return [f"segmen_{i}" for i in range(len(kunci[0]) if kunci else 0)]
+
+
+def _matriks_deret(data: list) -> list:
+    """Mengelompokkan deret dengan tahun yang sama: [(posisi deret, tahun, matriks deret × tahun)]"""
+    grup = {}
+    for i, (tahun, _) in enumerate(data):
+        grup.setdefault(tuple(tahun), []).append(i)
+    return [(posisi, np.asarray(tahun, dtype=int), np.vstack([data[i][1] for i in posisi]))
+            for tahun, posisi in grup.items()]
+
+
+def _interval_gagal(t, e) -> dict:
+    Y, _, langkah, _ = t
+    kosong = np.full((len(Y), langkah), np.nan)
+    return {tingkat: (kosong, kosong) for tingkat in bootstrap.TINGKAT}
+
+
+def _ramal_cepat(data: list, model: str, langkah: int, interval: bool = False,
+                 workers: int = None) -> list:
+    """Hasil per deret (format _ramal_satu) dari model_cepat, semua deret sekaligus.
+
+    Interval bootstrap dihitung per blok deret di process pool (jalur
+    simulasi jauh lebih berat daripada fit-nya).
+    """
+    hasil = [None] * len(data)
+    for posisi, tahun, Y in _matriks_deret(data):
+        prediksi, parameter, valid = model_cepat.ramal_matriks(Y, model, langkah)
+        rentang = None
+        if interval:
+            tugas = [(Y[i:i + UKURAN_BATCH_INTERVAL], model, langkah, i)
+                     for i in range(0, len(Y), UKURAN_BATCH_INTERVAL)]
+            blok = _petakan_batch(_interval_blok, tugas, workers, 1, _interval_gagal)
+            rentang = {t: (np.vstack([b[t][0] for b in blok]), np.vstack([b[t][1] for b in blok]))
+                       for t in bootstrap.TINGKAT}
+        tahun_prediksi = np.arange(tahun[-1] + 1, tahun[-1] + 1 + langkah)
+        for j, i in enumerate(posisi):
+            hasil[i] = {'order': parameter[j], 'skor': None, 'tahun': tahun_prediksi,
+                        'prediksi': prediksi[j], 'status': "ok" if valid[j] else "gagal",
+                        'interval': None if rentang is None else
+                        {t: (bawah[j], atas[j]) for t, (bawah, atas) in rentang.items()},
+                        'peringatan': "" if valid[j] else "ValueError: deret berisi nilai kosong/tak hingga"}
+    return hasil
+
+
+def _interval_blok(Y: np.ndarray, model: str, langkah: int, offset: int) -> dict:
+    # Dijalankan di proses worker: interval bootstrap satu blok deret
+    return bootstrap.interval_cepat(Y, model, langkah, offset=offset)
+
+
+def ramal_batch(deret: dict, order=ORDER, langkah: int = LANGKAH,
+                workers: int = None, ukuran_batch: int = UKURAN_BATCH,
+                nama_segmen=None, kriteria: str = "aic",
+                path_cache: str = PATH_CACHE_ORDER, model: str = "arima",
+                interval: bool = False, hangat: bool = False,
+                path_parameter: str = PATH_PARAMETER) -> pd.DataFrame:
+    """Meramal semua deret secara paralel dan mengembalikan tabel rapi.
+
+    Satu baris per (segmen, tahun prediksi) dengan kolom kunci segmen,
+    `model`, `order`, `tahun`, `prediksi`, `status` ("ok"/"gagal") dan
+    `peringatan` (error atau warning konvergensi statsmodels). Deret yang
+    gagal tetap muncul dengan prediksi kosong; bila proses worker mati,
+    hanya batch milik worker tersebut yang ditandai gagal.
+
+    Dengan order="auto", order tiap deret diambil dari cache (hash data)
+    atau dicari di worker; hasil pencarian baru ditulis ke cache di akhir.
+    `attrs['order_dari_cache']` mencatat jumlah deret yang tidak perlu dicari.
+
+    Model selain "arima" (lihat model_cepat.MODEL) di-fit untuk semua
+    deret sekaligus sebagai matriks NumPy di proses ini; kolom `order`
+    berisi parameter pemulusan terpilih.
+
+    Dengan `interval`, tabel mendapat kolom bawah_XX/atas_XX untuk setiap
+    tingkat bootstrap.TINGKAT (interval bootstrap residual).
+
+    Dengan `hangat` (ARIMA), parameter fit tersimpan per (segmen, order)
+    di `path_parameter` dipakai sebagai titik awal (lihat fit_arima) dan
+    parameter baru ditulis kembali. `attrs['fit_hangat']` /
+    `attrs['fit_dingin']` mencatat jumlah deret per jenis fit;
+    `attrs['kembali_dingin']` = warm start yang ditolak.
+    """
+    kunci = list(deret)
+    data = [(s.index.to_numpy(dtype=int), s.to_numpy(dtype=float)) for s in deret.values()]
+    if model != "arima":
+        hasil = _ramal_cepat(data, model, langkah, interval, workers)
+        return _tabel_hasil(kunci, hasil, model, nama_segmen, interval)
+
+    daftar_order, cache, hash_semua = _order_per_deret(data, order, kriteria, path_cache)
+    parameter = _muat_json(path_parameter) if hangat else {}
+    # Deret yang warm start-nya ditolak pada refresh sebelumnya langsung fit dingin sekali
+    daftar_awal = [parameter.get(kunci_parameter(k, o)) if o is not None else None
+                   for k, o in zip(kunci, daftar_order)]
+    daftar_awal = [None if a is None or a.get('tolak_hangat') else a for a in daftar_awal]
+    tugas = [(tahun, nilai, o, langkah, kriteria, interval, a)
+             for (tahun, nilai), o, a in zip(data, daftar_order, daftar_awal)]
+    hasil = _petakan_batch(_ramal_satu, tugas, workers, ukuran_batch, _ramal_gagal)
+
+    if hangat:
+        for k, a, r in zip(kunci, daftar_awal, hasil):
+            if r['ringkasan'] is not None:
+                parameter[kunci_parameter(k, r['order'])] = dict(
+                    r['ringkasan'], tolak_hangat=a is not None and r['fit'] == "dingin")
+        _simpan_json(parameter, path_parameter)
+
+    if order == "auto":
+        baru = 0
+        for h, o, r in zip(hash_semua, daftar_order, hasil):
+            if o is None and r['skor'] is not None:
+                cache[h] = {'order': list(r['order']), 'kriteria': kriteria, 'skor': r['skor'],
+                            'diperbarui': datetime.now().isoformat(timespec='seconds')}
+                baru += 1
+        if baru:
+            simpan_cache_order(cache, path_cache)
+
+    for h in hasil:
+        h['order'] = "" if h['order'] is None else str(tuple(int(x) for x in h['order']))
+    df = _tabel_hasil(kunci, hasil, model, nama_segmen, interval)
+    df.attrs['order_dari_cache'] = sum(o is not None for o in daftar_order) if order == "auto" else 0
+    df.attrs['fit_hangat'] = sum(r['fit'] == "hangat" for r in hasil)
+    df.attrs['fit_dingin'] = sum(r['fit'] == "dingin" for r in hasil)
+    df.attrs['kembali_dingin'] = sum(a is not None and r['fit'] == "dingin" for a, r in zip(daftar_awal, hasil))
+    return df
+
+
+def _tabel_hasil(kunci: list, hasil: list, model: str, nama_segmen=None,
+                 interval: bool = False) -> pd.DataFrame:
+    nama_segmen = _nama_segmen(kunci, nama_segmen)
+    kolom_interval = [f"{sisi}_{t}" for t in bootstrap.TINGKAT for sisi in ('bawah', 'atas')] if interval else []
+    baris = []
+    for k, h in zip(kunci, hasil):
+        for i, (t, p) in enumerate(zip(h['tahun'], h['prediksi'])):
+            rentang = []
+            if interval:
+                for tingkat in bootstrap.TINGKAT:
+                    bawah, atas = h['interval'][tingkat] if h['interval'] else (None, None)
+                    rentang += [np.nan, np.nan] if bawah is None else [float(bawah[i]), float(atas[i])]
+            baris.append((*k, model, h['order'], int(t), float(p), *rentang, h['status'], h['peringatan']))
+    kolom = KOLOM_HASIL[:4] + kolom_interval + KOLOM_HASIL[4:]
+    df = pd.DataFrame(baris, columns=nama_segmen + kolom)
+    df.attrs['order_dari_cache'] = 0
+    return df
+
+
+def ramal_per_segmen(sumber, segmen=SEGMEN, order=ORDER, langkah: int = LANGKAH,
+                     workers: int = None, kriteria: str = "aic", model: str = "arima",
+                     interval: bool = False, hangat: bool = False) -> pd.DataFrame:
+    """Deret per segmen dari kubus/dataset lalu diramal dengan ramal_batch"""
+    segmen = list(segmen)
+    nama_segmen = segmen + ([kubus.ATRIBUT_WILAYAH] if 'kode_kabupaten_kota' in segmen else [])
+    deret = deret_per_segmen(sumber, segmen)
+    return ramal_batch(deret, order, langkah, workers, nama_segmen=nama_segmen,
+                       kriteria=kriteria, model=model, interval=interval, hangat=hangat)
+
+
+# --------------------------------------------------------------
+# Backtest rolling-origin (expanding window)
+# --------------------------------------------------------------
+# Jumlah tahun data latih minimal pada origin pertama
+MIN_LATIH = 6
+KOLOM_BACKTEST = ['model', 'order', 'origin', 'horizon', 'tahun', 'aktual', 'prediksi']
+# Label fold ARIMA tanpa fit ulang (parameter dari window pertama dibekukan), bukan model yang dipublikasikan
+MODEL_TANPA_REFIT = "arima_tetap"
+
+
+def _kunci_fold(tahun, nilai, akhir: int, kriteria: str) -> str:
+    """Kunci cache order satu fold: hash data latih sampai origin (tanpa data sesudahnya)"""
+    return f"{akhir}:{hash_deret(tahun[:akhir], nilai[:akhir], kriteria)}"
+
+
+def _backtest_satu(tahun: np.ndarray, nilai: np.ndarray, order, horizon: int,
+                   min_latih: int, refit: bool, kriteria: str = "aic") -> tuple:
+    """Semua fold ARIMA satu deret (satu prediksi per origin & horizon).
+
+    `order` berupa tuple tetap, atau dict {akhir: order / None} untuk
+    order otomatis: order setiap fold dipilih hanya dari data latih
+    nilai[:akhir] (None = dicari di sini dengan cari_order), sehingga
+    tidak ada informasi sesudah origin yang ikut memilih model.
+    Dengan `refit` (bawaan) setiap origin di-fit ulang penuh, sama seperti
+    model yang dipublikasikan. Tanpa `refit`, model di-fit sekali lalu
+    setiap origin berikutnya cukup menambah satu observasi ke state yang
+    sama (res.append(refit=False), parameter tetap; fit ulang hanya bila
+    order fold berubah); barisnya diberi label MODEL_TANPA_REFIT.
+    Mengembalikan (baris, {kunci fold: order hasil pencarian}).
+    """
+    from statsmodels.tsa.arima.model import ARIMA
+
+    baris, dicari = [], {}
+    res, order_res = None, None
+    label = "arima" if refit else MODEL_TANPA_REFIT
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for akhir in range(min_latih, len(nilai)):
+            h_maks = min(horizon, len(nilai) - akhir)
+            order_fold = order
+            if isinstance(order, dict):
+                order_fold = order.get(akhir)
+                if order_fold is None:
+                    try:
+                        order_fold = cari_order(nilai[:akhir], kriteria=kriteria)[0]
+                        dicari[_kunci_fold(tahun, nilai, akhir, kriteria)] = list(order_fold)
+                    except Exception:
+                        order_fold = ORDER
+            order_fold = tuple(int(x) for x in order_fold)
+            try:
+                if not np.isfinite(nilai[:akhir]).all():
+                    raise ValueError("deret berisi nilai kosong/tak hingga")
+                if res is None or refit or order_fold != order_res:
+                    res = ARIMA(nilai[:akhir], order=order_fold).fit()
+                    order_res = order_fold
+                else:
+                    res = res.append(nilai[akhir - 1:akhir], refit=False)
+                prediksi = np.asarray(res.forecast(steps=h_maks), dtype=float)
+            except Exception:
+                res = None
+                prediksi = np.full(h_maks, np.nan)
+            for h in range(h_maks):
+                baris.append((label, str(order_fold), int(tahun[akhir - 1]), h + 1, int(tahun[akhir + h]),
+                              float(nilai[akhir + h]), float(prediksi[h])))
+    return baris, dicari
+
+
+def _backtest_cepat(data: list, model: str, horizon: int, min_latih: int) -> list:
+    """Fold model_cepat: setiap origin meramal semua deret sekaligus"""
+    hasil = [[] for _ in data]
+    for posisi, tahun, Y in _matriks_deret(data):
+        for akhir in range(min_latih, Y.shape[1]):
+            h_maks = min(horizon, Y.shape[1] - akhir)
+            prediksi, parameter, _ = model_cepat.ramal_matriks(Y[:, :akhir], model, h_maks)
+            for j, i in enumerate(posisi):
+                for h in range(h_maks):
+                    hasil[i].append((model, parameter[j], int(tahun[akhir - 1]), h + 1, int(tahun[akhir + h]),
+                                     float(Y[j, akhir + h]), float(prediksi[j, h])))
+    return hasil
+
+
+def _backtest_gagal(t, e) -> tuple:
+    # Batch yang gagal total tidak menghasilkan fold (tercatat sebagai deret tanpa baris)
+    return [], {}
+
+
+def _order_per_fold(data: list, min_latih: int, kriteria: str, path_cache: str):
+    """Order otomatis per (deret, origin) dari cache backtest: {akhir: order / None} per deret"""
+    cache = _muat_json(path_cache)
+    daftar = []
+    for tahun, nilai in data:
+        daftar.append({akhir: cache.get(_kunci_fold(tahun, nilai, akhir, kriteria))
+                       for akhir in range(min_latih, len(nilai))})
+    return daftar, cache
+
+
+def backtest_batch(deret: dict, order=ORDER, horizon: int = LANGKAH, min_latih: int = MIN_LATIH,
+                   refit: bool = True, workers: int = None, ukuran_batch: int = UKURAN_BATCH,
+                   nama_segmen=None, kriteria: str = "aic",
+                   path_cache: str = PATH_CACHE_ORDER_BACKTEST, model: str = "arima") -> pd.DataFrame:
+    """Backtest rolling-origin semua deret secara paralel (per deret di process pool).
+
+    Setiap origin memakai seluruh data sampai tahun origin sebagai data
+    latih (expanding window) dan meramal `horizon` tahun ke depan. Hasil
+    berupa tabel rapi satu baris per (segmen, model, origin, horizon)
+    dengan nilai aktual & prediksi; metrik dihitung oleh pemanggil.
+    Dengan order="auto" order dipilih ulang di setiap fold hanya dari data
+    sampai origin, di-cache per (hash data latih, origin) di `path_cache`
+    (cache order deret penuh tidak pernah dipakai, karena order itu dipilih
+    dengan data sesudah origin). Tanpa `refit` parameter ARIMA dibekukan
+    dan barisnya berlabel MODEL_TANPA_REFIT. Model model_cepat di-fit
+    ulang penuh di setiap origin karena semua deret dihitung sekaligus.
+    """
+    kunci = list(deret)
+    data = [(s.index.to_numpy(dtype=int), s.to_numpy(dtype=float)) for s in deret.values()]
+    if model != "arima":
+        hasil = _backtest_cepat(data, model, horizon, min_latih)
+    else:
+        if order == "auto":
+            daftar_order, cache = _order_per_fold(data, min_latih, kriteria, path_cache)
+        else:
+            daftar_order, cache = [tuple(order)] * len(data), None
+        tugas = [(tahun, nilai, o, horizon, min_latih, refit, kriteria)
+                 for (tahun, nilai), o in zip(data, daftar_order)]
+        hasil_fold = _petakan_batch(_backtest_satu, tugas, workers, ukuran_batch, _backtest_gagal)
+        hasil = [b for b, _ in hasil_fold]
+        baru = {k: v for _, dicari in hasil_fold for k, v in dicari.items()}
+        if baru:
+            cache.update(baru)
+            _simpan_json(cache, path_cache)
+
+    nama_segmen = _nama_segmen(kunci, nama_segmen)
+    baris = [(*k, *b) for k, h in zip(kunci, hasil) for b in h]
+    return pd.DataFrame(baris, columns=nama_segmen + KOLOM_BACKTEST)
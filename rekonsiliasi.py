@@ -0,0 +1,193 @@
+# ==============================================================
+# REKONSILIASI PERAMALAN HIERARKIS
+# Deret provinsi, kabupaten/kota, status & jenis kelamin diramal
+# terpisah sehingga jumlahnya tidak konsisten. Semua node hierarki
+# dinyatakan lewat matriks penjumlah sparse S (node × deret terbawah);
+# rekonsiliasi bottom-up, top-down, OLS & WLS menghasilkan prediksi
+# koheren (ỹ = S·b) untuk semua level dalam satu proses aljabar linear.
+# ==============================================================
+# Import Lib
+from itertools import combinations
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.linalg import LinearOperator, cg
+import kubus
+import peramalan
+
+METODE = ('bottom_up', 'top_down', 'ols', 'wls')
+# Label dimensi yang dijumlahkan pada node agregat
+SEMUA = "Semua"
+# Toleransi relatif conjugate gradient untuk metode OLS/WLS
+TOLERANSI = 1e-10
+
+
+def level_bawaan(segmen) -> list:
+    """Semua kombinasi dimensi segmen, dari total provinsi sampai deret terbawah.
+
+    Dimensi saling silang (kabupaten/kota × status × jenis kelamin), jadi
+    hierarkinya berupa grouped hierarchy: setiap subset dimensi = satu level.
+    """
+    segmen = list(segmen)
+    return [c for r in range(len(segmen) + 1) for c in combinations(segmen, r)]
+
+
+def matriks_penjumlah(kunci_bawah: list, nama_kolom, level=None) -> dict:
+    """Matriks penjumlah sparse untuk deret terbawah `kunci_bawah`.
+
+    `nama_kolom` = nama elemen kunci (segmen, ditambah nama kabupaten/kota
+    bila ada). Mengembalikan dict berisi `S` (CSR, node × deret terbawah,
+    bernilai 0/1), `node` (tabel label node: kolom `level` + satu kolom per
+    segmen, SEMUA untuk dimensi yang dijumlahkan), `bawah` (baris S milik
+    setiap deret terbawah) dan `total` (baris S total provinsi atau None).
+    """
+    nama_kolom = list(nama_kolom)
+    segmen = [k for k in nama_kolom if k != kubus.ATRIBUT_WILAYAH]
+    level = level_bawaan(segmen) if level is None else [tuple(lv) for lv in level]
+    if tuple(segmen) not in level:
+        level.append(tuple(segmen))
+
+    kunci = pd.DataFrame(list(kunci_bawah), columns=nama_kolom)
+    m = len(kunci)
+    kolom = np.arange(m)
+    blok_S, blok_node, hasil = [], [], {'bawah': None, 'total': None}
+    baris = 0
+    for lv in level:
+        if lv:
+            grup = kunci.groupby(list(lv), sort=True, observed=True).ngroup().to_numpy()
+        else:
+            grup = np.zeros(m, dtype=np.int64)
+        jumlah_grup = int(grup.max()) + 1 if m else 0
+        blok_S.append(sparse.csr_matrix((np.ones(m), (grup, kolom)), shape=(jumlah_grup, m)))
+
+        node = kunci.assign(_grup=grup).drop_duplicates('_grup').sort_values('_grup').drop(columns='_grup')
+        for k in nama_kolom:
+            dipakai = k in lv or (k == kubus.ATRIBUT_WILAYAH and 'kode_kabupaten_kota' in lv)
+            if not dipakai:
+                node[k] = SEMUA
+        node.insert(0, 'level', "+".join(lv) if lv else "total")
+        blok_node.append(node)
+
+        if lv == tuple(segmen):
+            hasil['bawah'] = baris + grup
+        if not lv:
+            hasil['total'] = baris
+        baris += jumlah_grup
+
+    hasil['S'] = sparse.vstack(blok_S, format='csr')
+    hasil['node'] = pd.concat(blok_node, ignore_index=True).astype(object)
+    return hasil
+
+
+def deret_hierarki(sumber, segmen=peramalan.SEGMEN, level=None):
+    """Deret seluruh node hierarki: (hierarki, tahun, Y node × tahun, Y terbawah × tahun).
+
+    Deret agregat dihitung dari deret terbawah dengan satu perkalian
+    sparse S·Y, sehingga data historis pasti koheren.
+    """
+    segmen = list(segmen)
+    nama_kolom = segmen + ([kubus.ATRIBUT_WILAYAH] if 'kode_kabupaten_kota' in segmen else [])
+    deret = peramalan.deret_per_segmen(sumber, segmen)
+    hierarki = matriks_penjumlah(list(deret), nama_kolom, level)
+    tahun = next(iter(deret.values())).index.to_numpy(dtype=int)
+    Y_bawah = np.vstack([s.to_numpy(dtype=float) for s in deret.values()])
+    return hierarki, tahun, hierarki['S'] @ Y_bawah, Y_bawah
+
+
+def proporsi_historis(Y_bawah: np.ndarray) -> np.ndarray:
+    """Rata-rata proporsi historis tiap deret terbawah terhadap total (top-down Gross-Sohl A)"""
+    total = Y_bawah.sum(axis=0)
+    positif = total > 0
+    if not positif.any():
+        return np.full(len(Y_bawah), 1 / len(Y_bawah))
+    proporsi = (Y_bawah[:, positif] / total[positif]).mean(axis=1)
+    return proporsi / proporsi.sum()
+
+
+def _kuadrat_terkecil(S, Y_dasar: np.ndarray, bobot: np.ndarray) -> np.ndarray:
+    """b = (S'ΛS)⁻¹ S'Λ ŷ per kolom horizon, Λ = diag(1/bobot).
+
+    S'ΛS tidak dibentuk: conjugate gradient cukup memakai perkalian S
+    dan S' (biaya sebanding jumlah elemen S), dengan prekondisi diagonal.
+    Node yang prediksi dasarnya kosong diberi bobot nol (tidak ikut).
+    """
+    m = S.shape[1]
+    hasil = np.empty((m, Y_dasar.shape[1]))
+    for h in range(Y_dasar.shape[1]):
+        y = Y_dasar[:, h]
+        ada = np.isfinite(y)
+        lam = np.where(ada, 1 / bobot, 0.0)
+        diagonal = S.T @ lam
+        if (diagonal <= 0).any():
+            raise ValueError("ada deret terbawah tanpa prediksi dasar pada node mana pun")
+        A = LinearOperator((m, m), matvec=lambda x, lam=lam: S.T @ (lam * (S @ x)), dtype=float)
+        M = LinearOperator((m, m), matvec=lambda x, d=diagonal: x / d, dtype=float)
+        b, info = cg(A, S.T @ (lam * np.where(ada, y, 0.0)), M=M, rtol=TOLERANSI, atol=0.0, maxiter=10 * m)
+        if info != 0:
+            raise ValueError(f"conjugate gradient tidak konvergen (info={info})")
+        hasil[:, h] = b
+    return hasil
+
+
+def rekonsiliasi(Y_dasar, hierarki: dict, metode: str = "wls", Y_bawah=None) -> np.ndarray:
+    """Prediksi koheren (node × horizon) dari prediksi dasar semua node.
+
+    - bottom_up : jumlahkan prediksi deret terbawah.
+    - top_down  : bagi prediksi total provinsi dengan proporsi historis
+                  (butuh `Y_bawah`, data historis deret terbawah).
+    - ols       : proyeksi kuadrat terkecil, bobot sama untuk semua node.
+    - wls       : seperti ols dengan bobot struktural (varian node sebanding
+                  jumlah deret terbawah yang dijumlahkannya).
+    """
+    if metode not in METODE:
+        raise ValueError(f"Metode tidak dikenal: {metode}")
+    S = hierarki['S']
+    Y_dasar = np.asarray(Y_dasar, dtype=float)
+    if Y_dasar.ndim == 1:
+        Y_dasar = Y_dasar[:, None]
+
+    if metode == 'bottom_up':
+        b = Y_dasar[hierarki['bawah']]
+    elif metode == 'top_down':
+        if hierarki['total'] is None or Y_bawah is None:
+            raise ValueError("top_down membutuhkan level total dan data historis deret terbawah")
+        b = proporsi_historis(Y_bawah)[:, None] * Y_dasar[hierarki['total']][None, :]
+    else:
+        bobot = np.ones(S.shape[0]) if metode == 'ols' else np.asarray(S.sum(axis=1)).ravel()
+        b = _kuadrat_terkecil(S, Y_dasar, bobot)
+    return S @ b
+
+
+def ramal_hierarki(sumber, segmen=peramalan.SEGMEN, metode=METODE, order=peramalan.ORDER,
+                   langkah: int = peramalan.LANGKAH, workers: int = None, kriteria: str = "aic",
+                   model: str = "arima", level=None) -> pd.DataFrame:
+    """Ramal setiap node hierarki (ramal_batch) lalu rekonsiliasi dengan setiap metode.
+
+    Satu baris per (node, tahun prediksi): label node, `prediksi_dasar`,
+    kolom `prediksi_<metode>`, serta `status`/`peringatan` prediksi dasar.
+    """
+    hierarki, tahun, Y_node, Y_bawah = deret_hierarki(sumber, segmen, level)
+    deret = {(i,): pd.Series(y, index=tahun) for i, y in enumerate(Y_node)}
+    df_dasar = peramalan.ramal_batch(deret, order, langkah, workers, nama_segmen=['node'],
+                                     kriteria=kriteria, model=model)
+    df_dasar = df_dasar.sort_values(['node', 'tahun'], kind='stable')
+    Y_dasar = df_dasar['prediksi'].to_numpy(dtype=float).reshape(len(Y_node), langkah)
+
+    df = hierarki['node'].loc[df_dasar['node'].to_numpy()].reset_index(drop=True)
+    for kolom in ['model', 'order', 'tahun']:
+        df[kolom] = df_dasar[kolom].to_numpy()
+    df['prediksi_dasar'] = Y_dasar.ravel()
+    for m in metode:
+        df[f'prediksi_{m}'] = rekonsiliasi(Y_dasar, hierarki, m, Y_bawah).ravel()
+    df['status'] = df_dasar['status'].to_numpy()
+    df['peringatan'] = df_dasar['peringatan'].to_numpy()
+    df.attrs['jumlah_bawah'] = Y_bawah.shape[0]
+    df.attrs['level_bawah'] = "+".join(segmen)
+    return df
+
+
+def selisih_koherensi(df: pd.DataFrame, kolom: str) -> float:
+    """Selisih terbesar |total provinsi − jumlah deret terbawah| untuk satu kolom prediksi"""
+    total = df[df['level'] == "total"].groupby('tahun')[kolom].sum()
+    bawah = df[df['level'] == df.attrs['level_bawah']].groupby('tahun')[kolom].sum()
+    return float((total - bawah).abs().max())
@@ -0,0 +1,454 @@
+# ==============================================================
+# SPASIAL: CENTROID WILAYAH & PENETAPAN TITIK KE KABUPATEN/KOTA
+# Centroid dihitung dari GeoJSON batas wilayah; titik (mis. data
+# kelahiran per fasilitas kesehatan) ditetapkan ke wilayahnya lewat
+# indeks grid + uji point-in-polygon (ray casting) dengan NumPy.
+# CLI: tanpa argumen -> registri koordinat dari centroid;
+#      --tetapkan titik.csv -> kode_kabupaten_kota per titik / agregat.
+# ==============================================================
+# Import Lib
+import os
+import argparse
+import numpy as np
+import pandas as pd
+import batas_wilayah
+import koordinat
+
+# Batas ukuran matriks titik × sisi per blok uji point-in-polygon (memori ~ 8 byte × nilai ini)
+BLOK_UJI = 2_000_000
+
+
+def _daftar_polygon(geom: dict) -> list:
+    return [geom['coordinates']] if geom['type'] == 'Polygon' else geom['coordinates']
+
+
+def _luas_centroid_ring(ring: np.ndarray):
+    # Rumus shoelace: luas bertanda & centroid satu ring
+    x, y = ring[:, 0], ring[:, 1]
+    x1, y1 = np.roll(x, -1), np.roll(y, -1)
+    silang = x * y1 - x1 * y
+    luas = silang.sum() / 2
+    if luas == 0:
+        return 0.0, x.mean(), y.mean()
+    cx = ((x + x1) * silang).sum() / (6 * luas)
+    cy = ((y + y1) * silang).sum() / (6 * luas)
+    return luas, cx, cy
+
+
+def centroid(geom: dict):
+    """Centroid (lon, lat) berbobot luas untuk Polygon/MultiPolygon (lubang dikurangkan)"""
+    total, sx, sy = 0.0, 0.0, 0.0
+    for poly in _daftar_polygon(geom):
+        for i, ring in enumerate(poly):
+            luas, cx, cy = _luas_centroid_ring(np.asarray(ring, dtype=float)[:, :2])
+            # Ring luar menambah luas, ring dalam (lubang) mengurangi
+            luas = abs(luas) if i == 0 else -abs(luas)
+            total += luas
+            sx += luas * cx
+            sy += luas * cy
+    if total == 0:
+        titik = np.concatenate([np.asarray(r, dtype=float)[:, :2]
+                                for poly in _daftar_polygon(geom) for r in poly])
+        return tuple(titik.mean(axis=0))
+    return sx / total, sy / total
+
+
+def centroid_geojson(data: dict) -> pd.DataFrame:
+    """Tabel properties setiap feature beserta latitude & longitude centroidnya"""
+    baris = []
+    for f in data['features']:
+        lon, lat = centroid(f['geometry'])
+        baris.append({**(f.get('properties') or {}), 'latitude': lat, 'longitude': lon})
+    return pd.DataFrame(baris)
+
+
+class IndeksSpasial:
+    """Indeks grid di atas bounding box wilayah untuk menetapkan titik ke wilayah.
+
+    Setiap sel grid menyimpan wilayah yang bounding box-nya menyentuh sel
+    tersebut beserta sisi-sisi polygon wilayah yang melintasi rentang
+    lintang sel. Titik hanya diuji terhadap kandidat di selnya, dan uji
+    ray casting hanya memakai sisi yang relevan untuk sel itu.
+    """
+
+    def __init__(self, data: dict, ukuran_grid: int = 64):
+        self.properti = [f.get('properties') or {} for f in data['features']]
+
+        # Semua sisi polygon (x1, y1, x2, y2) per wilayah; ring luar & lubang
+        # diperlakukan sama (aturan even-odd)
+        self._sisi = []
+        kotak = []
+        for f in data['features']:
+            sisi = []
+            for poly in _daftar_polygon(f['geometry']):
+                for ring in poly:
+                    r = np.asarray(ring, dtype=float)[:, :2]
+                    if len(r) and not np.array_equal(r[0], r[-1]):
+                        r = np.vstack([r, r[:1]])
+                    sisi.append(np.hstack([r[:-1], r[1:]]))
+            sisi = np.vstack(sisi) if sisi else np.empty((0, 4))
+            self._sisi.append(sisi)
+            semua_x = sisi[:, [0, 2]]
+            semua_y = sisi[:, [1, 3]]
+            kotak.append((semua_x.min(), semua_y.min(), semua_x.max(), semua_y.max()))
+        self.kotak = np.array(kotak)
+
+        self.x0, self.y0 = self.kotak[:, 0].min(), self.kotak[:, 1].min()
+        self.x1, self.y1 = self.kotak[:, 2].max(), self.kotak[:, 3].max()
+        self.n = ukuran_grid
+        self.lebar = max((self.x1 - self.x0) / self.n, 1e-12)
+        self.tinggi = max((self.y1 - self.y0) / self.n, 1e-12)
+
+        # Sel -> daftar (wilayah, sisi relevan); dibangun sekali di sini
+        self._sel = {}
+        ix0, iy0 = self._sel_dari(self.kotak[:, 0], self.kotak[:, 1])
+        ix1, iy1 = self._sel_dari(self.kotak[:, 2], self.kotak[:, 3])
+        for w in range(len(self.kotak)):
+            sisi = self._sisi[w]
+            y_min = np.minimum(sisi[:, 1], sisi[:, 3])
+            y_max = np.maximum(sisi[:, 1], sisi[:, 3])
+            for iy in range(iy0[w], iy1[w] + 1):
+                bawah = self.y0 + iy * self.tinggi
+                atas = bawah + self.tinggi
+                sisi_pita = sisi[(y_max >= bawah) & (y_min <= atas)]
+                for ix in range(ix0[w], ix1[w] + 1):
+                    self._sel.setdefault(iy * self.n + ix, []).append((w, sisi_pita))
+
+    def _sel_dari(self, x, y):
+        ix = np.clip(((np.asarray(x) - self.x0) / self.lebar).astype(np.int64), 0, self.n - 1)
+        iy = np.clip(((np.asarray(y) - self.y0) / self.tinggi).astype(np.int64), 0, self.n - 1)
+        return ix, iy
+
+    @staticmethod
+    def _di_dalam(px: np.ndarray, py: np.ndarray, sisi: np.ndarray) -> np.ndarray:
+        """Ray casting ke arah +x: jumlah perpotongan ganjil berarti titik di dalam"""
+        hasil = np.zeros(len(px), dtype=bool)
+        if len(sisi) == 0:
+            return hasil
+        x1, y1, x2, y2 = (sisi[:, i][None, :] for i in range(4))
+        langkah = max(1, BLOK_UJI // len(sisi))
+        for a in range(0, len(px), langkah):
+            x = px[a:a + langkah, None]
+            y = py[a:a + langkah, None]
+            melintas = (y1 > y) != (y2 > y)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                x_potong = x1 + (y - y1) * (x2 - x1) / (y2 - y1)
+            hasil[a:a + langkah] = (melintas & (x < x_potong)).sum(axis=1) % 2 == 1
+        return hasil
+
+    def tetapkan(self, lon, lat) -> np.ndarray:
+        """Indeks wilayah (urutan features GeoJSON) untuk setiap titik, -1 bila di luar semua wilayah"""
+        lon = np.asarray(lon, dtype=float)
+        lat = np.asarray(lat, dtype=float)
+        hasil = np.full(len(lon), -1, dtype=np.int64)
+
+        dalam_kotak = (lon >= self.x0) & (lon <= self.x1) & (lat >= self.y0) & (lat <= self.y1)
+        idx = np.flatnonzero(dalam_kotak)
+        if len(idx) == 0:
+            return hasil
+        ix, iy = self._sel_dari(lon[idx], lat[idx])
+        sel = iy * self.n + ix
+
+        # Kelompokkan titik per sel (sekali sort), lalu uji per kandidat wilayah
+        urut = np.argsort(sel, kind='stable')
+        idx, sel = idx[urut], sel[urut]
+        batas = np.flatnonzero(np.diff(sel)) + 1
+        for awal, akhir in zip(np.r_[0, batas], np.r_[batas, len(sel)]):
+            kandidat = self._sel.get(int(sel[awal]))
+            if not kandidat:
+                continue
+            titik = idx[awal:akhir]
+            for w, sisi in kandidat:
+                belum = titik[hasil[titik] < 0]
+                if len(belum) == 0:
+                    break
+                x0, y0, x1, y1 = self.kotak[w]
+                px, py = lon[belum], lat[belum]
+                cek = (px >= x0) & (px <= x1) & (py >= y0) & (py <= y1)
+                if cek.any():
+                    masuk = belum[cek][self._di_dalam(px[cek], py[cek], sisi)]
+                    hasil[masuk] = w
+        return hasil
+
+    def tetapkan_properti(self, lon, lat, properti: str) -> pd.Series:
+        """Nilai properties[`properti`] wilayah untuk setiap titik (NaN bila di luar)"""
+        nilai = pd.Series([p.get(properti) for p in self.properti] + [None])
+        w = self.tetapkan(lon, lat)
+        return nilai.take(np.where(w < 0, len(self.properti), w)).reset_index(drop=True)
+
+
+# -------------------------------
+# Binning titik ke grid heksagon / persegi
+# -------------------------------
+def bin_titik(lon, lat, bobot=None, ukuran: float = 0.05, bentuk: str = "hex") -> pd.DataFrame:
+    """Menjumlahkan bobot titik per sel grid heksagon (pointy-top) atau persegi.
+
+    `ukuran` dalam derajat lintang (jari-jari heksagon / sisi persegi);
+    bujur dikoreksi cos(lintang rata-rata) agar sel tidak gepeng.
+    Mengembalikan pusat sel (latitude, longitude), jumlah bobot & jumlah titik.
+    """
+    lon = np.asarray(lon, dtype=float)
+    lat = np.asarray(lat, dtype=float)
+    bobot = np.ones(len(lon)) if bobot is None else np.asarray(bobot, dtype=float)
+    kolom = ['latitude', 'longitude', 'jumlah', 'jumlah_titik']
+    if len(lon) == 0:
+        return pd.DataFrame(columns=kolom)
+
+    skala = np.cos(np.radians(lat.mean()))
+    x = lon * skala / ukuran
+    y = lat / ukuran
+    if bentuk == "hex":
+        # Koordinat aksial (q, r) lalu pembulatan kubus
+        q = np.sqrt(3) / 3 * x - y / 3
+        r = 2 / 3 * y
+        s = -q - r
+        rq, rr, rs = np.round(q), np.round(r), np.round(s)
+        dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+        ganti_q = (dq > dr) & (dq > ds)
+        ganti_r = ~ganti_q & (dr > ds)
+        rq = np.where(ganti_q, -rr - rs, rq)
+        rr = np.where(ganti_r, -rq - rs, rr)
+        a, b = rq.astype(np.int64), rr.astype(np.int64)
+    elif bentuk == "persegi":
+        a, b = np.floor(x).astype(np.int64), np.floor(y).astype(np.int64)
+    else:
+        raise ValueError(f"Bentuk grid tidak dikenal: {bentuk}")
+
+    # Pasangan (a, b) dikemas jadi satu kunci int64; bila rentangnya kecil
+    # langsung di-bincount (tanpa sorting), selain itu lewat np.unique 1D
+    a0, b0 = a.min(), b.min()
+    lebar = int(b.max() - b0) + 1
+    kunci = (a - a0) * lebar + (b - b0)
+    rentang = int(a.max() - a0 + 1) * lebar
+    if rentang <= max(4 * len(kunci), 1 << 20):
+        jumlah = np.bincount(kunci, weights=bobot, minlength=rentang)
+        banyak = np.bincount(kunci, minlength=rentang)
+        sel = np.flatnonzero(banyak)
+        jumlah, banyak = jumlah[sel], banyak[sel]
+    else:
+        sel, balik = np.unique(kunci, return_inverse=True)
+        jumlah = np.bincount(balik, weights=bobot, minlength=len(sel))
+        banyak = np.bincount(balik, minlength=len(sel))
+
+    a, b = (sel // lebar + a0).astype(float), (sel % lebar + b0).astype(float)
+    if bentuk == "hex":
+        cx, cy = np.sqrt(3) * (a + b / 2), 1.5 * b
+    else:
+        cx, cy = a + 0.5, b + 0.5
+    return pd.DataFrame({
+        'latitude': cy * ukuran,
+        'longitude': cx * ukuran / skala,
+        'jumlah': jumlah,
+        'jumlah_titik': banyak,
+    })[kolom]
+
+
+def bin_bertingkat(lon, lat, bobot=None, ukuran=(0.2, 0.05, 0.0125),
+                   batas_sel: int = 2000, bentuk: str = "hex") -> list:
+    """Binning pada beberapa resolusi (kasar -> halus) dengan batas jumlah sel.
+
+    Resolusi yang menghasilkan sel melebihi `batas_sel` diperkasar sampai
+    muat, sehingga ukuran payload peta tidak bergantung pada jumlah titik.
+    Mengembalikan list (ukuran sel akhir, DataFrame sel).
+    """
+    hasil = []
+    for u in ukuran:
+        grid = bin_titik(lon, lat, bobot, u, bentuk)
+        while len(grid) > batas_sel:
+            # Jumlah sel ~ 1/ukuran², perbesar sel sebanding akar rasio (+10% cadangan)
+            u *= np.sqrt(len(grid) / batas_sel) * 1.1
+            grid = bin_titik(lon, lat, bobot, u, bentuk)
+        hasil.append((u, grid))
+    return hasil
+
+
+def _cari_properti(data: dict, cocok):
+    """Properti feature yang paling banyak nilainya memenuhi `cocok`, atau None"""
+    skor = {}
+    for f in data['features']:
+        for k, v in (f.get('properties') or {}).items():
+            if cocok(v):
+                skor[k] = skor.get(k, 0) + 1
+    return max(skor, key=skor.get) if skor else None
+
+
+def tabel_wilayah(data: dict, properti_nama: str = None, properti_kode: str = None) -> pd.DataFrame:
+    """Kode, nama & centroid setiap feature (urutan features GeoJSON).
+
+    Properti yang tidak disebutkan dicari otomatis: properti yang nilainya
+    paling banyak cocok dengan kode / nama di registri koordinat. Bila
+    GeoJSON tidak memuat kode, kode dicocokkan dari nama (tanpa membedakan
+    huruf besar/kecil); feature yang tidak dikenali berkode NA.
+    """
+    referensi = koordinat.muat_koordinat()
+    kode_ref = dict(zip(referensi['kode_kabupaten_kota'].astype(int), referensi['nama_kabupaten_kota']))
+    nama_ref = {n.lower(): k for k, n in kode_ref.items()}
+    if properti_kode is None:
+        properti_kode = _cari_properti(data, lambda v: str(v).strip().isdigit() and int(v) in kode_ref)
+    if properti_nama is None:
+        properti_nama = _cari_properti(data, lambda v: isinstance(v, str) and v.strip().lower() in nama_ref)
+    if properti_kode is None and properti_nama is None:
+        raise ValueError("Properti nama/kode wilayah tidak ditemukan di GeoJSON (isi --properti-nama)")
+
+    df = centroid_geojson(data)
+    if properti_kode is not None:
+        kode = pd.to_numeric(df[properti_kode], errors='coerce').astype('Int64')
+    else:
+        kode = df[properti_nama].astype(str).str.strip().str.lower().map(nama_ref).astype('Int64')
+    if properti_nama is not None:
+        nama = df[properti_nama].astype(str).str.strip().str.title()
+    else:
+        nama = kode.map(kode_ref)
+    return pd.DataFrame({
+        'kode_kabupaten_kota': kode,
+        'nama_kabupaten_kota': nama,
+        'latitude': df['latitude'],
+        'longitude': df['longitude'],
+    })
+
+
+def registri_dari_geojson(data: dict, properti_nama: str = None, properti_kode: str = None) -> pd.DataFrame:
+    """Registri koordinat (format koordinat.py) dari centroid GeoJSON"""
+    df = tabel_wilayah(data, properti_nama, properti_kode)
+    tanpa = df.loc[df['kode_kabupaten_kota'].isna(), 'nama_kabupaten_kota'].astype(str).tolist()
+    if tanpa:
+        print(f"- Nama Wilayah Tanpa Kode (Dilewati): {', '.join(tanpa)}")
+    df = df.dropna(subset=['kode_kabupaten_kota']).astype({'kode_kabupaten_kota': 'int64'})
+    return df.sort_values('kode_kabupaten_kota').reset_index(drop=True)
+
+
+# Cache per proses: (path GeoJSON, mtime, path registri, mtime) -> registri gabungan
+_cache_registri = {}
+
+
+def registri_koordinat(path_geojson: str = batas_wilayah.PATH_GEOJSON,
+                       path: str = koordinat.PATH_KOORDINAT) -> pd.DataFrame:
+    """Registri koordinat dengan centroid batas wilayah bila GeoJSON ada di cache lokal.
+
+    Wilayah yang tidak ditemukan di GeoJSON tetap memakai titik registri
+    CSV. Tanpa cache GeoJSON (tidak diunduh di sini) atau bila gagal
+    dibaca, registri CSV dipakai apa adanya. attrs['sumber'] mencatat
+    asal koordinat.
+    """
+    csv = koordinat.muat_koordinat(path)
+    if not os.path.exists(path_geojson):
+        hasil = csv.copy()
+        hasil.attrs['sumber'] = "Registri CSV"
+        return hasil
+
+    key = (os.path.abspath(path_geojson), os.stat(path_geojson).st_mtime_ns,
+           os.path.abspath(path), os.stat(path).st_mtime_ns)
+    if key not in _cache_registri:
+        try:
+            # Geometri resolusi penuh (tanpa penyederhanaan) agar centroid akurat
+            data = batas_wilayah.muat_batas(path_geojson, toleransi=0, presisi=6, unduh=False)
+            geo = registri_dari_geojson(data)
+            sisa = csv[~csv['kode_kabupaten_kota'].astype(int).isin(geo['kode_kabupaten_kota'])]
+            hasil = (pd.concat([geo, sisa], ignore_index=True).astype(koordinat.DTYPE_KOORDINAT)
+                     .sort_values('kode_kabupaten_kota').reset_index(drop=True))
+            koordinat.validasi_koordinat(hasil)
+            hasil.attrs['sumber'] = f"Centroid Batas Wilayah ({len(geo)} dari GeoJSON, {len(sisa)} dari CSV)"
+        except Exception as e:
+            print(f"- Gagal Menghitung Centroid dari GeoJSON ({e}), Memakai Registri CSV")
+            hasil = csv.copy()
+            hasil.attrs['sumber'] = "Registri CSV"
+        _cache_registri[key] = hasil
+    return _cache_registri[key]
+
+
+def tetapkan_wilayah(df_titik: pd.DataFrame, data: dict, properti_nama: str = None,
+                     properti_kode: str = None) -> pd.DataFrame:
+    """Menambahkan kode_kabupaten_kota & nama_kabupaten_kota wilayah tempat setiap titik berada.
+
+    Titik di luar semua wilayah (atau di wilayah tanpa kode) bernilai NA.
+    """
+    wilayah = tabel_wilayah(data, properti_nama, properti_kode)
+    w = IndeksSpasial(data).tetapkan(df_titik['longitude'], df_titik['latitude'])
+    return df_titik.reset_index(drop=True).assign(
+        kode_kabupaten_kota=wilayah['kode_kabupaten_kota'].reindex(w).array,
+        nama_kabupaten_kota=wilayah['nama_kabupaten_kota'].reindex(w).array,
+    )
+
+
+def jumlah_per_wilayah(df_titik: pd.DataFrame) -> pd.DataFrame:
+    """Jumlah titik (dan jumlah_kelahiran bila ada) per kabupaten/kota hasil tetapkan_wilayah"""
+    ukuran = {'jumlah_titik': ('kode_kabupaten_kota', 'size')}
+    if 'jumlah_kelahiran' in df_titik.columns:
+        ukuran['jumlah_kelahiran'] = ('jumlah_kelahiran', 'sum')
+    return (
+        df_titik.dropna(subset=['kode_kabupaten_kota'])
+        .groupby(['kode_kabupaten_kota', 'nama_kabupaten_kota'], dropna=False)
+        .agg(**ukuran)
+        .reset_index()
+    )
+
+
+def main_tetapkan(args) -> None:
+    """Jalur --tetapkan: titik dari CSV ditetapkan ke kabupaten/kota lalu disimpan"""
+    output = args.output or f"{os.path.splitext(args.tetapkan)[0]}_per_wilayah.csv"
+    print()
+    print("--------------------------------------")
+    print("Proses Penetapan Titik ke Kabupaten/Kota")
+    print("--------------------------------------")
+    try:
+        df_titik = pd.read_csv(args.tetapkan)
+        print(f"- Berhasil Membaca File : {args.tetapkan} ({len(df_titik):,} Titik) ✓")
+        data = batas_wilayah.muat_batas(args.geojson, toleransi=0, presisi=6)
+        df_titik = tetapkan_wilayah(df_titik, data, args.properti_nama, args.properti_kode)
+        luar = int(df_titik['kode_kabupaten_kota'].isna().sum())
+        print(f"- {len(df_titik) - luar:,} Titik Ditetapkan ke Kabupaten/Kota ({luar:,} di Luar Wilayah) ✓")
+
+        df_wilayah = jumlah_per_wilayah(df_titik)
+        print()
+        print("------------------------------------------------------------------")
+        print(f"{'Kode':<6} {'Kabupaten/Kota':<30} {'Titik':>10} {'Jumlah':>15}")
+        print("------------------------------------------------------------------")
+        for _, row in df_wilayah.iterrows():
+            jumlah = row['jumlah_kelahiran'] if 'jumlah_kelahiran' in row else row['jumlah_titik']
+            print(f"{row['kode_kabupaten_kota']:<6} {str(row['nama_kabupaten_kota']):<30} "
+                  f"{row['jumlah_titik']:>10,} {int(jumlah):>15,}")
+        print("------------------------------------------------------------------")
+
+        (df_wilayah if args.agregat else df_titik).to_csv(output, index=False)
+        print(f"- {'Agregat per Wilayah' if args.agregat else 'Titik Beserta Wilayahnya'} Berhasil Disimpan di: {output} ✓")
+    except Exception as e:
+        print(f"- Gagal Membaca file : {args.tetapkan} : {e}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Registri koordinat dari centroid GeoJSON batas wilayah, atau penetapan titik ke kabupaten/kota")
+    parser.add_argument("--geojson", default=batas_wilayah.PATH_GEOJSON, help="File GeoJSON batas wilayah")
+    parser.add_argument("--properti-nama", default=None,
+                        help="Nama properti GeoJSON berisi nama wilayah (default: dicari otomatis)")
+    parser.add_argument("--properti-kode", default=None,
+                        help="Nama properti GeoJSON berisi kode wilayah (default: dicari otomatis)")
+    parser.add_argument("--tetapkan", default=None, metavar="CSV",
+                        help="CSV titik (longitude, latitude, opsional jumlah_kelahiran) yang ditetapkan ke kabupaten/kota")
+    parser.add_argument("--agregat", action="store_true",
+                        help="Dengan --tetapkan: simpan jumlah per kabupaten/kota, bukan per titik")
+    parser.add_argument("--output", default=None,
+                        help="File output (default: registri koordinat, atau <CSV>_per_wilayah.csv untuk --tetapkan)")
+    args = parser.parse_args(argv)
+    if args.tetapkan:
+        main_tetapkan(args)
+        return
+    output = args.output or koordinat.PATH_KOORDINAT
+
+    print()
+    print("----------------------------------")
+    print("Proses Centroid Wilayah (GeoJSON)")
+    print("----------------------------------")
+    try:
+        # Geometri resolusi penuh (tanpa penyederhanaan) agar centroid akurat
+        data = batas_wilayah.muat_batas(args.geojson, toleransi=0, presisi=6)
+        registri = registri_dari_geojson(data, args.properti_nama, args.properti_kode)
+        koordinat.validasi_koordinat(registri)
+        registri.to_csv(output, index=False, float_format="%.6f")
+        print(f"- Centroid {len(registri)} Wilayah Berhasil Disimpan di: {output} ✓")
+    except Exception as e:
+        print(f"- Gagal Membaca file : {args.geojson} : {e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,143 +5,133 @@
 # Import Library
 import pandas as pd
 import folium
-from folium.plugins import HeatMap
+from folium.plugins import HeatMap, HeatMapWithTime
 import os
+import argparse
 import numpy as np
-import requests
+from branca.element import MacroElement
+from jinja2 import Template
+import dataset
+import kubus
+import batas_wilayah
+import koordinat
+import spasial
+import instrumentasi
 
 # Path dataset
-path = "./final_dataset/dataset_kelahiran_jawabarat_2012-2023.csv"
-
-print()
-print("----------------------")
-print("Proses Pencarian File ")
-print("----------------------")
-if not os.path.exists(path):
-    print(f"- File Tidak Ditemukan : {path}")
-else:
-    print(f"- File Ditemukan : {path}")
-
-# Membaca file
-print()
-print("----------------------")
-print("Proses Membaca File ")
-print("----------------------")
-
-try:
-    # Membaca dataset
-    df = pd.read_csv(path)
-    print(f"- Berhasil Membaca File : {path} ✓")
-
-    # Koordinat pusat setiap Kabupaten/Kota di Jawa Barat
-    lokasi = {
-        'Kabupaten Bogor': (-6.479679, 106.824965),
-        'Kabupaten Sukabumi': (-6.915727, 106.932576),
-        'Kabupaten Cianjur': (-6.822558, 107.139542),
-        'Kabupaten Bandung': (-7.012851, 107.528627),
-        'Kabupaten Garut': (-7.202988, 107.885592),
-        'Kabupaten Tasikmalaya': (-7.361212, 108.112488),
-        'Kabupaten Ciamis': (-7.325788, 108.3514),
-        'Kabupaten Kuningan': (-6.976233, 108.482982),
-        'Kabupaten Cirebon': (-6.764507, 108.478858),
-        'Kabupaten Majalengka': (-6.8361, 108.2270),
-        'Kabupaten Sumedang': (-6.8607, 107.9201),
-        'Kabupaten Indramayu': (-6.337707, 108.320823),
-        'Kabupaten Subang': (-6.571549, 107.762495),
-        'Kabupaten Purwakarta': (-6.551701, 107.446541),
-        'Kabupaten Karawang': (-6.301721, 107.30529),
-        'Kabupaten Bekasi': (-6.364614, 107.172509),
-        'Kabupaten Bandung Barat': (-6.840651, 107.512302),
-        'Kabupaten Pangandaran': (-7.701397, 108.495155),
-        'Kota Bogor': (-6.594946, 106.794913),
-        'Kota Sukabumi': (-6.918366, 106.931496),
-        'Kota Bandung': (-6.910786, 107.609757),
-        'Kota Cirebon': (-6.707076, 108.557818),
-        'Kota Bekasi': (-6.236221, 106.994293),
-        'Kota Depok': (-6.394473, 106.822692),
-        'Kota Cimahi': (-6.87121, 107.555486),
-        'Kota Tasikmalaya': (-7.316436, 108.1971),
-        'Kota Banjar': (-7.362487, 108.55887),
-    }
-
-    # Tambahkan kolom latitude & longitude berdasarkan nama wilayah
-    df['latitude'] = df['nama_kabupaten_kota'].map(lambda x: lokasi.get(x, (-6.9, 107.6))[0])
-    df['longitude'] = df['nama_kabupaten_kota'].map(lambda x: lokasi.get(x, (-6.9, 107.6))[1])
-
-    # Cek wilayah yang berhasil dipetakan
-    mapped = df['nama_kabupaten_kota'].isin(lokasi.keys()).sum()
-    print(f"- Wilayah Berhasil Dipetakan: {mapped} dari {df['nama_kabupaten_kota'].nunique()} ✓")
-
-    # Filter tahun 2012–2023
-    print()
-    print("----------------------------------------------")
-    print("Proses Analisis Persebaran Geografis Kelahiran")
-    print("----------------------------------------------")
-    df_filter = df[df['tahun'].between(2012, 2023)]
-    print(f"- Filter Berdasarkan Tahun ✓")
+path = dataset.PATH_DATASET
+# Kolom yang dibaca bila sumber berupa dataset baris (CSV/Parquet)
+KOLOM = ['kode_kabupaten_kota', 'nama_kabupaten_kota', 'jumlah_kelahiran']
+output_path = "./visualisasi/heatmap_kelahiran_jawabarat_2012-2023.html"
+output_path_tahunan = "./visualisasi/heatmap_kelahiran_per_tahun_jawabarat_2012-2023.html"
+output_path_titik = "./visualisasi/heatmap_kelahiran_titik_jawabarat.html"
+output_path_titik_wilayah = "./visualisasi/heatmap_kelahiran_titik_per_wilayah_jawabarat.html"
+
+# Data tingkat titik (fasilitas/kecamatan) di-binning ke grid sebelum dikirim ke browser:
+# zoom minimum -> ukuran sel (derajat), & batas jumlah sel per layer
+RESOLUSI_TITIK = {0: 0.2, 9: 0.05, 11: 0.0125}
+BATAS_SEL = 2000
+
+
+def tambah_koordinat(df_wilayah: pd.DataFrame) -> pd.DataFrame:
+    """Menambahkan kolom latitude & longitude (berdasarkan kode wilayah).
 
-    # Kelompokkan data berdasarkan wilayah
+    Koordinat = centroid batas wilayah bila GeoJSON ada di cache lokal,
+    selain itu registri koordinat CSV (lihat spasial.registri_koordinat).
+    """
+    registri = spasial.registri_koordinat()
+    dipetakan, tanpa = koordinat.gabung_koordinat(df_wilayah, registri=registri)
+    dipetakan.attrs['sumber_koordinat'] = registri.attrs['sumber']
+    dipetakan.attrs['tanpa_koordinat'] = tanpa['nama_kabupaten_kota'].astype(str).tolist()
+    if len(tanpa):
+        print(f"- Wilayah Tanpa Koordinat (Tidak Dipetakan): {', '.join(dipetakan.attrs['tanpa_koordinat'])}")
+    return dipetakan
+
+
+def hitung_total_per_wilayah(sumber) -> pd.DataFrame:
+    """Total kelahiran per wilayah beserta koordinatnya, terurut dari yang terbesar"""
+    df_geo = tambah_koordinat(kubus.jumlah(sumber, ['kode_kabupaten_kota', 'nama_kabupaten_kota']))
+    atribut = dict(df_geo.attrs)
     df_geo = (
-        df_filter.groupby(['nama_kabupaten_kota', 'latitude', 'longitude'])['jumlah_kelahiran']
-        .sum()
-        .reset_index()
+        df_geo[['nama_kabupaten_kota', 'latitude', 'longitude', 'jumlah_kelahiran']]
         .sort_values('jumlah_kelahiran', ascending=False)
     )
-    print(f"- Mengelompokkan Data Kelahiran per Wilayah dengan Koordinat ✓")
+    df_geo.attrs.update(atribut)
+    return df_geo
 
-    # -------------------------------------------------------------
-    # Tampilkan seluruh hasil (27 kabupaten/kota)
-    # -------------------------------------------------------------
-    print()
-    print("--------------------------------------------------------------------------")
-    print(f"{'Kabupaten/Kota':<30} {'Latitude':>10} {'Longitude':>12} {'Total Kelahiran':>20}")
-    print("--------------------------------------------------------------------------")
 
-    for _, row in df_geo.iterrows():
-        print(f"{row['nama_kabupaten_kota']:<30} {row['latitude']:>10.4f} {row['longitude']:>12.4f} {int(row['jumlah_kelahiran']):>20,}")
+def hitung_per_tahun(sumber) -> pd.DataFrame:
+    """Matriks kelahiran wilayah × tahun (satu group-by) beserta koordinat wilayah"""
+    pivot = (
+        kubus.jumlah(sumber, ['kode_kabupaten_kota', 'nama_kabupaten_kota', 'tahun'])
+        .pivot_table(index=['kode_kabupaten_kota', 'nama_kabupaten_kota'], columns='tahun',
+                     values='jumlah_kelahiran', aggfunc='sum', fill_value=0, observed=True)
+    )
+    pivot.columns = pivot.columns.astype(int)
+    pivot = pivot.reset_index()
+    pivot['nama_kabupaten_kota'] = pivot['nama_kabupaten_kota'].astype(str)
+    return tambah_koordinat(pivot).drop(columns='kode_kabupaten_kota').set_index('nama_kabupaten_kota')
 
-    print("--------------------------------------------------------------------------")
 
-    # Cari wilayah tertinggi dan terendah
-    kota_max = df_geo.loc[df_geo['jumlah_kelahiran'].idxmax(), 'nama_kabupaten_kota']
-    kota_min = df_geo.loc[df_geo['jumlah_kelahiran'].idxmin(), 'nama_kabupaten_kota']
-    max_val = df_geo['jumlah_kelahiran'].max()
-    min_val = df_geo['jumlah_kelahiran'].min()
+def tambah_batas_wilayah(m: folium.Map) -> None:
+    """Menambahkan garis batas kabupaten/kota dari GeoJSON (cache lokal, disederhanakan) ke peta"""
+    try:
+        data_geojson = batas_wilayah.muat_batas()
+        folium.GeoJson(
+            data_geojson,
+            name="Batas Wilayah Jawa Barat",
+            style_function=lambda x: {
+                'fillColor': 'none',
+                'color': 'green',
+                'weight': 3,
+                'opacity': 0.6
+            }
+        ).add_to(m)
+        print(f"- Garis Batas Wilayah Jawa Barat Berhasil Ditambahkan ({batas_wilayah.jumlah_titik(data_geojson):,} Titik) ✓")
 
-    print(f"- Wilayah dengan Kelahiran Tertinggi : {kota_max} ({max_val:,}) ✓")
-    print(f"- Wilayah dengan Kelahiran Terendah  : {kota_min} ({min_val:,}) ✓")
-    print(f"- Total Wilayah Tercakup: {len(df_geo)} Kabupaten/Kota ✓")
+    except Exception as e:
+        print(f"- Gagal Menambahkan Garis Batas Wilayah: {e}")
 
-    # -----------------------
-    # VISUALISASI HEATMAP
-    # -----------------------
-    print()
-    print("------------------------------------")
-    print("Proses Visualisasi Heatmap Geografis ")
-    print("------------------------------------")
 
+def gambar_peta(df_geo: pd.DataFrame,
+                judul: str = "Peta Heatmap Intensitas Kelahiran di Jawa Barat (2012–2023)") -> folium.Map:
+    """Peta heatmap + marker tooltip + garis batas wilayah"""
     # Buat peta dasar
     m = folium.Map(location=[-6.9, 107.6], zoom_start=8, tiles="cartodbpositron")
     print("- Membuat Canvas Peta Jawa Barat ✓")
 
     # Gunakan intensitas dinamis berdasarkan jumlah kelahiran
-    heat_data = [
-        [row['latitude'], row['longitude'], row['jumlah_kelahiran'] / 10000]
-        for _, row in df_geo.iterrows()
-    ]
+    heat_data = np.column_stack([
+        df_geo['latitude'].to_numpy(dtype=float),
+        df_geo['longitude'].to_numpy(dtype=float),
+        df_geo['jumlah_kelahiran'].to_numpy(dtype=float) / 10000,
+    ]).tolist()
     HeatMap(heat_data, radius=40, blur=25, max_zoom=10, min_opacity=0.4).add_to(m)
     print("- Menambahkan Layer HeatMap ke Peta ✓")
 
-    # Tambahkan marker tooltip interaktif
-    for _, row in df_geo.iterrows():
-        folium.CircleMarker(
-            location=[row['latitude'], row['longitude']],
-            radius=4,
-            color='green',
-            fill=True,
-            fill_opacity=0.7,
-            tooltip=f"<b>{row['nama_kabupaten_kota']}</b><br>Total Kelahiran: {int(row['jumlah_kelahiran']):,}"
-        ).add_to(m)
+    _lengkapi_peta(m, df_geo, judul)
+    return m
+
+
+def _lengkapi_peta(m: folium.Map, df_geo: pd.DataFrame, judul: str) -> None:
+    """Marker tooltip total per wilayah, garis batas wilayah & judul peta"""
+    # Tambahkan marker tooltip interaktif (satu layer GeoJSON titik untuk semua wilayah)
+    tooltip = (
+        "<b>" + df_geo['nama_kabupaten_kota'].astype(str) + "</b><br>Total Kelahiran: "
+        + df_geo['jumlah_kelahiran'].astype('int64').map("{:,}".format)
+    )
+    titik = [
+        {'type': 'Feature',
+         'geometry': {'type': 'Point', 'coordinates': [lon, lat]},
+         'properties': {'tooltip': t}}
+        for lat, lon, t in zip(df_geo['latitude'].tolist(), df_geo['longitude'].tolist(), tooltip.tolist())
+    ]
+    folium.GeoJson(
+        {'type': 'FeatureCollection', 'features': titik},
+        name="Kabupaten/Kota",
+        marker=folium.CircleMarker(radius=4, color='green', fill=True, fill_opacity=0.7),
+        tooltip=folium.GeoJsonTooltip(fields=['tooltip'], labels=False),
+    ).add_to(m)
     print("- Menambahkan Tooltip Kabupaten/Kota ✓")
 
     # -------------------------------
@@ -151,47 +141,322 @@ try:
     print("----------------------------")
     print("Menambahkan Garis Batas Wilayah Jawa Barat")
     print("----------------------------")
+    tambah_batas_wilayah(m)
 
-    geojson_url = "https://github.com/hitamcoklat/Jawa-Barat-Geo-JSON/blob/master/Jabar_By_Kab.geojson?raw=true"
+    tambah_judul(m, judul)
 
-    try:
-        r = requests.get(geojson_url)
-        if r.status_code == 200:
-            data_geojson = r.json()
-            folium.GeoJson(
-                data_geojson,
-                name="Batas Wilayah Jawa Barat",
-                style_function=lambda x: {
-                    'fillColor': 'none',
-                    'color': 'green',
-                    'weight': 3,
-                    'opacity': 0.6
-                }
-            ).add_to(m)
-            print("- Garis Batas Wilayah Jawa Barat Berhasil Ditambahkan ✓")
-        else:
-            print(f"- Gagal Mengunduh GeoJSON (Status {r.status_code})")
-
-    except Exception as e:
-        print(f"- Gagal Menambahkan Garis Batas Wilayah: {e}")
 
+def tambah_judul(m: folium.Map, judul: str) -> None:
     # Tambahkan judul peta
-    title_html = '''
-        <h3 align="center" style="font-size:16px"><b>Peta Heatmap Intensitas Kelahiran di Jawa Barat (2012–2023)</b></h3>
+    title_html = f'''
+        <h3 align="center" style="font-size:16px"><b>{judul}</b></h3>
     '''
     m.get_root().html.add_child(folium.Element(title_html))
     print("- Menambahkan Judul Peta ✓")
 
-    # Simpan hasil peta
-    output_path = "./visualisasi/heatmap_kelahiran_jawabarat_2012-2023.html"
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    m.save(output_path)
-    print(f"- Peta Heatmap Berhasil Disimpan di: {output_path} ✓")
 
+def gambar_peta_tahunan(df_tahun: pd.DataFrame) -> folium.Map:
+    """Peta heatmap per tahun (slider tahun) dari matriks wilayah × tahun.
+
+    Seluruh lapisan tahun dibentuk sekaligus dari matriks NumPy
+    (koordinat × intensitas) lalu diserialisasi satu kali; marker &
+    garis batas wilayah hanya ditambahkan sekali untuk semua tahun.
+    """
+    m = folium.Map(location=[-6.9, 107.6], zoom_start=8, tiles="cartodbpositron")
+    print("- Membuat Canvas Peta Jawa Barat ✓")
+
+    tahun = [c for c in df_tahun.columns if isinstance(c, (int, np.integer))]
+    jumlah = df_tahun[tahun].to_numpy(dtype=float)
+    koordinat = df_tahun[['latitude', 'longitude']].to_numpy(dtype=float)
+
+    # Intensitas dinormalisasi terhadap nilai tertinggi semua tahun agar antar-tahun sebanding
+    puncak = jumlah.max() if jumlah.size and jumlah.max() > 0 else 1.0
+    lapisan = np.concatenate(
+        [np.broadcast_to(koordinat[None, :, :], (len(tahun), len(koordinat), 2)),
+         (jumlah.T / puncak)[:, :, None]],
+        axis=2,
+    ).round(4)
+    HeatMapWithTime(
+        lapisan.tolist(),
+        index=[str(t) for t in tahun],
+        radius=40,
+        min_opacity=0.4,
+        max_opacity=0.8,
+        auto_play=False,
+    ).add_to(m)
+    print(f"- Menambahkan Layer HeatMap per Tahun ({len(tahun)} Tahun) ✓")
+
+    df_total = df_tahun[['latitude', 'longitude']].assign(jumlah_kelahiran=jumlah.sum(axis=1)).reset_index()
+    _lengkapi_peta(m, df_total, f"Peta Heatmap Kelahiran per Tahun di Jawa Barat ({tahun[0]}–{tahun[-1]})"
+                   if tahun else "Peta Heatmap Kelahiran per Tahun di Jawa Barat")
+    return m
+
+
+class _LapisanPerZoom(MacroElement):
+    """Hanya menampilkan layer heatmap yang sesuai tingkat zoom peta saat ini"""
+    _template = Template("""
+        {% macro script(this, kwargs) %}
+        (function() {
+            var peta = {{ this._parent.get_name() }};
+            var lapisan = [
+                {% for z0, z1, layer in this.lapisan %}[{{ z0 }}, {{ z1 }}, {{ layer.get_name() }}],
+                {% endfor %}
+            ];
+            function atur() {
+                var z = peta.getZoom();
+                lapisan.forEach(function(l) {
+                    var aktif = z >= l[0] && z < l[1];
+                    if (aktif && !peta.hasLayer(l[2])) { peta.addLayer(l[2]); }
+                    if (!aktif && peta.hasLayer(l[2])) { peta.removeLayer(l[2]); }
+                });
+            }
+            peta.on('zoomend', atur);
+            atur();
+        })();
+        {% endmacro %}
+    """)
+
+    def __init__(self, lapisan):
+        super().__init__()
+        self._name = "LapisanPerZoom"
+        self.lapisan = lapisan
+
+
+def gambar_peta_titik(df_titik: pd.DataFrame, bentuk: str = "hex") -> folium.Map:
+    """Peta heatmap data tingkat titik yang di-binning ke grid pada beberapa resolusi.
+
+    Titik dijumlahkan per sel heksagon/persegi dengan NumPy; tiap resolusi
+    dibatasi BATAS_SEL sel dan hanya tampil pada rentang zoom-nya, sehingga
+    ukuran HTML & beban browser tidak bergantung pada jumlah titik.
+    """
+    m = folium.Map(location=[-6.9, 107.6], zoom_start=8, tiles="cartodbpositron")
+    print("- Membuat Canvas Peta Jawa Barat ✓")
+
+    bobot = df_titik['jumlah_kelahiran'] if 'jumlah_kelahiran' in df_titik.columns else None
+    tingkat = spasial.bin_bertingkat(df_titik['longitude'], df_titik['latitude'], bobot,
+                                     ukuran=tuple(RESOLUSI_TITIK.values()),
+                                     batas_sel=BATAS_SEL, bentuk=bentuk)
+    zoom = list(RESOLUSI_TITIK) + [99]
+    lapisan = []
+    for i, (ukuran, grid) in enumerate(tingkat):
+        puncak = grid['jumlah'].max() if len(grid) and grid['jumlah'].max() > 0 else 1.0
+        heat_data = np.column_stack([
+            grid['latitude'].to_numpy(),
+            grid['longitude'].to_numpy(),
+            grid['jumlah'].to_numpy() / puncak,
+        ]).round(5).tolist()
+
+        # Radius (piksel) kira-kira selebar satu sel pada zoom terkecil layer ini
+        piksel = ukuran * 256 * 2 ** max(zoom[i], 7) / 360
+        layer = HeatMap(heat_data, name=f"Grid {ukuran:.4f}°", radius=int(np.clip(piksel, 8, 40)),
+                        blur=15, min_opacity=0.4)
+        layer.add_to(m)
+        lapisan.append((zoom[i], zoom[i + 1], layer))
+        print(f"- Menambahkan Layer Grid {ukuran:.4f}° ({len(grid):,} Sel) untuk Zoom ≥ {zoom[i]} ✓")
+    m.add_child(_LapisanPerZoom(lapisan))
+
+    print()
+    print("----------------------------")
+    print("Menambahkan Garis Batas Wilayah Jawa Barat")
+    print("----------------------------")
+    tambah_batas_wilayah(m)
+    tambah_judul(m, f"Peta Heatmap Kelahiran Tingkat Titik di Jawa Barat ({len(df_titik):,} Titik)")
+    return m
+
+
+def buat_peta(sumber) -> folium.Map:
+    """Membangun peta heatmap dari sumber data (kubus atau dataset) yang sudah difilter"""
+    return gambar_peta(hitung_total_per_wilayah(sumber))
+
+
+def buat_peta_tahunan(sumber) -> folium.Map:
+    """Membangun peta heatmap per tahun dari sumber data (kubus atau dataset) yang sudah difilter"""
+    return gambar_peta_tahunan(hitung_per_tahun(sumber))
+
+
+def main_titik(path_titik: str, bentuk: str = "hex", per_wilayah: bool = False) -> None:
+    """Heatmap dari file CSV data tingkat titik (kolom longitude, latitude, opsional jumlah_kelahiran).
+
+    Dengan `per_wilayah`, titik ditetapkan ke kabupaten/kota (point-in-polygon
+    terhadap GeoJSON batas wilayah) lalu dijumlahkan per kode wilayah.
+    """
     print()
-    print("--------------------------------------------")
-    print("Analisis dan Visualisasi Heatmap Geografis Selesai ✓")
-    print("--------------------------------------------")
+    print("----------------------")
+    print("Proses Membaca File ")
+    print("----------------------")
+    try:
+        with instrumentasi.tahap("Membaca File") as t:
+            df_titik = pd.read_csv(path_titik)
+            t.baris(keluar=df_titik)
+        print(f"- Berhasil Membaca File : {path_titik} ({len(df_titik):,} Titik) ✓")
+        if per_wilayah:
+            main_titik_per_wilayah(df_titik)
+            return
+
+        print()
+        print("-------------------------------------------")
+        print("Proses Visualisasi Heatmap Tingkat Titik ")
+        print("-------------------------------------------")
+        with instrumentasi.tahap("Visualisasi Heatmap Titik") as t:
+            t.baris(masuk=df_titik)
+            m = gambar_peta_titik(df_titik, bentuk)
+        with instrumentasi.tahap("Simpan Peta Titik"):
+            os.makedirs(os.path.dirname(output_path_titik), exist_ok=True)
+            m.save(output_path_titik)
+        print(f"- Peta Heatmap Titik Berhasil Disimpan di: {output_path_titik} ✓")
+
+    except Exception as e:
+        print(f"- Gagal Membaca file : {path_titik} : {e}")
+
+
+def main_titik_per_wilayah(df_titik: pd.DataFrame) -> None:
+    print()
+    print("--------------------------------------")
+    print("Proses Penetapan Titik ke Kabupaten/Kota")
+    print("--------------------------------------")
+    with instrumentasi.tahap("Penetapan Titik ke Wilayah") as t:
+        # Geometri resolusi penuh agar titik di dekat garis batas tidak salah wilayah
+        data_geojson = batas_wilayah.muat_batas(toleransi=0, presisi=6)
+        df_titik = spasial.tetapkan_wilayah(df_titik, data_geojson)
+        df_wilayah = spasial.jumlah_per_wilayah(df_titik)
+        t.baris(masuk=df_titik, keluar=df_wilayah)
+    luar = int(df_titik['kode_kabupaten_kota'].isna().sum())
+    print(f"- {len(df_titik) - luar:,} Titik Ditetapkan ke {len(df_wilayah)} Kabupaten/Kota ({luar:,} di Luar Wilayah) ✓")
+
+    if 'jumlah_kelahiran' not in df_wilayah.columns:
+        df_wilayah['jumlah_kelahiran'] = df_wilayah['jumlah_titik']
+    df_geo = tambah_koordinat(df_wilayah)
+    print(f"- Sumber Koordinat Wilayah: {df_geo.attrs['sumber_koordinat']} ✓")
+
+    print()
+    print("----------------------------------------------")
+    print("Proses Visualisasi Heatmap Titik per Wilayah ")
+    print("----------------------------------------------")
+    with instrumentasi.tahap("Visualisasi Heatmap Titik per Wilayah"):
+        m = gambar_peta(df_geo, f"Peta Heatmap Kelahiran Tingkat Titik per Kabupaten/Kota di Jawa Barat "
+                                f"({len(df_titik) - luar:,} Titik)")
+    with instrumentasi.tahap("Simpan Peta Titik per Wilayah"):
+        os.makedirs(os.path.dirname(output_path_titik_wilayah), exist_ok=True)
+        m.save(output_path_titik_wilayah)
+    print(f"- Peta Heatmap Titik per Wilayah Berhasil Disimpan di: {output_path_titik_wilayah} ✓")
+
+
+@instrumentasi.run("visualisasi_heatmap_kelahiran")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Heatmap geografis kelahiran Jawa Barat")
+    parser.add_argument("--titik", default=None,
+                        help="CSV data tingkat titik (longitude, latitude, jumlah_kelahiran) untuk heatmap grid")
+    parser.add_argument("--bentuk", choices=["hex", "persegi"], default="hex", help="Bentuk sel grid --titik")
+    parser.add_argument("--per-wilayah", action="store_true",
+                        help="Dengan --titik: tetapkan titik ke kabupaten/kota lalu petakan total per wilayah")
+    args = parser.parse_args(argv)
+    if args.titik:
+        main_titik(args.titik, args.bentuk, args.per_wilayah)
+        return
+
+    print()
+    print("----------------------")
+    print("Proses Pencarian File ")
+    print("----------------------")
+    if not os.path.exists(path):
+        print(f"- File Tidak Ditemukan : {path}")
+    else:
+        print(f"- File Ditemukan : {path}")
+
+    # Membaca file
+    print()
+    print("----------------------")
+    print("Proses Membaca File ")
+    print("----------------------")
+
+    try:
+        # Membaca dataset
+        with instrumentasi.tahap("Membaca File") as t:
+            sumber = kubus.muat_sumber(path, 2012, 2023, kolom=KOLOM)
+            t.baris(keluar=sumber)
+        print(f"- Berhasil Membaca File : {kubus.PATH_KUBUS if isinstance(sumber, kubus.Kubus) else path} ✓")
+
+        # Filter tahun 2012–2023
+        print()
+        print("----------------------------------------------")
+        print("Proses Analisis Persebaran Geografis Kelahiran")
+        print("----------------------------------------------")
+        # (rentang tahun sudah diterapkan oleh kubus.muat_sumber)
+        print(f"- Filter Berdasarkan Tahun ✓")
+
+        # Kelompokkan data berdasarkan wilayah (koordinat ditambahkan ke hasil agregasi)
+        with instrumentasi.tahap("Grouping Per Wilayah") as t:
+            df_geo = hitung_total_per_wilayah(sumber)
+            t.baris(masuk=sumber, keluar=df_geo)
+        print(f"- Mengelompokkan Data Kelahiran per Wilayah dengan Koordinat ✓")
+        print(f"- Sumber Koordinat Wilayah: {df_geo.attrs['sumber_koordinat']} ✓")
+
+        # Cek wilayah yang berhasil dipetakan
+        tanpa = df_geo.attrs['tanpa_koordinat']
+        print(f"- Wilayah Berhasil Dipetakan: {len(df_geo)} dari {len(df_geo) + len(tanpa)} ✓")
+
+        # -------------------------------------------------------------
+        # Tampilkan seluruh hasil (27 kabupaten/kota)
+        # -------------------------------------------------------------
+        print()
+        print("--------------------------------------------------------------------------")
+        print(f"{'Kabupaten/Kota':<30} {'Latitude':>10} {'Longitude':>12} {'Total Kelahiran':>20}")
+        print("--------------------------------------------------------------------------")
+
+        for _, row in df_geo.iterrows():
+            print(f"{row['nama_kabupaten_kota']:<30} {row['latitude']:>10.4f} {row['longitude']:>12.4f} {int(row['jumlah_kelahiran']):>20,}")
+
+        print("--------------------------------------------------------------------------")
+
+        # Cari wilayah tertinggi dan terendah
+        kota_max = df_geo.loc[df_geo['jumlah_kelahiran'].idxmax(), 'nama_kabupaten_kota']
+        kota_min = df_geo.loc[df_geo['jumlah_kelahiran'].idxmin(), 'nama_kabupaten_kota']
+        max_val = df_geo['jumlah_kelahiran'].max()
+        min_val = df_geo['jumlah_kelahiran'].min()
+
+        print(f"- Wilayah dengan Kelahiran Tertinggi : {kota_max} ({max_val:,}) ✓")
+        print(f"- Wilayah dengan Kelahiran Terendah  : {kota_min} ({min_val:,}) ✓")
+        print(f"- Total Wilayah Tercakup: {len(df_geo)} Kabupaten/Kota ✓")
+
+        # -----------------------
+        # VISUALISASI HEATMAP
+        # -----------------------
+        print()
+        print("------------------------------------")
+        print("Proses Visualisasi Heatmap Geografis ")
+        print("------------------------------------")
+
+        with instrumentasi.tahap("Visualisasi Heatmap"):
+            m = gambar_peta(df_geo)
+
+        # Simpan hasil peta
+        with instrumentasi.tahap("Simpan Peta"):
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            m.save(output_path)
+        print(f"- Peta Heatmap Berhasil Disimpan di: {output_path} ✓")
+
+        # -----------------------
+        # VISUALISASI HEATMAP PER TAHUN
+        # -----------------------
+        print()
+        print("---------------------------------------------")
+        print("Proses Visualisasi Heatmap Geografis per Tahun")
+        print("---------------------------------------------")
+
+        with instrumentasi.tahap("Visualisasi Heatmap per Tahun"):
+            m_tahunan = buat_peta_tahunan(sumber)
+        with instrumentasi.tahap("Simpan Peta per Tahun"):
+            m_tahunan.save(output_path_tahunan)
+        print(f"- Peta Heatmap per Tahun Berhasil Disimpan di: {output_path_tahunan} ✓")
+
+        print()
+        print("--------------------------------------------")
+        print("Analisis dan Visualisasi Heatmap Geografis Selesai ✓")
+        print("--------------------------------------------")
+
+    except Exception as e:
+        print(f"- Gagal Membaca file : {path} : {e}")
+
 
-except Exception as e:
-    print(f"- Gagal Membaca file : {path} : {e}")
+if __name__ == "__main__":
+    main()
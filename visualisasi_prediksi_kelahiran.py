@@ -7,129 +7,464 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import os
-from statsmodels.tsa.arima.model import ARIMA
-from sklearn.metrics import mean_absolute_error, mean_squared_error
+import argparse
+import time
+from sklearn.metrics import mean_absolute_error, mean_squared_error, mean_absolute_percentage_error
 import numpy as np
+import dataset
+import kubus
+import peramalan
+import artefak
+import model_cepat
+import bootstrap
+import rekonsiliasi
+import instrumentasi
 
 # Path dataset
-path = "./final_dataset/dataset_kelahiran_jawabarat_2012-2023.csv"
-
-print()
-print("----------------------")
-print("Proses Pencarian File ")
-print("----------------------")
-if not os.path.exists(path):
-    print(f"- File Tidak Ditemukan : {path}")
-else:
-    print(f"- File Ditemukan : {path}")
-
-# Membaca File
-print()
-print("----------------------")
-print("Proses Membaca File ")
-print("----------------------")
-
-try:
-    df = pd.read_csv(path)
-    print(f"- Berhasil Membaca File : {path} ✓")
-
-    # Filter tahun 2012–2023
-    print()
-    print("--------------------------------------------")
-    print("Proses Analisis Deret Waktu (Time Series) ")
-    print("--------------------------------------------")
-    df_filter = df[df['tahun'].between(2012, 2023)]
-    print(f"- Filter Berdasarkan Tahun ✓")
+path = dataset.PATH_DATASET
+# Kolom yang dibaca bila sumber berupa dataset baris (CSV/Parquet)
+KOLOM = ['tahun', 'jumlah_kelahiran']
+output_path = "./visualisasi/prediksi_kelahiran_{model}_2024-2025.png"
+output_path_segmen = "./visualisasi/prediksi_kelahiran_{model}_per_segmen_2024-2025.csv"
+output_path_backtest = "./visualisasi/backtest_prediksi_kelahiran.csv"
+output_path_rekonsiliasi = "./visualisasi/prediksi_kelahiran_{model}_rekonsiliasi_2024-2025.csv"
+
 
-    # Agregasi total per tahun
+def hitung_total_tahunan(sumber) -> pd.DataFrame:
+    """Total kelahiran per tahun dengan tahun sebagai index (untuk ARIMA)"""
     df_tahunan = (
-        df_filter.groupby('tahun')['jumlah_kelahiran']
-        .sum()
-        .reset_index()
+        kubus.jumlah(sumber, ['tahun'])
         .sort_values('tahun')
     )
-    print("- Menghitung Total Kelahiran per Tahun ✓")
-
-    # Set kolom tahun sebagai index (untuk ARIMA)
     df_tahunan.set_index('tahun', inplace=True)
-    series = df_tahunan['jumlah_kelahiran']
+    return df_tahunan
 
-    print()
-    print("-------------------------------")
-    print("Proses Pembuatan Model ARIMA")
-    print("-------------------------------")
-
-    # Inisialisasi model ARIMA
-    model = ARIMA(series, order=(1,1,1))  # p,d,q = 1,1,1 (model umum untuk tren)
-    model_fit = model.fit()
-    print("- Model ARIMA(1,1,1) Berhasil Dibentuk ✓")
-
-    # Lakukan prediksi ke depan (2 tahun: 2024–2025)
-    forecast = model_fit.forecast(steps=2)
-    tahun_prediksi = [2024, 2025]
-    hasil_prediksi = pd.DataFrame({
-        'Tahun': tahun_prediksi,
-        'Prediksi_Kelahiran': forecast.astype(int)
+
+def ramal_arima(series: pd.Series, langkah: int = 2, order=peramalan.ORDER,
+                paksa: bool = False) -> pd.DataFrame:
+    """Prediksi ARIMA `langkah` tahun setelah data terakhir (bawaan (1,1,1)).
+
+    Hasil diambil dari artefak prediksi tersimpan; model hanya di-fit ulang
+    (dan disimpan sebagai versi artefak baru) bila deret, order, atau
+    jumlah langkah berubah. `order` None = ikuti artefak terbaru.
+    """
+    hasil, baru = artefak.prediksi_terkini(series, order, langkah, paksa=paksa)
+    teks_order = ','.join(str(x) for x in hasil['order'])
+    if baru:
+        asal = " (Warm Start dari Artefak Sebelumnya)" if hasil.get('fit') == "hangat" else ""
+        print(f"- Model ARIMA({teks_order}) Berhasil Dibentuk{asal} ✓")
+        print(f"- Artefak Prediksi v{hasil['versi']} Disimpan ✓")
+    else:
+        print(f"- Model ARIMA({teks_order}) Dimuat dari Artefak v{hasil['versi']} ({hasil['dibuat']}) ✓")
+
+    df_prediksi = artefak.tabel_prediksi(hasil)
+    df_prediksi.attrs['artefak'] = hasil
+    return df_prediksi
+
+
+def ramal_cepat(series: pd.Series, langkah: int = 2, model: str = "holt") -> pd.DataFrame:
+    """Prediksi dengan model ringan NumPy (SES/Holt/drift/naif), format sama dengan ramal_arima"""
+    prediksi, parameter, valid = model_cepat.ramal_matriks(series.to_numpy(dtype=float), model, langkah)
+    if not valid[0]:
+        raise ValueError("deret berisi nilai kosong/tak hingga")
+    print(f"- Model {' '.join(filter(None, [model_cepat.NAMA_MODEL[model], parameter[0]]))} Berhasil Dibentuk ✓")
+
+    tahun_terakhir = int(series.index.max())
+    df_prediksi = pd.DataFrame({
+        'Tahun': list(range(tahun_terakhir + 1, tahun_terakhir + 1 + langkah)),
+        'Prediksi_Kelahiran': prediksi[0].astype(int)
     })
+    for t, (bawah, atas) in bootstrap.interval_cepat(series.to_numpy(dtype=float), model, langkah).items():
+        df_prediksi[f'Bawah_{t}'] = bawah[0]
+        df_prediksi[f'Atas_{t}'] = atas[0]
+    return df_prediksi
 
-    print()
-    print("----------------------------")
-    print("Hasil Prediksi Kelahiran")
-    print("----------------------------")
-    for _, row in hasil_prediksi.iterrows():
-        print(f"- Tahun {int(row['Tahun'])} : {int(row['Prediksi_Kelahiran']):,} kelahiran")
 
-    # Gabungkan data aktual + prediksi untuk visualisasi
-    df_visual = df_tahunan.copy()
-    for i in range(len(hasil_prediksi)):
-        df_visual.loc[hasil_prediksi['Tahun'].iloc[i]] = hasil_prediksi['Prediksi_Kelahiran'].iloc[i]
+def hitung_metrik(df_backtest: pd.DataFrame) -> pd.DataFrame:
+    """MAE, RMSE & MAPE (%) per model dan horizon dari hasil backtest.
+
+    Fold yang gagal di-fit tidak dihitung; MAPE hanya memakai tahun
+    dengan nilai aktual bukan nol.
+    """
+    baris = []
+    valid = df_backtest.dropna(subset=['prediksi'])
+    for (model, horizon), g in valid.groupby(['model', 'horizon']):
+        bukan_nol = g[g['aktual'] != 0]
+        baris.append({
+            'model': model,
+            'horizon': int(horizon),
+            'jumlah_fold': len(g),
+            'gagal': int(((df_backtest['model'] == model) & (df_backtest['horizon'] == horizon)).sum()) - len(g),
+            'MAE': mean_absolute_error(g['aktual'], g['prediksi']),
+            'RMSE': np.sqrt(mean_squared_error(g['aktual'], g['prediksi'])),
+            'MAPE': mean_absolute_percentage_error(bukan_nol['aktual'], bukan_nol['prediksi']) * 100
+                    if len(bukan_nol) else np.nan,
+        })
+    return pd.DataFrame(baris)
 
-    # -----------------------------------
-    # VISUALISASI HASIL PREDIKSI ARIMA
-    # -----------------------------------
-    print()
-    print("----------------------------")
-    print("Proses Visualisasi Prediksi ")
-    print("----------------------------")
 
-    plt.figure(figsize=(10,6))
+def gambar_prediksi(df_tahunan: pd.DataFrame, hasil_prediksi: pd.DataFrame,
+                    nama_model: str = "ARIMA") -> plt.Figure:
+    """Line chart data aktual + prediksi (bawaan ARIMA), dengan pita interval bootstrap bila ada"""
+    fig, ax = plt.subplots(figsize=(10,6))
     print("- Membuat Canvas Grafik ✓")
 
+    # Pita interval bootstrap (dimulai dari titik aktual terakhir agar menyambung)
+    tahun_terakhir = df_tahunan.index[-1]
+    nilai_terakhir = df_tahunan['jumlah_kelahiran'].iloc[-1]
+    for t, transparansi in zip(sorted(bootstrap.TINGKAT, reverse=True), (0.15, 0.3)):
+        if f'Bawah_{t}' not in hasil_prediksi.columns:
+            continue
+        ax.fill_between(
+            [tahun_terakhir, *hasil_prediksi['Tahun']],
+            [nilai_terakhir, *hasil_prediksi[f'Bawah_{t}']],
+            [nilai_terakhir, *hasil_prediksi[f'Atas_{t}']],
+            color='orange', alpha=transparansi, linewidth=0, label=f'Interval Prediksi {t}%'
+        )
+
     # Plot data aktual
-    plt.plot(df_tahunan.index, df_tahunan['jumlah_kelahiran'], marker='o', color='blue', label='Data Aktual (2012–2023)')
-    
+    ax.plot(df_tahunan.index, df_tahunan['jumlah_kelahiran'], marker='o', color='blue', label='Data Aktual (2012–2023)')
+
     # Plot data prediksi
-    plt.plot(hasil_prediksi['Tahun'], hasil_prediksi['Prediksi_Kelahiran'], marker='o', color='orange', linestyle='--', label='Prediksi (2024–2025)')
+    ax.plot(hasil_prediksi['Tahun'], hasil_prediksi['Prediksi_Kelahiran'], marker='o', color='orange', linestyle='--', label='Prediksi (2024–2025)')
 
     # Tambahkan titik dan label prediksi
     for _, row in hasil_prediksi.iterrows():
-        plt.text(
+        ax.text(
             row['Tahun'], row['Prediksi_Kelahiran'] + 10000,
             f"{int(row['Prediksi_Kelahiran']):,}",
             ha='center', color='orange', fontsize=9, fontweight='bold'
         )
 
     # Pengaturan grafik
-    plt.title("Prediksi Jumlah Kelahiran \n Jawa Barat 2024–2025 \n (Model Time Series ARIMA)", fontsize=13, fontweight='bold')
-    plt.xlabel("Tahun", fontsize=11)
-    plt.ylabel("Jumlah Kelahiran", fontsize=11)
-    plt.grid(True, linestyle='--', alpha=0.6)
-    plt.legend()
-    plt.tight_layout()
+    ax.set_title(f"Prediksi Jumlah Kelahiran \n Jawa Barat 2024–2025 \n (Model Time Series {nama_model})", fontsize=13, fontweight='bold')
+    ax.set_xlabel("Tahun", fontsize=11)
+    ax.set_ylabel("Jumlah Kelahiran", fontsize=11)
+    ax.grid(True, linestyle='--', alpha=0.6)
+    ax.legend()
+    fig.tight_layout()
 
     print("- Menambahkan Judul, Label, dan Legenda ✓")
+    return fig
+
+
+def buat_grafik(sumber) -> list:
+    """Fit ARIMA pada total tahunan dan membangun grafik prediksi"""
+    df_tahunan = hitung_total_tahunan(sumber)
+    hasil_prediksi = ramal_arima(df_tahunan['jumlah_kelahiran'], order=None)
+    return [gambar_prediksi(df_tahunan, hasil_prediksi)]
+
+
+def main_batch(segmen, workers: int = None, order=peramalan.ORDER, kriteria: str = "aic",
+               model: str = "arima", interval: bool = False, hangat: bool = False) -> None:
+    """Ramalan setiap segmen (ARIMA paralel / model ringan NumPy), disimpan sebagai tabel CSV"""
+    print()
+    print("----------------------")
+    print("Proses Membaca File ")
+    print("----------------------")
+    try:
+        with instrumentasi.tahap("Membaca File") as t:
+            sumber = kubus.muat_sumber(path, 2012, 2023, kolom=['tahun', *segmen, 'nama_kabupaten_kota', 'jumlah_kelahiran'])
+            t.baris(keluar=sumber)
+        print(f"- Berhasil Membaca File : {kubus.PATH_KUBUS if isinstance(sumber, kubus.Kubus) else path} ✓")
+
+        print()
+        print("--------------------------------------------")
+        if model == "arima":
+            print("Proses Peramalan ARIMA per Segmen (Paralel)")
+        else:
+            print(f"Proses Peramalan {model_cepat.NAMA_MODEL[model]} per Segmen (NumPy)")
+        print("--------------------------------------------")
+        mulai = time.perf_counter()
+        with instrumentasi.tahap("Peramalan per Segmen") as t:
+            df_prediksi = peramalan.ramal_per_segmen(sumber, segmen, order, workers=workers, kriteria=kriteria,
+                                                     model=model, interval=interval, hangat=hangat)
+            t.baris(masuk=sumber, keluar=df_prediksi)
+        durasi = time.perf_counter() - mulai
+
+        per_deret = df_prediksi.drop_duplicates(subset=list(segmen))
+        gagal = int((per_deret['status'] == "gagal").sum())
+        ada_peringatan = int(((per_deret['status'] == "ok") & (per_deret['peringatan'] != "")).sum())
+        print(f"- Segmen : {', '.join(segmen)} ✓")
+        print(f"- {len(per_deret):,} Deret Diramal dalam {durasi:.1f} Detik ✓")
+        print(f"- Berhasil : {len(per_deret) - gagal:,} | Gagal : {gagal:,} | Dengan Peringatan : {ada_peringatan:,}")
+        if order == "auto" and model == "arima":
+            print(f"- Order Otomatis ({kriteria.upper()}) : {df_prediksi.attrs['order_dari_cache']:,} dari Cache, "
+                  f"{len(per_deret) - df_prediksi.attrs['order_dari_cache']:,} Dicari ✓")
+            for teks, n in per_deret['order'].value_counts().items():
+                print(f"  ARIMA{teks:<12} {n:>6,} Deret")
+        if hangat and model == "arima":
+            print(f"- Fit Hangat : {df_prediksi.attrs['fit_hangat']:,} | Fit Dingin : {df_prediksi.attrs['fit_dingin']:,} "
+                  f"(Warm Start Ditolak : {df_prediksi.attrs['kembali_dingin']:,}) ✓")
+        for _, row in per_deret[per_deret['status'] == "gagal"].head(10).iterrows():
+            print(f"  {tuple(row[list(segmen)])} : {row['peringatan']}")
+
+        print()
+        print("----------------------------")
+        print("Total Prediksi Seluruh Segmen")
+        print("----------------------------")
+        for tahun, total in df_prediksi.groupby('tahun')['prediksi'].sum().items():
+            print(f"- Tahun {int(tahun)} : {int(total):,} kelahiran")
 
-    # Simpan hasil visualisasi
-    output_path = "./visualisasi/prediksi_kelahiran_arima_2024-2025.png"
-    os.makedirs(os.path.dirname(output_path), exist_ok=True)
-    plt.savefig(output_path, dpi=300)
-    plt.show()
-    print(f"- Visualisasi Berhasil Disimpan di: {output_path} ✓")
+        path_output = output_path_segmen.format(model=model)
+        with instrumentasi.tahap("Simpan Tabel Prediksi"):
+            os.makedirs(os.path.dirname(path_output), exist_ok=True)
+            df_prediksi.to_csv(path_output, index=False)
+        print(f"- Tabel Prediksi Berhasil Disimpan di: {path_output} ✓")
 
+    except Exception as e:
+        print(f"- Gagal Membaca file : {path} : {e}")
+
+
+def main_backtest(segmen, workers: int = None, order=peramalan.ORDER, kriteria: str = "aic",
+                  refit: bool = True, daftar_model=("arima", "naif")) -> None:
+    """Backtest rolling-origin pada total provinsi (segmen kosong) atau setiap segmen"""
     print()
-    print("---------------------------------------------")
-    print("Analisis & Visualisasi Prediksi Selesai ✓")
-    print("---------------------------------------------")
+    print("----------------------")
+    print("Proses Membaca File ")
+    print("----------------------")
+    try:
+        with instrumentasi.tahap("Membaca File") as t:
+            sumber = kubus.muat_sumber(path, 2012, 2023, kolom=['tahun', *segmen, 'nama_kabupaten_kota', 'jumlah_kelahiran'])
+            t.baris(keluar=sumber)
+        print(f"- Berhasil Membaca File : {kubus.PATH_KUBUS if isinstance(sumber, kubus.Kubus) else path} ✓")
+
+        print()
+        print("--------------------------------------------")
+        print("Proses Backtest Rolling-Origin ")
+        print("--------------------------------------------")
+        if segmen:
+            deret = peramalan.deret_per_segmen(sumber, segmen)
+            nama_segmen = list(segmen) + (['nama_kabupaten_kota'] if 'kode_kabupaten_kota' in segmen else [])
+        else:
+            deret = {('Jawa Barat',): hitung_total_tahunan(sumber)['jumlah_kelahiran']}
+            nama_segmen = ['wilayah']
+        if "arima" in daftar_model:
+            if refit:
+                print("- Mode ARIMA : Fit Ulang Penuh di Setiap Origin (sama dengan model yang dipublikasikan)")
+            else:
+                print(f"- Mode ARIMA : Parameter Window Pertama Dibekukan, dilabeli '{peramalan.MODEL_TANPA_REFIT}' "
+                      "(bukan model yang dipublikasikan)")
+            if order == "auto":
+                print("- Order Otomatis : Dipilih per Fold dari Data Sampai Origin Saja")
+        hasil = []
+        for model in daftar_model:
+            mulai = time.perf_counter()
+            with instrumentasi.tahap(f"Backtest {model}") as t:
+                hasil.append(peramalan.backtest_batch(deret, order, workers=workers, refit=refit,
+                                                      nama_segmen=nama_segmen, kriteria=kriteria, model=model))
+                t.baris(masuk=len(deret), keluar=hasil[-1])
+            durasi = time.perf_counter() - mulai
+            label = peramalan.MODEL_TANPA_REFIT if model == "arima" and not refit else model
+            print(f"- {label:<11}: {len(deret):,} Deret, Origin {hasil[-1]['origin'].min()}–{hasil[-1]['origin'].max()}, "
+                  f"{len(hasil[-1]):,} Prediksi dalam {durasi:.1f} Detik ✓")
+        df_backtest = pd.concat(hasil, ignore_index=True)
+
+        print()
+        print("----------------------------")
+        print("Error Prediksi per Model & Horizon")
+        print("----------------------------")
+        df_metrik = hitung_metrik(df_backtest)
+        for _, row in df_metrik.iterrows():
+            print(f"- {row['model']:<11} h={row['horizon']} : MAE {row['MAE']:>12,.1f} | RMSE {row['RMSE']:>12,.1f} | "
+                  f"MAPE {row['MAPE']:>6.2f}% ({row['jumlah_fold']:,} Fold, {row['gagal']:,} Gagal)")
+
+        with instrumentasi.tahap("Simpan Hasil Backtest"):
+            os.makedirs(os.path.dirname(output_path_backtest), exist_ok=True)
+            df_backtest.to_csv(output_path_backtest, index=False)
+        print(f"- Hasil Backtest Berhasil Disimpan di: {output_path_backtest} ✓")
+
+    except Exception as e:
+        print(f"- Gagal Membaca file : {path} : {e}")
+
+
+def main_rekonsiliasi(segmen, workers: int = None, order=peramalan.ORDER, kriteria: str = "aic",
+                      model: str = "arima") -> None:
+    """Ramal semua level hierarki segmen lalu rekonsiliasi agar jumlahnya koheren"""
+    print()
+    print("----------------------")
+    print("Proses Membaca File ")
+    print("----------------------")
+    try:
+        with instrumentasi.tahap("Membaca File") as t:
+            sumber = kubus.muat_sumber(path, 2012, 2023, kolom=['tahun', *segmen, 'nama_kabupaten_kota', 'jumlah_kelahiran'])
+            t.baris(keluar=sumber)
+        print(f"- Berhasil Membaca File : {kubus.PATH_KUBUS if isinstance(sumber, kubus.Kubus) else path} ✓")
+
+        print()
+        print("--------------------------------------------")
+        print("Proses Peramalan & Rekonsiliasi Hierarki")
+        print("--------------------------------------------")
+        mulai = time.perf_counter()
+        with instrumentasi.tahap("Peramalan & Rekonsiliasi") as t:
+            df_hierarki = rekonsiliasi.ramal_hierarki(sumber, segmen, order=order, workers=workers,
+                                                      kriteria=kriteria, model=model)
+            t.baris(masuk=sumber, keluar=df_hierarki)
+        durasi = time.perf_counter() - mulai
+        jumlah_node = df_hierarki.drop_duplicates(subset=['level', *segmen])
+        print(f"- {len(jumlah_node):,} Node ({df_hierarki.attrs['jumlah_bawah']:,} Deret Terbawah, "
+              f"{df_hierarki['level'].nunique()} Level) dalam {durasi:.1f} Detik ✓")
+        print(f"- Prediksi Dasar Gagal : {int((jumlah_node['status'] == 'gagal').sum()):,}")
+
+        print()
+        print("----------------------------")
+        print("Total Provinsi per Metode")
+        print("----------------------------")
+        total = df_hierarki[df_hierarki['level'] == "total"]
+        for metode in ('dasar',) + rekonsiliasi.METODE:
+            kolom = f'prediksi_{metode}'
+            teks = " | ".join(f"{int(row['tahun'])} : {row[kolom]:,.0f}" for _, row in total.iterrows())
+            print(f"- {metode:<10}: {teks} (selisih koherensi {rekonsiliasi.selisih_koherensi(df_hierarki, kolom):,.1f})")
+
+        path_output = output_path_rekonsiliasi.format(model=model)
+        with instrumentasi.tahap("Simpan Tabel Rekonsiliasi"):
+            os.makedirs(os.path.dirname(path_output), exist_ok=True)
+            df_hierarki.to_csv(path_output, index=False)
+        print(f"- Tabel Rekonsiliasi Berhasil Disimpan di: {path_output} ✓")
+
+    except Exception as e:
+        print(f"- Gagal Membaca file : {path} : {e}")
+
+
+@instrumentasi.run("visualisasi_prediksi_kelahiran")
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prediksi jumlah kelahiran Jawa Barat (ARIMA)")
+    parser.add_argument("--batch", action="store_true",
+                        help="Ramal setiap segmen secara paralel, hasil berupa tabel CSV")
+    parser.add_argument("--segmen", nargs="+", default=peramalan.SEGMEN,
+                        help="Dimensi segmen untuk --batch (default: kode_kabupaten_kota status_kelahiran jenis_kelamin)")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Jumlah proses worker (default jumlah CPU)")
+    parser.add_argument("--order-otomatis", action="store_true",
+                        help="Pilih order (p,d,q) lewat grid AIC/BIC, di-cache per hash data deret")
+    parser.add_argument("--kriteria", choices=peramalan.KRITERIA, default="aic",
+                        help="Kriteria pemilihan order untuk --order-otomatis")
+    parser.add_argument("--fit-ulang", action="store_true",
+                        help="Abaikan artefak prediksi tersimpan dan fit ulang model")
+    parser.add_argument("--backtest", action="store_true",
+                        help="Evaluasi rolling-origin (MAE/RMSE/MAPE); dengan --batch untuk setiap segmen")
+    parser.add_argument("--tanpa-refit", action="store_true",
+                        help="Backtest: bekukan parameter ARIMA dari window pertama (lebih cepat, "
+                             f"dilabeli {peramalan.MODEL_TANPA_REFIT}; bawaan: fit ulang penuh di setiap origin)")
+    parser.add_argument("--model", nargs="+", choices=("arima",) + model_cepat.MODEL, default=None,
+                        help="Model peramalan (bawaan arima); --backtest menerima beberapa model (bawaan arima naif)")
+    parser.add_argument("--rekonsiliasi", action="store_true",
+                        help="Ramal semua level hierarki --segmen dan rekonsiliasi (bottom-up/top-down/OLS/WLS)")
+    parser.add_argument("--hangat", action="store_true",
+                        help="--batch: warm start dari parameter fit tersimpan per segmen (fit ulang tahunan)")
+    parser.add_argument("--interval", action="store_true",
+                        help="--batch: tambahkan interval prediksi bootstrap 80%% & 95%% ke tabel")
+    args = parser.parse_args(argv)
+    if args.model and len(args.model) > 1 and not args.backtest:
+        parser.error("beberapa --model hanya bisa dipakai bersama --backtest")
+    model = args.model[0] if args.model else "arima"
+    order = "auto" if args.order_otomatis else peramalan.ORDER
+    if args.backtest:
+        main_backtest(args.segmen if args.batch else [], args.workers, order, args.kriteria, not args.tanpa_refit,
+                      args.model or ("arima", "naif"))
+        return
+    if args.rekonsiliasi:
+        main_rekonsiliasi(args.segmen, args.workers, order, args.kriteria, model)
+        return
+    if args.batch:
+        main_batch(args.segmen, args.workers, order, args.kriteria, model, args.interval, args.hangat)
+        return
+
+    print()
+    print("----------------------")
+    print("Proses Pencarian File ")
+    print("----------------------")
+    if not os.path.exists(path):
+        print(f"- File Tidak Ditemukan : {path}")
+    else:
+        print(f"- File Ditemukan : {path}")
+
+    # Membaca File
+    print()
+    print("----------------------")
+    print("Proses Membaca File ")
+    print("----------------------")
+
+    try:
+        with instrumentasi.tahap("Membaca File") as t:
+            sumber = kubus.muat_sumber(path, 2012, 2023, kolom=KOLOM)
+            t.baris(keluar=sumber)
+        print(f"- Berhasil Membaca File : {kubus.PATH_KUBUS if isinstance(sumber, kubus.Kubus) else path} ✓")
+
+        # Filter tahun 2012–2023
+        print()
+        print("--------------------------------------------")
+        print("Proses Analisis Deret Waktu (Time Series) ")
+        print("--------------------------------------------")
+        # (rentang tahun sudah diterapkan oleh kubus.muat_sumber)
+        print(f"- Filter Berdasarkan Tahun ✓")
+
+        # Agregasi total per tahun
+        with instrumentasi.tahap("Grouping Per Tahun") as t:
+            df_tahunan = hitung_total_tahunan(sumber)
+            t.baris(masuk=sumber, keluar=df_tahunan)
+        print("- Menghitung Total Kelahiran per Tahun ✓")
+
+        print()
+        print("-------------------------------")
+        if model == "arima":
+            print("Proses Pembuatan Model ARIMA")
+            print("-------------------------------")
+            order = peramalan.ORDER
+            if args.order_otomatis:
+                with instrumentasi.tahap("Pemilihan Order"):
+                    order, asal = peramalan.pilih_order(df_tahunan['jumlah_kelahiran'], args.kriteria,
+                                                        workers=args.workers)
+                print(f"- Order Terpilih ({args.kriteria.upper()}, dari {asal}) : {order} ✓")
+            with instrumentasi.tahap("Model ARIMA") as t:
+                hasil_prediksi = ramal_arima(df_tahunan['jumlah_kelahiran'], order=order, paksa=args.fit_ulang)
+                t.baris(masuk=df_tahunan, keluar=hasil_prediksi)
+            nama_model = "ARIMA"
+        else:
+            nama_model = model_cepat.NAMA_MODEL[model]
+            print(f"Proses Pembuatan Model {nama_model}")
+            print("-------------------------------")
+            with instrumentasi.tahap(f"Model {nama_model}") as t:
+                hasil_prediksi = ramal_cepat(df_tahunan['jumlah_kelahiran'], model=model)
+                t.baris(masuk=df_tahunan, keluar=hasil_prediksi)
+
+        print()
+        print("----------------------------")
+        print("Hasil Prediksi Kelahiran")
+        print("----------------------------")
+        for _, row in hasil_prediksi.iterrows():
+            teks_interval = ""
+            if 'Bawah_95' in hasil_prediksi.columns:
+                teks_interval = f" (interval 95% : {int(row['Bawah_95']):,} – {int(row['Atas_95']):,})"
+            print(f"- Tahun {int(row['Tahun'])} : {int(row['Prediksi_Kelahiran']):,} kelahiran{teks_interval}")
+
+        # -----------------------------------
+        # VISUALISASI HASIL PREDIKSI ARIMA
+        # -----------------------------------
+        print()
+        print("----------------------------")
+        print("Proses Visualisasi Prediksi ")
+        print("----------------------------")
+
+        with instrumentasi.tahap("Visualisasi"):
+            fig = gambar_prediksi(df_tahunan, hasil_prediksi, nama_model)
+
+        # Simpan hasil visualisasi
+        path_grafik = output_path.format(model=model)
+        with instrumentasi.tahap("Simpan Grafik"):
+            os.makedirs(os.path.dirname(path_grafik), exist_ok=True)
+            fig.savefig(path_grafik, dpi=300)
+        plt.show()
+        print(f"- Visualisasi Berhasil Disimpan di: {path_grafik} ✓")
+
+        print()
+        print("---------------------------------------------")
+        print("Analisis & Visualisasi Prediksi Selesai ✓")
+        print("---------------------------------------------")
+
+    except Exception as e:
+        print(f"- Gagal Membaca file : {path} : {e}")
+
 
-except Exception as e:
-    print(f"- Gagal Membaca file : {path} : {e}")
+if __name__ == "__main__":
+    main()
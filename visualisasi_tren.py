@@ -4,103 +4,30 @@
 # Import Lib
 import pandas as pd
 import matplotlib.pyplot as plt
+import matplotlib as mpl
 import os
+import dataset
+import kubus
+import instrumentasi
 
 # path dataset
-path = "./final_dataset/dataset_kelahiran_jawabarat_2012-2023.csv"
-
-print()
-print("----------------------")
-print("Proses Pencarian File ")
-print("----------------------")
-if not os.path.exists(path):
-    print(f"- File Tidak Ditemukan : {path}")
-else:
-    print(f"- File Ditemukan : {path}")
-
-# Membaca file
-print()
-print("----------------------")
-print("Proses Membaca File ")
-print("----------------------")
-try:
-
-    # Baca dataset
-    df = pd.read_csv(path)
-    print(f"- Berhasil Membaca File : {path} ✓")
-
-    # Filter tahun 2012–2023
-    print()
-    print("-----------------------------------------")
-    print("Proses Analisis Deskriptif Tren Kelahiran")
-    print("-----------------------------------------")
-    df_filter = df[df['tahun'].between(2012, 2023)]
-    print(f"- Filter Berdasarkan Tahun ✓")
-
-    # Group Data Pertahun
-    total_per_tahun = (
-        df_filter.groupby('tahun')['jumlah_kelahiran']
-        .sum()
-        .reset_index()
-        .sort_values('tahun')
-    )
-
-    # Menampilkan Data pertahun
-    print(f"- Total Kelahiran Per Tahun ✓") 
-    print()
-    print("-------------------------------------------")
-    print(f"{'Tahun':<10} {'Jumlah Kelahiran':>20}")
-    print("-------------------------------------------")
-    for index, row in total_per_tahun.iterrows():
-        print(f"{int(row['tahun']):<10} {int(row['jumlah_kelahiran']):>20,}")
-
-    # Data Tahun Tertinggi Dan Terendah
-    tahun_max = total_per_tahun.loc[total_per_tahun['jumlah_kelahiran'].idxmax(), 'tahun']
-    tahun_min = total_per_tahun.loc[total_per_tahun['jumlah_kelahiran'].idxmin(), 'tahun']
-    max_value = total_per_tahun['jumlah_kelahiran'].max()
-    min_value = total_per_tahun['jumlah_kelahiran'].min()
-    print()
-    print(f"- Tahun dengan Kelahiran Tertinggi : {tahun_max} ({max_value:,}) ✓")
-    print(f"- Tahun dengan Kelahiran Terendah  : {tahun_min} ({min_value:,}) ✓")
-
-    # Perubahan Data Tahun Ke Tahun
-    print()
-    print("- Perubahan Jumlah Tahun ke Tahun ✓")
-    print("--------------------------------------------------------")
-    print(f"{'Dari → Ke':<15} {'Arah':<10} {'Perubahan':>12} {'Persentase':>15}")
-    print("--------------------------------------------------------")
-
-    # Simpan hasil perubahan ke list
-    perubahan_list = []
-    persentase_list = []
-
-    for i in range(1, len(total_per_tahun)):
-        thn_lalu = total_per_tahun.loc[i-1, 'tahun']
-        thn_skrg = total_per_tahun.loc[i, 'tahun']
-        nilai_lalu = total_per_tahun.loc[i-1, 'jumlah_kelahiran']
-        nilai_skrg = total_per_tahun.loc[i, 'jumlah_kelahiran']
-        perubahan = nilai_skrg - nilai_lalu
-        persentase = (perubahan / nilai_lalu) * 100
-
-        arah = "Naik" if perubahan > 0 else "Turun"
-        warna = "▲" if perubahan > 0 else "▼"
+path = dataset.PATH_DATASET
+# Kolom yang dibaca bila sumber berupa dataset baris (CSV/Parquet)
+KOLOM = ['tahun', 'jumlah_kelahiran']
 
-        print(f"{warna} {thn_lalu} → {thn_skrg:<8} {arah:<10} {abs(perubahan):>12,} {persentase:>13.2f}%")
 
-        # Simpan data untuk visualisasi
-        perubahan_list.append(perubahan)
-        persentase_list.append(persentase)
+def hitung_total_per_tahun(sumber) -> pd.DataFrame:
+    """Total kelahiran per tahun, terurut menurut tahun"""
+    return (
+        kubus.jumlah(sumber, ['tahun'])
+        .sort_values('tahun')
+        .reset_index(drop=True)
+    )
 
-    # --------------
-    # VISUALISASI 
-    # --------------
 
-    print()
-    print("-----------------------")
-    print("Proses Visualisasi Data ")
-    print("-----------------------")
-
-    plt.figure(figsize=(11,6))
+def gambar_tren(total_per_tahun: pd.DataFrame) -> plt.Figure:
+    """Line chart tren tahunan dengan warna naik/turun per segmen"""
+    fig, ax = plt.subplots(figsize=(11,6))
     print("- Membuat Canvas Grafik ✓")
 
     # Loop antar tahun untuk memberi warna per segmen
@@ -114,19 +41,19 @@ try:
             y_prev = total_per_tahun['jumlah_kelahiran'].iloc[i-1]
             color = 'green' if y > y_prev else 'red'
         else:
-            color = 'gray' 
-        
-        # Plot titik dan garis 
+            color = 'gray'
+
+        # Plot titik dan garis
         if i > 0:
-            plt.plot(
+            ax.plot(
                 total_per_tahun['tahun'].iloc[i-1:i+1],
                 total_per_tahun['jumlah_kelahiran'].iloc[i-1:i+1],
                 color=color, linewidth=2.5, marker='o'
             )
         else:
-            plt.plot(x, y, color=color, marker='o')
+            ax.plot(x, y, color=color, marker='o')
 
-        # Hitung perubahan & persentase 
+        # Hitung perubahan & persentase
         if i > 0:
             perubahan = y - y_prev
             persentase = (perubahan / y_prev) * 100
@@ -140,7 +67,7 @@ try:
 
         # Posisi label di atas marker
         offset = total_per_tahun['jumlah_kelahiran'].max() * 0.02
-        plt.text(
+        ax.text(
             x,
             y + offset,
             f"{tanda} {int(y):,}\n{teks_persen}",
@@ -151,32 +78,131 @@ try:
             bbox=dict(facecolor='white', alpha=0.8, edgecolor='none', pad=2)
         )
 
-    # Atur sumbu Y 
+    # Atur sumbu Y
     ymax = total_per_tahun['jumlah_kelahiran'].max()
-    plt.ylim(0, (ymax // 100_000 + 1) * 100_000)
+    ax.set_ylim(0, (ymax // 100_000 + 1) * 100_000)
 
     # Format angka sumbu Y dengan ribuan
-    plt.gca().get_yaxis().set_major_formatter(
-        plt.FuncFormatter(lambda x, _: f'{int(x):,}')
+    ax.yaxis.set_major_formatter(
+        mpl.ticker.FuncFormatter(lambda x, _: f'{int(x):,}')
     )
 
     # Judul dan label
-    plt.title("Tren Jumlah Kelahiran di Jawa Barat (2012–2023)", fontsize=14, fontweight='bold')
-    plt.xlabel("Tahun", fontsize=12)
-    plt.ylabel("Jumlah Kelahiran", fontsize=12)
-    plt.grid(True, linestyle='--', alpha=0.6)
+    ax.set_title("Tren Jumlah Kelahiran di Jawa Barat (2012–2023)", fontsize=14, fontweight='bold')
+    ax.set_xlabel("Tahun", fontsize=12)
+    ax.set_ylabel("Jumlah Kelahiran", fontsize=12)
+    ax.grid(True, linestyle='--', alpha=0.6)
     print("- Menambahkan Judul, Label, dan Grid ✓")
 
     # Tambahkan legenda visual
-    plt.text(2012.3, ymax*0.98, "▲ Naik", color='green', fontsize=10)
-    plt.text(2012.3, ymax*0.95, "▼ Turun", color='red', fontsize=10)
+    x_legenda = total_per_tahun['tahun'].min() + 0.3
+    ax.text(x_legenda, ymax*0.98, "▲ Naik", color='green', fontsize=10)
+    ax.text(x_legenda, ymax*0.95, "▼ Turun", color='red', fontsize=10)
     print("- Menambahkan Legenda ✓")
 
-    plt.tight_layout()
+    fig.tight_layout()
     print("- Mengecek Element Grafik ✓")
-    plt.show()
-    print("- Visualisasi berhasil ditampilkan ✓")
+    return fig
 
-    
-except Exception as e:
-    print(f"- Gagal Membaca file : {path} : {e}")
+
+def buat_grafik(sumber) -> list:
+    """Membangun seluruh grafik halaman tren dari sumber data (kubus atau dataset) yang sudah difilter"""
+    return [gambar_tren(hitung_total_per_tahun(sumber))]
+
+
+@instrumentasi.run("visualisasi_tren")
+def main():
+    print()
+    print("----------------------")
+    print("Proses Pencarian File ")
+    print("----------------------")
+    if not os.path.exists(path):
+        print(f"- File Tidak Ditemukan : {path}")
+    else:
+        print(f"- File Ditemukan : {path}")
+
+    # Membaca file
+    print()
+    print("----------------------")
+    print("Proses Membaca File ")
+    print("----------------------")
+    try:
+
+        # Baca dataset
+        with instrumentasi.tahap("Membaca File") as t:
+            sumber = kubus.muat_sumber(path, 2012, 2023, kolom=KOLOM)
+            t.baris(keluar=sumber)
+        print(f"- Berhasil Membaca File : {kubus.PATH_KUBUS if isinstance(sumber, kubus.Kubus) else path} ✓")
+
+        # Filter tahun 2012–2023
+        print()
+        print("-----------------------------------------")
+        print("Proses Analisis Deskriptif Tren Kelahiran")
+        print("-----------------------------------------")
+        # (rentang tahun sudah diterapkan oleh kubus.muat_sumber)
+        print(f"- Filter Berdasarkan Tahun ✓")
+
+        # Group Data Pertahun
+        with instrumentasi.tahap("Grouping Per Tahun") as t:
+            total_per_tahun = hitung_total_per_tahun(sumber)
+            t.baris(masuk=sumber, keluar=total_per_tahun)
+
+        # Menampilkan Data pertahun
+        print(f"- Total Kelahiran Per Tahun ✓")
+        print()
+        print("-------------------------------------------")
+        print(f"{'Tahun':<10} {'Jumlah Kelahiran':>20}")
+        print("-------------------------------------------")
+        for index, row in total_per_tahun.iterrows():
+            print(f"{int(row['tahun']):<10} {int(row['jumlah_kelahiran']):>20,}")
+
+        # Data Tahun Tertinggi Dan Terendah
+        tahun_max = total_per_tahun.loc[total_per_tahun['jumlah_kelahiran'].idxmax(), 'tahun']
+        tahun_min = total_per_tahun.loc[total_per_tahun['jumlah_kelahiran'].idxmin(), 'tahun']
+        max_value = total_per_tahun['jumlah_kelahiran'].max()
+        min_value = total_per_tahun['jumlah_kelahiran'].min()
+        print()
+        print(f"- Tahun dengan Kelahiran Tertinggi : {tahun_max} ({max_value:,}) ✓")
+        print(f"- Tahun dengan Kelahiran Terendah  : {tahun_min} ({min_value:,}) ✓")
+
+        # Perubahan Data Tahun Ke Tahun
+        print()
+        print("- Perubahan Jumlah Tahun ke Tahun ✓")
+        print("--------------------------------------------------------")
+        print(f"{'Dari → Ke':<15} {'Arah':<10} {'Perubahan':>12} {'Persentase':>15}")
+        print("--------------------------------------------------------")
+
+        for i in range(1, len(total_per_tahun)):
+            thn_lalu = total_per_tahun.loc[i-1, 'tahun']
+            thn_skrg = total_per_tahun.loc[i, 'tahun']
+            nilai_lalu = total_per_tahun.loc[i-1, 'jumlah_kelahiran']
+            nilai_skrg = total_per_tahun.loc[i, 'jumlah_kelahiran']
+            perubahan = nilai_skrg - nilai_lalu
+            persentase = (perubahan / nilai_lalu) * 100
+
+            arah = "Naik" if perubahan > 0 else "Turun"
+            warna = "▲" if perubahan > 0 else "▼"
+
+            print(f"{warna} {thn_lalu} → {thn_skrg:<8} {arah:<10} {abs(perubahan):>12,} {persentase:>13.2f}%")
+
+        # --------------
+        # VISUALISASI
+        # --------------
+
+        print()
+        print("-----------------------")
+        print("Proses Visualisasi Data ")
+        print("-----------------------")
+
+        with instrumentasi.tahap("Visualisasi"):
+            gambar_tren(total_per_tahun)
+        plt.show()
+        print("- Visualisasi berhasil ditampilkan ✓")
+
+
+    except Exception as e:
+        print(f"- Gagal Membaca file : {path} : {e}")
+
+
+if __name__ == "__main__":
+    main()